@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Resolver benchmarks run on deterministic synthetic dependency graphs."""
+
+from .graph import SyntheticGraphDatabase
+from .suite import BenchmarkCase
+from .suite import run_case
+from .suite import run_suite
+
+__all__ = [
+    "BenchmarkCase",
+    "SyntheticGraphDatabase",
+    "run_case",
+    "run_suite",
+]
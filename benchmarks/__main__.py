@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Run resolver benchmarks: python3 -m benchmarks --help."""
+
+import json
+import logging
+import platform
+import sys
+from typing import Optional
+from typing import Tuple
+
+import click
+from thoth.adviser import __version__ as adviser_version
+
+from .suite import BenchmarkCase
+from .suite import PREDICTORS
+from .suite import run_suite
+
+
+@click.command()
+@click.option(
+    "--predictor",
+    "predictor_names",
+    type=click.Choice(PREDICTORS),
+    multiple=True,
+    default=PREDICTORS,
+    show_default=True,
+    help="Predictor to benchmark, can be supplied multiple times.",
+)
+@click.option(
+    "--beam-width",
+    "beam_widths",
+    type=int,
+    multiple=True,
+    default=(100, 1000),
+    show_default=True,
+    help="Beam width to benchmark, can be supplied multiple times.",
+)
+@click.option("--packages", type=int, default=50, show_default=True, help="Number of packages in the graph.")
+@click.option("--versions", type=int, default=10, show_default=True, help="Number of versions per package.")
+@click.option("--fan-out", type=int, default=3, show_default=True, help="Number of dependencies per package.")
+@click.option(
+    "--conflict-density",
+    type=float,
+    default=0.1,
+    show_default=True,
+    help="Probability of a dependency allowing only one version of the dependency.",
+)
+@click.option("--direct-dependencies", type=int, default=5, show_default=True, help="Number of direct dependencies.")
+@click.option("--limit", type=int, default=1000, show_default=True, help="Number of final states to resolve.")
+@click.option("--count", type=int, default=1, show_default=True, help="Number of stacks to keep.")
+@click.option("--seed", type=int, default=42, show_default=True, help="Seed for graph generation and the resolver.")
+@click.option("--workers", type=int, default=1, show_default=True, help="Number of resolver worker processes.")
+@click.option(
+    "--batch-size", type=int, default=1, show_default=True, help="Number of states expanded in one iteration."
+)
+@click.option("--no-isolate", is_flag=True, help="Do not run each benchmark case in a separate process.")
+@click.option("--output", "-o", type=str, default=None, help="File to write results to, defaults to stdout.")
+@click.option("--verbose", "-v", is_flag=True, help="Be verbose about what is going on.")
+def benchmark(
+    predictor_names: Tuple[str, ...],
+    beam_widths: Tuple[int, ...],
+    packages: int,
+    versions: int,
+    fan_out: int,
+    conflict_density: float,
+    direct_dependencies: int,
+    limit: int,
+    count: int,
+    seed: int,
+    workers: int,
+    batch_size: int,
+    no_isolate: bool = False,
+    output: Optional[str] = None,
+    verbose: bool = False,
+) -> None:
+    """Benchmark resolver on a deterministic synthetic dependency graph."""
+    logging.basicConfig(level=logging.INFO if verbose else logging.ERROR)
+
+    cases = [
+        BenchmarkCase(
+            predictor=predictor_name,
+            beam_width=beam_width,
+            packages=packages,
+            versions=versions,
+            fan_out=fan_out,
+            conflict_density=conflict_density,
+            direct_dependencies=direct_dependencies,
+            limit=limit,
+            count=count,
+            seed=seed,
+            workers=workers,
+            batch_size=batch_size,
+        )
+        for predictor_name in predictor_names
+        for beam_width in beam_widths
+    ]
+
+    report = {
+        "adviser_version": adviser_version,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_suite(cases, isolate=not no_isolate),
+    }
+
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    benchmark()
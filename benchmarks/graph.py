@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""An in-memory graph database stand-in serving a deterministic synthetic dependency graph.
+
+Packages are named ``pkg0`` ... ``pkgN`` and each package depends only on packages with a higher
+index so the dependency graph is acyclic. Each package version depends on ``fan_out`` packages. An
+edge is a conflicting one with probability ``conflict_density`` - only a single version of the
+dependency is allowed in such a case, otherwise all the versions of the dependency are allowed.
+"""
+
+import hashlib
+import random
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import attr
+from thoth.storages.exceptions import NotFoundError
+
+INDEX_URL = "https://pypi.org/simple"
+
+
+@attr.s(slots=True)
+class SyntheticGraphDatabase:
+    """A graph database adapter answering resolver queries from a generated dependency graph."""
+
+    DEFAULT_COUNT = 100
+
+    packages = attr.ib(type=int, default=50, kw_only=True)
+    versions = attr.ib(type=int, default=10, kw_only=True)
+    fan_out = attr.ib(type=int, default=3, kw_only=True)
+    conflict_density = attr.ib(type=float, default=0.1, kw_only=True)
+    seed = attr.ib(type=int, default=42, kw_only=True)
+
+    _dependencies = attr.ib(type=Dict[Tuple[str, str], List[Tuple[str, str]]], factory=dict, init=False)
+    _connected = attr.ib(type=bool, default=False, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Generate the dependency graph."""
+        if self.packages <= 0 or self.versions <= 0 or self.fan_out < 0:
+            raise ValueError("Number of packages and versions should be positive, fan-out non-negative")
+
+        if not 0.0 <= self.conflict_density <= 1.0:
+            raise ValueError(f"Conflict density should be in range [0, 1], got {self.conflict_density}")
+
+        rand = random.Random(self.seed)
+        for package_idx in range(self.packages):
+            package_name = self.get_package_name(package_idx)
+            candidates = list(range(package_idx + 1, self.packages))
+            for package_version in self.get_package_versions():
+                dependencies: List[Tuple[str, str]] = []
+                for dependency_idx in sorted(rand.sample(candidates, min(self.fan_out, len(candidates)))):
+                    dependency_name = self.get_package_name(dependency_idx)
+                    if rand.random() < self.conflict_density:
+                        dependencies.append((dependency_name, rand.choice(self.get_package_versions())))
+                    else:
+                        dependencies.extend((dependency_name, v) for v in self.get_package_versions())
+
+                self._dependencies[(package_name, package_version)] = dependencies
+
+    @staticmethod
+    def get_package_name(package_idx: int) -> str:
+        """Get name of the package with the given index."""
+        return f"pkg{package_idx}"
+
+    def get_package_versions(self) -> List[str]:
+        """Get versions available for each package, sorted from the oldest."""
+        return [f"{major}.0.0" for major in range(1, self.versions + 1)]
+
+    def connect(self) -> None:
+        """Connect to the database, nothing to be done for the in-memory stand-in."""
+        self._connected = True
+
+    def is_connected(self) -> bool:
+        """Check if the database is connected."""
+        return self._connected
+
+    def disconnect(self) -> None:
+        """Disconnect from the database."""
+        self._connected = False
+
+    def get_solved_python_package_versions_all(
+        self, package_name: str, *, start_offset: int = 0, count: Optional[int] = DEFAULT_COUNT, **_: Any
+    ) -> List[Tuple[str, str, str]]:
+        """Get all solved versions of the given package, paginated."""
+        if (package_name, self.get_package_versions()[0]) not in self._dependencies:
+            return []
+
+        result = [(package_name, v, INDEX_URL) for v in self.get_package_versions()]
+        if count is None:
+            return result
+
+        return result[start_offset * count : (start_offset + 1) * count]
+
+    def get_depends_on(
+        self, package_name: str, package_version: str, index_url: str, *, extras: FrozenSet[Optional[str]], **_: Any
+    ) -> Dict[Optional[str], List[Tuple[str, str]]]:
+        """Get dependencies of the given package."""
+        dependencies = self._dependencies.get((package_name, package_version))
+        if dependencies is None or index_url != INDEX_URL:
+            raise NotFoundError(f"Package {package_name!r} in version {package_version!r} not found")
+
+        return {None: dependencies}
+
+    def get_python_package_version_records(
+        self,
+        package_name: str,
+        package_version: str,
+        index_url: Optional[str],
+        *,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Get records of the given package solved."""
+        if (package_name, package_version) not in self._dependencies:
+            return []
+
+        return [
+            {
+                "package_name": package_name,
+                "package_version": package_version,
+                "index_url": INDEX_URL,
+                "os_name": os_name,
+                "os_version": os_version,
+                "python_version": python_version,
+            }
+        ]
+
+    def get_python_package_hashes_sha256(self, package_name: str, package_version: str, index_url: str) -> List[str]:
+        """Get hashes of the given package, a single artifact is simulated."""
+        return [hashlib.sha256(f"{package_name}-{package_version}-{index_url}".encode()).hexdigest()]
+
+    def get_python_environment_marker(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Get environment marker for a dependency, no markers are simulated."""
+        return None
+
+    def get_python_package_index_urls_all(self, enabled: Optional[bool] = None) -> List[str]:
+        """Get all the Python package indexes registered."""
+        return [INDEX_URL]
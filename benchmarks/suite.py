@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure resolver performance on synthetic dependency graphs."""
+
+import contextlib
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import attr
+from thoth.adviser import predictors
+from thoth.adviser.enums import RecommendationType
+from thoth.adviser.pipeline_config import PipelineConfig
+from thoth.adviser.resolver import Resolver
+from thoth.adviser.steps import GenerateScoreStep
+from thoth.common import RuntimeEnvironment
+from thoth.python import Project
+
+from .graph import SyntheticGraphDatabase
+
+_LOGGER = logging.getLogger(__name__)
+
+PREDICTORS = (
+    "AdaptiveSimulatedAnnealing",
+    "TemporalDifference",
+    "MCTS",
+    "ApproximatingLatest",
+    "HillClimbing",
+    "Sampling",
+)
+
+_RUNTIME_ENVIRONMENT = {
+    "operating_system": {"name": "rhel", "version": "8"},
+    "python_version": "3.8",
+}
+
+
+@attr.s(slots=True)
+class BenchmarkCase:
+    """A single benchmark configuration - a predictor and beam width run on a synthetic graph."""
+
+    predictor = attr.ib(type=str, kw_only=True)
+    beam_width = attr.ib(type=int, kw_only=True)
+    packages = attr.ib(type=int, default=50, kw_only=True)
+    versions = attr.ib(type=int, default=10, kw_only=True)
+    fan_out = attr.ib(type=int, default=3, kw_only=True)
+    conflict_density = attr.ib(type=float, default=0.1, kw_only=True)
+    direct_dependencies = attr.ib(type=int, default=5, kw_only=True)
+    limit = attr.ib(type=int, default=1000, kw_only=True)
+    count = attr.ib(type=int, default=1, kw_only=True)
+    seed = attr.ib(type=int, default=42, kw_only=True)
+    workers = attr.ib(type=int, default=1, kw_only=True)
+    batch_size = attr.ib(type=int, default=1, kw_only=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the benchmark case into a dictionary."""
+        return attr.asdict(self)
+
+    def get_project(self) -> Project:
+        """Get project with direct dependencies used for the resolution."""
+        packages = "\n".join(
+            f'{SyntheticGraphDatabase.get_package_name(i)} = "*"'
+            for i in range(min(self.direct_dependencies, self.packages))
+        )
+        pipfile = f"""
+[[source]]
+url = "https://pypi.org/simple"
+verify_ssl = true
+name = "pypi"
+
+[packages]
+{packages}
+
+[dev-packages]
+"""
+        return Project.from_strings(pipfile, runtime_environment=RuntimeEnvironment.from_dict(_RUNTIME_ENVIRONMENT))
+
+    def get_resolver(self) -> Resolver:
+        """Get resolver instance for this benchmark case."""
+        graph = SyntheticGraphDatabase(
+            packages=self.packages,
+            versions=self.versions,
+            fan_out=self.fan_out,
+            conflict_density=self.conflict_density,
+            seed=self.seed,
+        )
+        graph.connect()
+
+        return Resolver(
+            pipeline=PipelineConfig(steps={None: [GenerateScoreStep()]}),
+            project=self.get_project(),
+            library_usage=None,
+            graph=graph,  # type: ignore
+            predictor=getattr(predictors, self.predictor)(),
+            recommendation_type=RecommendationType.LATEST,
+            limit=self.limit,
+            count=self.count,
+            beam_width=self.beam_width,
+            limit_latest_versions=None,
+            workers=self.workers,
+            batch_size=self.batch_size,
+        )
+
+
+def run_case(case: BenchmarkCase) -> Dict[str, Any]:
+    """Run the given benchmark case and measure resolver performance."""
+    random.seed(case.seed)
+    resolver = case.get_resolver()
+
+    products = 0
+    time_to_first_stack: Optional[float] = None
+    error: Optional[str] = None
+    start_time = time.monotonic()
+    # GenerateScoreStep prints scores assigned in post_run, keep the output clean.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            for _ in resolver.resolve_products(with_devel=False):
+                products += 1
+                if time_to_first_stack is None:
+                    time_to_first_stack = time.monotonic() - start_time
+        except Exception as exc:
+            _LOGGER.exception("Benchmark case %r failed", case)
+            error = str(exc)
+
+    elapsed = time.monotonic() - start_time
+    iterations = resolver.context.iteration
+    return {
+        "case": case.to_dict(),
+        "error": error,
+        "elapsed": elapsed,
+        "stacks": products,
+        "accepted_final_states": resolver.context.accepted_final_states_count,
+        "discarded_final_states": resolver.context.discarded_final_states_count,
+        "iterations": iterations,
+        "stacks_per_second": resolver.context.accepted_final_states_count / elapsed if elapsed else None,
+        "iterations_per_second": iterations / elapsed if elapsed else None,
+        "time_to_first_stack": time_to_first_stack,
+        # Reported in kilobytes on Linux.
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_suite(cases: Iterable[BenchmarkCase], *, isolate: bool = True) -> List[Dict[str, Any]]:
+    """Run the given benchmark cases, each case is run in a separate process if isolated to measure peak RSS."""
+    results = []
+    for case in cases:
+        _LOGGER.info("Running benchmark case %r", case)
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(processes=1, maxtasksperchild=1) as pool:
+                result = pool.apply(run_case, (case,))
+        else:
+            result = run_case(case)
+
+        _LOGGER.info(
+            "Resolved %d stacks in %.3fs (%.1f stacks/s, %.1f iterations/s)",
+            result["stacks"],
+            result["elapsed"],
+            result["stacks_per_second"] or 0.0,
+            result["iterations_per_second"] or 0.0,
+        )
+        results.append(result)
+
+    return results
@@ -22,7 +22,9 @@ import functools
 from typing import Any
 
 import tests.units as units
-import thoth.adviser
+import thoth.adviser  # noqa: F401
+
+_UNIT_MODULES = ("boots", "pseudonyms", "sieves", "steps", "strides", "wraps")
 
 
 def use_test_units(func: Any) -> Any:
@@ -31,6 +33,7 @@ def use_test_units(func: Any) -> Any:
     @functools.wraps(func)
     def wrapped(*args: Any, **kwargs: Any) -> Any:
         """Substitute implemented units with the testing ones."""
+        adviser_units = {name: sys.modules[f"thoth.adviser.{name}"] for name in _UNIT_MODULES}
         sys.modules["thoth.adviser"].boots = units.boots
         sys.modules["thoth.adviser.boots"] = units.boots
         sys.modules["thoth.adviser"].pseudonyms = units.pseudonyms
@@ -46,17 +49,8 @@ def use_test_units(func: Any) -> Any:
         try:
             return func(*args, **kwargs)
         finally:
-            sys.modules["thoth.adviser"].boots = thoth.adviser.boots
-            sys.modules["thoth.adviser.boots"] = thoth.adviser.boots
-            sys.modules["thoth.adviser"].pseudonyms = thoth.adviser.pseudonyms
-            sys.modules["thoth.adviser.pseudonyms"] = thoth.adviser.pseudonyms
-            sys.modules["thoth.adviser"].sieves = thoth.adviser.sieves
-            sys.modules["thoth.adviser.sieves"] = thoth.adviser.sieves
-            sys.modules["thoth.adviser"].steps = thoth.adviser.steps
-            sys.modules["thoth.adviser.steps"] = thoth.adviser.steps
-            sys.modules["thoth.adviser"].strides = thoth.adviser.strides
-            sys.modules["thoth.adviser.strides"] = thoth.adviser.strides
-            sys.modules["thoth.adviser"].wraps = thoth.adviser.wraps
-            sys.modules["thoth.adviser.wraps"] = thoth.adviser.wraps
+            for name, module in adviser_units.items():
+                setattr(sys.modules["thoth.adviser"], name, module)
+                sys.modules[f"thoth.adviser.{name}"] = module
 
     return wrapped
@@ -54,6 +54,30 @@ class TestHillClimbing(AdviserTestCase):
             assert package_tuple[0] in next_state.unresolved_dependencies
             assert package_tuple in next_state.unresolved_dependencies[package_tuple[0]].values()
 
+    @given(
+        integers(min_value=1, max_value=64),
+        integers(min_value=1, max_value=16),
+    )
+    def test_run_batch(self, state_factory: Callable[[], State], state_count: int, k: int) -> None:
+        """Test picking top states for a batched expansion."""
+        state = state_factory()
+        beam = Beam()
+        for i in range(state_count):
+            cloned_state = state.clone()
+            cloned_state.score = float(i)
+            beam.add_state(cloned_state)
+
+        predictor = HillClimbing()
+        context = flexmock(accepted_final_states_count=33, beam=beam)
+        with predictor.assigned_context(context):
+            to_expand = predictor.run_batch(k)
+
+        assert len(to_expand) == min(k, state_count)
+        assert to_expand[0][0] is beam.max()
+        assert [s.score for s, _ in to_expand] == [float(state_count - i - 1) for i in range(len(to_expand))]
+        for next_state, package_tuple in to_expand:
+            assert package_tuple in next_state.unresolved_dependencies[package_tuple[0]].values()
+
     def test_pre_run(self) -> None:
         """Test pre-run initialization."""
         context = flexmock(limit=99)
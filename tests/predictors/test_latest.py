@@ -150,3 +150,53 @@ class TestApproximatingLatest(AdviserTestCase):
 
         assert package_tuple is first_unresolved_dependency
         assert next_state is last_state
+
+    def test_run_batch(self) -> None:
+        """Test heat-up and prioritized packages apply also when states are expanded in batches."""
+        beam = Beam()
+
+        dependency_tuple_1 = ("tensorflow", "2.1.0", "https://pypi.org/simple")
+        dependency_tuple_2 = ("tensorflow", "2.0.0", "https://pypi.org/simple")
+        dependency_tuple_3 = ("flask", "1.1.1", "https://pypi.org/simple")
+        dependency_tuple_4 = ("flask", "1.0", "https://pypi.org/simple")
+
+        state = State(
+            score=0.999,
+            resolved_dependencies={},
+            unresolved_dependencies={
+                "tensorflow": {
+                    hash(dependency_tuple_1): dependency_tuple_1,
+                    hash(dependency_tuple_2): dependency_tuple_2,
+                },
+                "flask": {
+                    hash(dependency_tuple_3): dependency_tuple_3,
+                    hash(dependency_tuple_4): dependency_tuple_4,
+                },
+            },
+        )
+        beam.add_state(state)
+
+        predictor = ApproximatingLatest(prioritized_packages=["flask"])
+        context = flexmock(accepted_final_states_count=0, beam=beam)
+
+        with predictor.assigned_context(context):
+            assert predictor.run_batch(8) == [(state, dependency_tuple_1)]
+            assert predictor._packages_heated_up == {"tensorflow"}
+            assert predictor.run_batch(8) == [(state, dependency_tuple_3)]
+            assert predictor._packages_heated_up == {"tensorflow", "flask"}
+
+        other_state = State(
+            score=1.0,
+            resolved_dependencies={"tensorflow": dependency_tuple_1},
+            unresolved_dependencies={
+                "flask": {
+                    hash(dependency_tuple_3): dependency_tuple_3,
+                    hash(dependency_tuple_4): dependency_tuple_4,
+                },
+            },
+        )
+        beam.add_state(other_state)
+
+        with predictor.assigned_context(context):
+            # The heat-up phase has ended, the last state added is expanded resolving the prioritized package first.
+            assert predictor.run_batch(8) == [(other_state, dependency_tuple_3)]
@@ -56,6 +56,28 @@ class TestSampling(AdviserTestCase):
             assert package_tuple[0] in next_state.unresolved_dependencies
             assert package_tuple in next_state.unresolved_dependencies[package_tuple[0]].values()
 
+    @given(
+        integers(min_value=1, max_value=64),
+        integers(min_value=1, max_value=16),
+    )
+    def test_run_batch(self, state_factory: Callable[[], State], state_count: int, k: int) -> None:
+        """Test picking distinct random states for a batched expansion."""
+        state = state_factory()
+        beam = Beam()
+        for _ in range(state_count):
+            beam.add_state(state.clone())
+
+        predictor = Sampling()
+        context = flexmock(accepted_final_states_count=10, beam=beam)
+        with predictor.assigned_context(context):
+            to_expand = predictor.run_batch(k)
+
+        assert len(to_expand) == min(k, state_count)
+        assert len({id(s) for s, _ in to_expand}) == len(to_expand), "States picked are not distinct"
+        for next_state, package_tuple in to_expand:
+            assert next_state in beam.iter_states()
+            assert package_tuple in next_state.unresolved_dependencies[package_tuple[0]].values()
+
     def test_pre_run(self) -> None:
         """Test pre-run initialization."""
         context = flexmock(limit=99)
@@ -102,6 +102,17 @@ class TestTemporalDifference(AdviserTestCase):
         assert isinstance(predictor._temperature, float)
         assert predictor._temperature == float(context.limit)
 
+    def test_get_set_policy(self) -> None:
+        """Test restoring policy learnt in a previous resolution after initialization."""
+        predictor = TemporalDifference()
+        policy = {("tensorflow", "2.0.0", "https://pypi.org/simple"): [1.0, 2]}
+
+        with predictor.assigned_context(flexmock(limit=42)):
+            predictor.pre_run()
+
+        predictor.set_policy(policy)
+        assert predictor.get_policy() == policy
+
     @pytest.mark.parametrize("float_case", [math.nan, math.inf, -math.inf])
     def test_set_reward_signal_nan_inf(self, float_case: float) -> None:
         """Test (not) keeping the reward signal for nan/inf."""
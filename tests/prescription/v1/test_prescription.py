@@ -17,11 +17,19 @@
 
 """Test implementation of prescription handling."""
 
+import json
+import struct
+
 import pytest
 import yaml
 
+from thoth.adviser.enums import RecommendationType
+from thoth.adviser.exceptions import PrescriptionBundleError
 from thoth.adviser.exceptions import PrescriptionSchemaError
+from thoth.adviser.pipeline_builder import PipelineBuilderContext
 from thoth.adviser.prescription import Prescription
+from thoth.adviser.prescription.v1 import UnitPrescription
+from thoth.python import Project
 
 from ...base import AdviserTestCase
 
@@ -48,6 +56,126 @@ class TestPrescription(AdviserTestCase):
         assert [u.get_unit_name() for u in instance.iter_stride_units()] == ["thoth.StrideUnit"]
         assert [u.get_unit_name() for u in instance.iter_wrap_units()] == ["thoth.WrapUnit"]
 
+    def test_load_bundle(self, tmp_path) -> None:
+        """Test loading prescription compiled into a bundle."""
+        instance = Prescription.load([str(self.data_dir / "prescriptions")])
+        bundle_path = str(tmp_path / "prescriptions.bundle")
+        instance.dump_bundle(bundle_path)
+
+        loaded = Prescription.load([bundle_path])
+        assert loaded.prescriptions == instance.prescriptions
+        assert loaded.steps_dict.decoded_count == 0
+
+        for unit_type in ("boots", "pseudonyms", "sieves", "steps", "strides", "wraps"):
+            assert list(getattr(loaded, f"{unit_type}_dict")) == list(getattr(instance, f"{unit_type}_dict"))
+
+        assert loaded.steps_dict.decoded_count == 0
+        assert dict(loaded.steps_dict) == instance.steps_dict
+        assert loaded.steps_dict.decoded_count == 1
+        assert [u.get_unit_name() for u in loaded.iter_step_units()] == ["thoth.StepUnit"]
+
+    def test_load_bundle_error(self, tmp_path) -> None:
+        """Test loading a file which is not a prescription bundle."""
+        bundle_path = tmp_path / "prescriptions.bundle"
+        bundle_path.write_bytes(b"THOTHGS" + b"\0" * 32)
+
+        with pytest.raises(PrescriptionBundleError):
+            Prescription.load([str(bundle_path)])
+
+    def test_load_bundle_version(self, tmp_path) -> None:
+        """Test loading a bundle stored in a previous format version."""
+        index = json.dumps({"prescriptions": [], "units": {"boots": [["thoth.BootUnit", 16, 2, ["flask"]]]}})
+        bundle_path = tmp_path / "prescriptions.bundle"
+        bundle_path.write_bytes(struct.pack("<7sBQ", b"THOTHPB", 1, 18) + b"{}" + index.encode())
+
+        with pytest.raises(PrescriptionBundleError, match="not a prescription bundle in version 2"):
+            Prescription.load([str(bundle_path)])
+
+    def test_load_bundle_malformed_index(self, tmp_path) -> None:
+        """Test loading a bundle with an index that does not match the format version stated."""
+        index = json.dumps({"prescriptions": [], "units": {"boots": [["thoth.BootUnit", 16, 2]]}})
+        bundle_path = tmp_path / "prescriptions.bundle"
+        bundle_path.write_bytes(struct.pack("<7sBQ", b"THOTHPB", 2, 18) + b"{}" + index.encode())
+
+        with pytest.raises(PrescriptionBundleError, match="is malformed"):
+            Prescription.load([str(bundle_path)])
+
+    @staticmethod
+    def _get_inclusion_prescription() -> Prescription:
+        """Get a prescription with boot units stating different should_include sections."""
+
+        def _boot(name: str, should_include: dict) -> dict:
+            return {
+                "name": name,
+                "type": "boot",
+                "should_include": should_include,
+                "run": {"log": {"message": "Some text printed", "type": "INFO"}},
+            }
+
+        prescription = {
+            "units": {
+                "boots": [
+                    _boot("LabelBoot1", {"adviser_pipeline": True, "labels": {"foo": "bar"}}),
+                    _boot("AdviserBoot", {"adviser_pipeline": True}),
+                    _boot("LabelBoot2", {"adviser_pipeline": True, "labels": {"foo": "bar"}}),
+                    _boot(
+                        "DependentBoot",
+                        {"adviser_pipeline": True, "dependencies": {"boots": ["thoth.AdviserBoot"]}},
+                    ),
+                    _boot("DependencyMonkeyBoot", {"dependency_monkey_pipeline": True}),
+                ],
+            },
+        }
+        return Prescription.from_dict(
+            prescription,
+            prescription_instance=Prescription(),
+            prescription_name="thoth",
+            prescription_release="2021.06.15",
+        )
+
+    def test_get_inclusion_candidates(self, project: Project) -> None:
+        """Test obtaining units that can be included in a pipeline."""
+        instance = self._get_inclusion_prescription()
+        builder_context = PipelineBuilderContext(project=project, recommendation_type=RecommendationType.LATEST)
+
+        try:
+            candidates = instance.get_inclusion_candidates(builder_context)
+        finally:
+            UnitPrescription.SHOULD_INCLUDE_CACHE.clear()
+
+        assert candidates == {
+            "boots": ["thoth.AdviserBoot", "thoth.DependentBoot"],
+            "pseudonyms": [],
+            "sieves": [],
+            "steps": [],
+            "strides": [],
+            "wraps": [],
+        }
+        assert [u.get_unit_name() for u in instance.iter_boot_units(candidates["boots"])] == candidates["boots"]
+
+    def test_get_inclusion_candidates_bundle(self, tmp_path, project: Project) -> None:
+        """Test obtaining units that can be included in a pipeline without decoding units from a bundle."""
+        bundle_path = str(tmp_path / "prescriptions.bundle")
+        self._get_inclusion_prescription().dump_bundle(bundle_path)
+        instance = Prescription.load([bundle_path])
+        builder_context = PipelineBuilderContext(
+            project=project, labels={"foo": "bar"}, recommendation_type=RecommendationType.LATEST
+        )
+
+        try:
+            candidates = instance.get_inclusion_candidates(builder_context)
+        finally:
+            UnitPrescription.SHOULD_INCLUDE_CACHE.clear()
+
+        assert candidates["boots"] == [
+            "thoth.LabelBoot1",
+            "thoth.AdviserBoot",
+            "thoth.LabelBoot2",
+            "thoth.DependentBoot",
+        ]
+        # One unit of each group with the same should_include checked, dependencies are not considered.
+        assert instance.boots_dict.decoded_count == 3
+
     def test_from_dict_validate_error(self) -> None:
         """Test raising an error if schema validation fails."""
         with pytest.raises(PrescriptionSchemaError):
@@ -17,6 +17,8 @@
 
 """Test implementation of step prescription v1."""
 
+from typing import Optional
+
 from flexmock import flexmock
 import pytest
 import yaml
@@ -194,6 +196,22 @@ run:
             assert result[0] == -0.1
             assert result[1] is None
 
+    @pytest.mark.parametrize("score,score_max", [(None, 0.0), (-0.1, -0.1), (0.5, 0.5), (2.0, 1.0)])
+    def test_get_score_max(self, score: Optional[float], score_max: float) -> None:
+        """Test obtaining the highest score the step can add."""
+        prescription = {
+            "name": "StepUnit",
+            "type": "step",
+            "should_include": {"adviser_pipeline": True},
+            "match": {"package_version": {"name": "flask"}},
+            "run": {"not_acceptable": "Not acceptable"} if score is None else {"score": score},
+        }
+        PRESCRIPTION_STEP_SCHEMA(prescription)
+        StepPrescription.set_prescription(prescription)
+        unit = StepPrescription()
+        assert unit.get_score_max() == score_max
+        assert isinstance(unit.get_score_max(), float)
+
     def test_run_state(self, context: Context, state: State) -> None:
         """Test running the prescription if state matches."""
         prescription_str = """
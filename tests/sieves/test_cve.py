@@ -21,6 +21,7 @@ import pytest
 
 from thoth.adviser.context import Context
 from thoth.adviser.enums import RecommendationType
+from thoth.adviser.graph_io import AsyncGraph
 from thoth.adviser.pipeline_builder import PipelineBuilderContext
 from thoth.adviser.sieves import CveSieve
 from thoth.common import get_justification_link as jl
@@ -140,3 +141,109 @@ class TestCveSieve(AdviserUnitTestCase):
 
         assert result == [pv]
         assert context.stack_info == []
+
+    def test_cve_sieve_bulk_no_cve(self, context: Context) -> None:
+        """Make sure versions are not queried if no CVE is known for the given package."""
+        context.graph.should_receive("get_python_cve_records_all").with_args(package_name="flask").and_return([]).once()
+
+        package_versions = [
+            PackageVersion(
+                name="flask",
+                version=f"=={version}",
+                index=Source("https://pypi.org/simple"),
+                develop=False,
+            )
+            for version in ("0.12.0", "1.0.0", "1.1.0")
+        ]
+
+        context.recommendation_type = RecommendationType.SECURITY
+        with self.UNIT_TESTED.assigned_context(context):
+            unit = self.UNIT_TESTED()
+            unit.update_configuration({"bulk": True})
+            unit.pre_run()
+            assert list(unit.run((pv for pv in package_versions[:2]))) == package_versions[:2]
+            assert list(unit.run((pv for pv in package_versions[2:]))) == package_versions[2:]
+
+        assert context.stack_info == []
+
+    def test_cve_sieve_graph_io(self, context: Context) -> None:
+        """Make sure CVEs are queried concurrently if enabled."""
+        context.graph.should_receive("get_python_cve_records_all").with_args(package_name="flask").and_return(
+            [self._FLASK_CVE]
+        ).once()
+        context.graph.should_receive("get_python_cve_records_all").with_args(package_name="click").and_return([]).once()
+        for version, cve_records in (("0.12.0", [self._FLASK_CVE]), ("1.0.0", [])):
+            context.graph.should_receive("get_python_cve_records_all").with_args(
+                package_name="flask", package_version=version
+            ).and_return(cve_records).once()
+
+        pypi = Source("https://pypi.org/simple")
+        pv1 = PackageVersion(name="flask", version="==0.12.0", index=pypi, develop=False)
+        pv2 = PackageVersion(name="flask", version="==1.0.0", index=pypi, develop=False)
+        pv3 = PackageVersion(name="click", version="==2.0", index=pypi, develop=False)
+
+        context.recommendation_type = RecommendationType.SECURITY
+        context.graph_io = AsyncGraph(graph=context.graph, max_workers=2)
+        try:
+            with self.UNIT_TESTED.assigned_context(context):
+                unit = self.UNIT_TESTED()
+                unit.update_configuration({"bulk": True})
+                unit.pre_run()
+                assert list(unit.run((pv for pv in (pv1, pv2, pv3)))) == [pv2, pv3]
+        finally:
+            context.graph_io.close()
+
+        assert len(context.stack_info) == 1
+
+    def test_cve_sieve_bulk_cve(self, context: Context) -> None:
+        """Make sure versions of a package with a CVE are queried on top of the package query in bulk mode."""
+        context.graph.should_receive("get_python_cve_records_all").with_args(package_name="flask").and_return(
+            [self._FLASK_CVE]
+        ).once()
+
+        for version, cve_records in (("0.12.0", [self._FLASK_CVE]), ("1.0.0", [])):
+            context.graph.should_receive("get_python_cve_records_all").with_args(
+                package_name="flask", package_version=version
+            ).and_return(cve_records).once()
+
+        pypi = Source("https://pypi.org/simple")
+        pv1 = PackageVersion(name="flask", version="==0.12.0", index=pypi, develop=False)
+        pv2 = PackageVersion(name="flask", version="==1.0.0", index=pypi, develop=False)
+
+        context.recommendation_type = RecommendationType.SECURITY
+        with self.UNIT_TESTED.assigned_context(context):
+            unit = self.UNIT_TESTED()
+            unit.update_configuration({"bulk": True})
+            unit.pre_run()
+            assert list(unit.run((pv for pv in (pv1, pv2)))) == [pv2]
+            assert list(unit.run((pv for pv in (pv1, pv2)))) == [pv2]
+
+    def test_cve_sieve_no_bulk(self, context: Context) -> None:
+        """Make sure CVEs are queried for each package version if bulk mode is not turned on."""
+        context.graph.should_receive("get_python_cve_records_all").with_args(
+            package_name="flask", package_version="0.12.0"
+        ).and_return([self._FLASK_CVE]).once()
+
+        context.graph.should_receive("get_python_cve_records_all").with_args(
+            package_name="flask", package_version="1.0.0"
+        ).and_return([]).once()
+
+        pv1 = PackageVersion(
+            name="flask",
+            version="==0.12.0",
+            index=Source("https://pypi.org/simple"),
+            develop=False,
+        )
+
+        pv2 = PackageVersion(
+            name="flask",
+            version="==1.0.0",
+            index=Source("https://pypi.org/simple"),
+            develop=False,
+        )
+
+        context.recommendation_type = RecommendationType.SECURITY
+        with self.UNIT_TESTED.assigned_context(context):
+            unit = self.UNIT_TESTED()
+            unit.pre_run()
+            assert list(unit.run((pv for pv in (pv1, pv2)))) == [pv2]
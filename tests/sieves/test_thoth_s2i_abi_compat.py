@@ -96,6 +96,8 @@ class TestThothS2IAbiCompatibilitySieve(AdviserUnitTestCase):
             sieve = self.UNIT_TESTED()
             sieve.pre_run()
             assert list(sieve.run((p for p in [package_version]))) == [package_version]
+            # Required symbols are checked once per run.
+            assert list(sieve.run((p for p in [package_version]))) == [package_version]
 
     def test_abi_compat_symbols_not_present(self, context: Context) -> None:
         """Test if required symbols being missing is correctly identified."""
@@ -115,6 +117,8 @@ class TestThothS2IAbiCompatibilitySieve(AdviserUnitTestCase):
             sieve = self.UNIT_TESTED()
             sieve.pre_run()
             assert list(sieve.run((p for p in [package_version]))) == []
+            # Required symbols are checked once per run.
+            assert list(sieve.run((p for p in [package_version]))) == []
 
     def test_super_pre_run(self, context: Context) -> None:
         """Make sure the pre-run method of the base is called."""
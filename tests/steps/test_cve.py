@@ -188,3 +188,10 @@ class TestCvePenalizationStep(AdviserUnitTestCase):
                 "type": "INFO",
             }
         ]
+
+    @pytest.mark.parametrize("cve_penalization,score_max", [(-0.2, 0.0), (0.0, 0.0), (0.2, 1.0)])
+    def test_get_score_max(self, cve_penalization: float, score_max: float) -> None:
+        """Test the step does not increase score unless configured so."""
+        step = CvePenalizationStep()
+        step.update_configuration({"cve_penalization": cve_penalization})
+        assert step.get_score_max() == score_max
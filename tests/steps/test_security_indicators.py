@@ -171,6 +171,38 @@ class TestSecurityIndicatorStep(AdviserUnitTestCase):
             "gathered information regarding security."
         )
 
+    def test_security_indicator_queried_once(self) -> None:
+        """Make sure security indicators are queried once per package, including missing ones."""
+        flexmock(GraphDatabase)
+        GraphDatabase.should_receive("get_si_aggregated_python_package_version").with_args(
+            package_name="flask", package_version="0.12.0", index_url="https://pypi.org/simple"
+        ).and_return(self._SECURITY_INFO_EXISTS).once()
+        GraphDatabase.should_receive("get_si_aggregated_python_package_version").with_args(
+            package_name="flask", package_version="1.0.0", index_url="https://pypi.org/simple"
+        ).and_raise(NotFoundError).once()
+
+        pv1 = PackageVersion(
+            name="flask",
+            version="==0.12.0",
+            index=Source("https://pypi.org/simple"),
+            develop=False,
+        )
+        pv2 = PackageVersion(
+            name="flask",
+            version="==1.0.0",
+            index=Source("https://pypi.org/simple"),
+            develop=False,
+        )
+
+        context = flexmock(graph=GraphDatabase())
+        context.recommendation_type = RecommendationType.STABLE
+        with SecurityIndicatorStep.assigned_context(context):
+            step = SecurityIndicatorStep()
+            step.pre_run()
+            for _ in range(3):
+                assert step.run(None, pv1)[0] < 0
+                assert step.run(None, pv2)[0] == 0
+
     def test_security_indicator_with_high_confidence(self) -> None:
         """Make sure we don't accept package if si info is missing when recommendation is secure."""
         flexmock(GraphDatabase)
@@ -193,3 +225,12 @@ class TestSecurityIndicatorStep(AdviserUnitTestCase):
                 step.run(None, package_version)
         assert len(context.stack_info) == 1
         assert self.verify_justification_schema(context.stack_info)
+
+    @pytest.mark.parametrize(
+        "function_scaling,si_score_weight,score_max", [(1 / 1000, 0.5, 0.0), (-1 / 1000, -0.5, 0.0), (1.0, -0.5, 1.0)]
+    )
+    def test_get_score_max(self, function_scaling: float, si_score_weight: float, score_max: float) -> None:
+        """Test the step does not increase score unless configured so."""
+        step = SecurityIndicatorStep()
+        step.update_configuration({"function_scaling": function_scaling, "si_score_weight": si_score_weight})
+        assert step.get_score_max() == score_max
@@ -103,6 +103,118 @@ class TestBeam(AdviserTestCase):
         assert state1 not in list(beam.iter_states())
         assert state0 not in list(beam.iter_states())
 
+    def test_add_state_deduplicate(self) -> None:
+        """Test equivalent states are not kept in the beam twice if deduplication is turned on."""
+        package_tuple = ("flask", "1.1.1", "https://pypi.org/simple")
+        beam = Beam(deduplicate=True)
+
+        state1 = State(score=1.0)
+        state1.add_unresolved_dependency(package_tuple)
+        beam.add_state(state1)
+
+        state2 = State(score=0.5)
+        state2.add_unresolved_dependency(package_tuple)
+        beam.add_state(state2)
+
+        assert beam.iter_states() == [state1]
+        assert beam.duplicates_count == 1
+
+        state3 = State(score=2.0)
+        state3.add_unresolved_dependency(package_tuple)
+        beam.add_state(state3)
+
+        assert beam.iter_states() == [state3]
+        assert beam.duplicates_count == 2
+
+        # A state kept in the beam is adjusted, it is not equivalent to newly added states anymore.
+        state3.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        state4 = State(score=0.1)
+        state4.add_unresolved_dependency(package_tuple)
+        beam.add_state(state4)
+
+        assert beam.size == 2
+        assert beam.duplicates_count == 2
+
+        beam.remove(state4)
+        beam.remove(state3)
+        assert beam.size == 0
+
+        beam.add_state(state2)
+        assert beam.iter_states() == [state2]
+
+        beam.wipe()
+        assert beam.duplicates_count == 0
+
+    def test_add_state_deduplicate_adjusted(self) -> None:
+        """Test states adjusted after they were added to the beam are looked up by their current fingerprint."""
+        flask_tuples = [("flask", "1.1.1", "https://pypi.org/simple"), ("flask", "1.0.0", "https://pypi.org/simple")]
+        beam = Beam(deduplicate=True)
+
+        state1 = State(score=1.0)
+        state1.add_unresolved_dependency(flask_tuples[0])
+        state1.add_unresolved_dependency(flask_tuples[1])
+        beam.add_state(state1)
+
+        # Adjusted the same way the resolver does when expanding a state kept in the beam.
+        state1.remove_unresolved_dependency(flask_tuples[0])
+
+        state2 = State(score=0.5)
+        state2.add_unresolved_dependency(flask_tuples[1])
+        beam.add_state(state2)
+
+        assert beam.iter_states() == [state1]
+        assert beam.duplicates_count == 1
+
+        # State equivalent to the original content of the adjusted state is not a duplicate.
+        state3 = State(score=0.5)
+        state3.add_unresolved_dependency(flask_tuples[0])
+        state3.add_unresolved_dependency(flask_tuples[1])
+        beam.add_state(state3)
+        assert beam.size == 2
+
+        state4 = State(score=2.0)
+        state4.add_unresolved_dependency(flask_tuples[1])
+        beam.add_state(state4)
+
+        assert set(map(id, beam.iter_states())) == {id(state3), id(state4)}
+        assert beam.duplicates_count == 2
+
+        # States removed from the beam are not tracked anymore.
+        state1.add_resolved_dependency(flask_tuples[0])
+        beam.add_state(state2)
+        assert beam.size == 2
+        assert beam.duplicates_count == 3
+
+        beam.wipe()
+        state4.remove_unresolved_dependency_subtree("flask")
+        beam.add_state(state1)
+        assert beam.iter_states() == [state1]
+
+    def test_add_state_deduplicate_width(self) -> None:
+        """Test deduplication respects states pushed out of a full beam."""
+        beam = Beam(width=1, deduplicate=True)
+
+        state1 = State(score=1.0)
+        state1.add_unresolved_dependency(("flask", "1.1.1", "https://pypi.org/simple"))
+        beam.add_state(state1)
+
+        state2 = State(score=0.5)
+        state2.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        beam.add_state(state2)
+        assert beam.iter_states() == [state1]
+
+        state3 = State(score=2.0)
+        state3.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        beam.add_state(state3)
+        assert beam.iter_states() == [state3]
+
+        # The first state was pushed out of the beam, an equivalent state can be added again.
+        state4 = State(score=3.0)
+        state4.add_unresolved_dependency(("flask", "1.1.1", "https://pypi.org/simple"))
+        beam.add_state(state4)
+        assert beam.iter_states() == [state4]
+        assert beam.duplicates_count == 0
+
     def test_get_random(self) -> None:
         """Test getting a random state."""
         beam = Beam()
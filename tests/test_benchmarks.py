@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test resolver benchmarks on synthetic dependency graphs."""
+
+import pytest
+from thoth.storages.exceptions import NotFoundError
+
+from benchmarks import BenchmarkCase
+from benchmarks import SyntheticGraphDatabase
+from benchmarks import run_case
+from benchmarks.suite import PREDICTORS
+
+from .base import AdviserTestCase
+
+
+class TestBenchmarks(AdviserTestCase):
+    """Test resolver benchmarks on synthetic dependency graphs."""
+
+    def test_graph_deterministic(self) -> None:
+        """Test the synthetic graph is generated deterministically based on the seed."""
+        graph1 = SyntheticGraphDatabase(packages=10, versions=3, fan_out=2, conflict_density=0.5, seed=1)
+        graph2 = SyntheticGraphDatabase(packages=10, versions=3, fan_out=2, conflict_density=0.5, seed=1)
+
+        for version in graph1.get_package_versions():
+            assert graph1.get_depends_on("pkg0", version, "https://pypi.org/simple", extras=frozenset([None])) == (
+                graph2.get_depends_on("pkg0", version, "https://pypi.org/simple", extras=frozenset([None]))
+            )
+
+        assert graph1.get_depends_on("pkg9", "1.0.0", "https://pypi.org/simple", extras=frozenset([None])) == {None: []}
+        with pytest.raises(NotFoundError):
+            graph1.get_depends_on("pkg10", "1.0.0", "https://pypi.org/simple", extras=frozenset([None]))
+
+        assert graph1.get_solved_python_package_versions_all("pkg1", count=2, start_offset=1) == [
+            ("pkg1", "3.0.0", "https://pypi.org/simple")
+        ]
+
+    @pytest.mark.parametrize("predictor", PREDICTORS)
+    def test_run_case(self, predictor: str) -> None:
+        """Test running a benchmark case."""
+        case = BenchmarkCase(predictor=predictor, beam_width=10, packages=10, versions=3, limit=10)
+        result = run_case(case)
+
+        assert result["error"] is None
+        assert result["case"] == case.to_dict()
+        assert result["stacks"] > 0
+        assert result["iterations"] > 0
+        assert result["time_to_first_stack"] is not None
+        assert result["peak_rss"] > 0
+
+    def test_run_case_workers(self) -> None:
+        """Test running a benchmark case with multiple resolver workers."""
+        case = BenchmarkCase(
+            predictor="ApproximatingLatest", beam_width=10, packages=10, versions=3, limit=10, workers=2
+        )
+        result = run_case(case)
+
+        assert result["error"] is None
+        assert result["case"]["workers"] == 2
+        assert result["stacks"] > 0
+        assert result["accepted_final_states"] == 10
+        assert result["iterations"] > 0
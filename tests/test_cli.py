@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test serving advises by a long-lived adviser worker."""
+
+import io
+import json
+import os
+
+from flexmock import flexmock
+import pytest
+
+from thoth.adviser.cli import _AdviserWorker
+import thoth.adviser.run as run
+from thoth.storages import GraphDatabase
+
+from .base import AdviserTestCase
+
+
+class TestAdviserWorker(AdviserTestCase):
+    """Test serving advises by a long-lived adviser worker."""
+
+    _REPORT = {"products": [{"score": 1.0}], "stack_info": []}
+
+    def _get_worker(self) -> _AdviserWorker:
+        """Get a worker with a resolver producing a fixed report."""
+        worker = _AdviserWorker(graph=flexmock(GraphDatabase))
+        report = flexmock(to_dict=lambda verbose: self._REPORT)
+        resolver = flexmock(sieve_cache=None, policy_snapshot=None)
+        resolver.should_receive("resolve").with_args(with_devel=False, user_stack_scoring=True).and_return(report)
+        flexmock(_AdviserWorker).should_receive("_get_resolver").and_return(resolver).once()
+        return worker
+
+    def test_handle(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the response carries the result even if resolutions are configured to be forked."""
+        monkeypatch.setattr(run, "_FORK", True)
+        flexmock(os).should_receive("fork").times(0)
+        worker = self._get_worker()
+
+        response = worker.handle({"id": "request-1", "requirements": "flask"})
+
+        assert response["id"] == "request-1"
+        assert "duration" in response["metadata"]
+        assert response["result"]["error"] is False
+        assert response["result"]["report"] == self._REPORT
+        assert response["result"]["parameters"] == {"requirements": "flask"}
+
+    def test_serve(self) -> None:
+        """Test serving requests stated as JSON Lines."""
+        worker = self._get_worker()
+        input_file = io.BytesIO(b'{"id": 1, "requirements": "flask"}\n\n[]\n')
+        output_file = io.BytesIO()
+
+        worker.serve(input_file, output_file)
+
+        responses = [json.loads(line) for line in output_file.getvalue().splitlines()]
+        assert len(responses) == 2
+        assert responses[0]["id"] == 1
+        assert responses[0]["result"]["report"] == self._REPORT
+        assert responses[1]["id"] is None
+        assert responses[1]["result"]["error"] is True
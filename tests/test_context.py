@@ -23,9 +23,11 @@ import pytest
 
 from thoth.python import PackageVersion
 from thoth.python import Source
+from thoth.storages.exceptions import NotFoundError
 
 from thoth.adviser.state import State
 from thoth.adviser.context import Context
+from thoth.adviser.graph_io import AsyncGraph
 from thoth.adviser.enums import RecommendationType
 from thoth.adviser.enums import DecisionType
 from thoth.adviser.exceptions import NotFound
@@ -94,6 +96,60 @@ class TestContext(AdviserTestCase):
         assert context.register_accepted_final_state(state4) is None
         assert context.get_top_accepted_final_state() is state3
 
+    def test_get_accepted_final_states_threshold(self, context: Context) -> None:
+        """Test obtaining score a final state has to exceed to be kept in accepted final states."""
+        context.count = 2
+
+        assert context.get_accepted_final_states_threshold() is None
+        context.register_accepted_final_state(State(score=1.0))
+        assert context.get_accepted_final_states_threshold() is None
+        context.register_accepted_final_state(State(score=0.5))
+        assert context.get_accepted_final_states_threshold() == 0.5
+        context.register_accepted_final_state(State(score=2.0))
+        assert context.get_accepted_final_states_threshold() == 1.0
+        context.register_accepted_final_state(State(score=0.1))
+        assert context.get_accepted_final_states_threshold() == 1.0
+
+    def test_learn_conflicts(self, context: Context) -> None:
+        """Test learning conflicts of package tuples leading to dead ends."""
+        flask_tuple = ("flask", "1.1.1", "https://pypi.org/simple")
+        click_tuples = [
+            ("click", "7.0", "https://pypi.org/simple"),
+            ("click", "8.0", "https://pypi.org/simple"),
+        ]
+        werkzeug_tuple = ("werkzeug", "1.0.0", "https://pypi.org/simple")
+        jinja2_tuple = ("jinja2", "3.0.0", "https://pypi.org/simple")
+
+        state = State()
+        state.add_unresolved_dependency(flask_tuple)
+        state.add_unresolved_dependency(werkzeug_tuple)
+        state.add_unresolved_dependency(click_tuples[0])
+        state.add_resolved_dependency(jinja2_tuple)
+
+        assert not context.is_conflicting(state, flask_tuple)
+        assert context.get_conflicting_dependencies(state) == {}
+
+        context.learn_requirement(flask_tuple, "click", [click_tuples[1]])
+        assert context.is_conflicting(state, flask_tuple)
+        assert context.get_conflicting_dependencies(state) == {"flask": [flask_tuple]}
+
+        state.add_unresolved_dependency(click_tuples[1])
+        assert not context.is_conflicting(state, flask_tuple)
+
+        state.remove_unresolved_dependency_subtree("click")
+        state.add_resolved_dependency(click_tuples[0])
+        assert context.is_conflicting(state, flask_tuple)
+
+        context.learn_conflict(werkzeug_tuple, jinja2_tuple)
+        assert context.is_conflicting(state, werkzeug_tuple)
+        assert not context.is_conflicting(State(), werkzeug_tuple)
+
+        context.learn_unsolvable(jinja2_tuple)
+        context.learn_unsolvable(jinja2_tuple)
+        assert context.is_conflicting(State(), jinja2_tuple)
+        assert context.get_conflicting_dependencies(state) == {"flask": [flask_tuple], "werkzeug": [werkzeug_tuple]}
+        assert context.learned_conflicts_count == 3
+
     def test_register_accepted_final_state(self, context: Context) -> None:
         """Test registering accepted final state and final state manipulation."""
         context.count = 2
@@ -141,6 +197,25 @@ class TestContext(AdviserTestCase):
         assert context.get_package_version(package_version.to_tuple()) is package_version
         assert context.register_package_version(package_version) is True
 
+    def test_merge_package_version(self, context: Context, package_version: PackageVersion) -> None:
+        """Test merging a package version created in another context."""
+        package_tuple = package_version.to_tuple()
+        assert context.merge_package_version(package_version) is package_version
+        assert context.get_package_version(package_tuple) is package_version
+        assert context.get_package_record(package_tuple).develop is False
+        assert context.get_version_rank(package_tuple) == 0
+        assert context.dependents == {}
+
+        other_package_version = PackageVersion(
+            name=package_version.name,
+            version=package_version.version,
+            index=package_version.index,
+            develop=True,
+        )
+        assert context.merge_package_version(other_package_version) is package_version
+        assert context.get_package_record(package_tuple).develop is True
+        assert package_version.develop is True
+
     def test_register_package_tuple_new(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
         """Test registering a new package tuple to the context."""
         with pytest.raises(NotFound):
@@ -176,7 +251,9 @@ class TestContext(AdviserTestCase):
             package_tuple, develop=True, extras=extras, os_name="fedora", os_version="31", python_version="3.7"
         )
 
-        assert package_version_registered is not None
+        assert isinstance(package_version_registered, PackageVersion)
+        assert package_version_registered.develop is True
+        assert package_version_registered.extras == extras
 
         package_version_another = context.register_package_tuple(
             package_tuple, develop=True, extras=extras, os_name="fedora", os_version="31", python_version="3.7"
@@ -184,6 +261,256 @@ class TestContext(AdviserTestCase):
 
         assert package_version_registered is package_version_another, "Different instances returned"
 
+    def test_register_package_record(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test package versions are created only once asked for."""
+        package_record = context.register_package_record(
+            package_tuple, develop=True, os_name=None, os_version=None, python_version=None
+        )
+
+        assert context.get_package_record(package_tuple) is package_record
+        assert package_tuple not in context.package_versions
+
+        context.register_package_record(
+            package_tuple, develop=False, os_name=None, os_version=None, python_version=None
+        )
+        assert package_record.develop is True
+
+        package_version = context.get_package_version(package_tuple)
+        assert package_version.develop is True
+        assert context.package_versions[package_tuple] is package_version
+        assert context.get_package_version(package_tuple) is package_version
+
+        package_record.develop = False
+        context.register_package_record(package_tuple, develop=True, os_name=None, os_version=None, python_version=None)
+        assert package_version.develop is True
+
+        another_tuple = ("flask", "1.0.0", "https://pypi.org/simple")
+        assert context.get_package_record(another_tuple, graceful=True) is None
+        with pytest.raises(NotFound):
+            context.get_package_record(another_tuple)
+
+    def test_get_version_rank(self, context: Context) -> None:
+        """Test ranking versions of packages registered to the context."""
+        pypi = "https://pypi.org/simple"
+        for version in ("1.0.0", "2.0.0rc1", "0.9", "2.0.0"):
+            context.register_package_tuple(
+                ("flask", version, pypi), develop=False, os_name=None, os_version=None, python_version=None
+            )
+
+        context.register_package_tuple(
+            ("selinon", "1.0", pypi), develop=False, os_name=None, os_version=None, python_version=None
+        )
+        package_version = PackageVersion(
+            name="flask", version="==1.0", index=Source("https://thoth-station.ninja/simple"), develop=False
+        )
+        context.register_package_version(package_version)
+
+        assert context.get_version_ranks("flask") == {"0.9": 0, "1.0.0": 1, "1.0": 1, "2.0.0rc1": 2, "2.0.0": 3}
+        assert context.get_version_rank(("selinon", "1.0", pypi)) == 0
+        assert context.get_version_rank(("flask", "2.0.0", pypi)) == 3
+        assert context.get_version_ranks("tensorflow") == {}
+
+        with pytest.raises(NotFound):
+            context.get_version_rank(("flask", "3.0.0", pypi))
+
+    def test_intern_package_tuple(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test obtaining a canonical instance of a package tuple."""
+        assert context.intern_package_tuple(package_tuple) is package_tuple
+
+        another_package_tuple = tuple(list(package_tuple))
+        assert another_package_tuple is not package_tuple
+        assert context.intern_package_tuple(another_package_tuple) is package_tuple
+
+    def test_get_depends_on(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test retrieving dependencies is done once per package tuple and extras."""
+        dependencies = {"selinonlib": [("selinonlib", "1.0.0")]}
+        context.graph.should_receive("get_depends_on").with_args(
+            *package_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset([None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_return(dependencies).once()
+
+        assert context.get_depends_on(package_tuple, extras=frozenset([None])) is dependencies
+        assert context.get_depends_on(package_tuple, extras=frozenset([None])) is dependencies
+
+    def test_get_depends_on_not_found(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test a negative result is cached when retrieving dependencies."""
+        context.graph.should_receive("get_depends_on").with_args(
+            *package_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset(["postgresql", None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_raise(NotFoundError).once()
+
+        with pytest.raises(NotFoundError):
+            context.get_depends_on(package_tuple, extras=frozenset(["postgresql", None]))
+
+        with pytest.raises(NotFoundError):
+            context.get_depends_on(package_tuple, extras=frozenset(["postgresql", None]))
+
+    def test_prefetch_depends_on(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test dependencies of multiple packages are fetched in one pass, once per package tuple and extras."""
+        other_tuple = ("flexmock", "0.10.4", "https://pypi.org/simple")
+        dependencies = {"selinonlib": [("selinonlib", "1.0.0")]}
+        context.graph.should_receive("get_depends_on").with_args(
+            *package_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset([None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_return(dependencies).once()
+        context.graph.should_receive("get_depends_on").with_args(
+            *other_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset([None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_raise(NotFoundError).once()
+
+        context.prefetch_depends_on(
+            [(package_tuple, frozenset([None])), (other_tuple, frozenset([None])), (package_tuple, frozenset([None]))]
+        )
+        context.prefetch_depends_on([(package_tuple, frozenset([None]))])
+
+        assert context.get_depends_on(package_tuple, extras=frozenset([None])) is dependencies
+        with pytest.raises(NotFoundError):
+            context.get_depends_on(other_tuple, extras=frozenset([None]))
+
+    def test_prefetch_graph_io(self, context: Context, package_tuple: Tuple[str, str, str]) -> None:
+        """Test dependencies and records are fetched concurrently if enabled."""
+        other_tuple = ("flexmock", "0.10.4", "https://pypi.org/simple")
+        dependencies = {"selinonlib": [("selinonlib", "1.0.0")]}
+        context.graph.should_receive("get_depends_on").with_args(
+            *package_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset([None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_return(dependencies).once()
+        context.graph.should_receive("get_depends_on").with_args(
+            *other_tuple,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+            extras=frozenset([None]),
+            marker_evaluation_result=None,
+            is_missing=False,
+        ).and_raise(NotFoundError).once()
+        for package_name, package_version in (("selinonlib", "1.0.0"), ("flexmock", "0.10.4")):
+            context.graph.should_receive("get_python_package_version_records").with_args(
+                package_name=package_name,
+                package_version=package_version,
+                index_url=None,
+                os_name=None,
+                os_version=None,
+                python_version=None,
+            ).and_return([{"package_name": package_name}]).once()
+
+        context.graph_io = AsyncGraph(graph=context.graph, max_workers=2)
+        try:
+            context.prefetch_depends_on([(package_tuple, frozenset([None])), (other_tuple, frozenset([None]))])
+            context.prefetch_python_package_version_records([("selinonlib", "1.0.0"), ("flexmock", "0.10.4")])
+        finally:
+            context.graph_io.close()
+
+        assert context.get_depends_on(package_tuple, extras=frozenset([None])) is dependencies
+        with pytest.raises(NotFoundError):
+            context.get_depends_on(other_tuple, extras=frozenset([None]))
+
+        assert context.get_python_package_version_records("flexmock", "0.10.4") == [{"package_name": "flexmock"}]
+
+    def test_prefetch_product_data(self, context: Context) -> None:
+        """Test hashes and markers are retrieved once for the union of packages in all the states."""
+        tensorflow_tuple = ("tensorflow", "2.0.0", "https://pypi.org/simple")
+        numpy_tuple = ("numpy", "1.17.4", "https://pypi.org/simple")
+        scipy_tuple = ("scipy", "1.4.0", "https://pypi.org/simple")
+        state1 = State(resolved_dependencies={"tensorflow": tensorflow_tuple, "numpy": numpy_tuple})
+        state2 = State(resolved_dependencies={"tensorflow": tensorflow_tuple, "scipy": scipy_tuple})
+
+        pypi = Source("https://pypi.org/simple")
+        for package_tuple in (tensorflow_tuple, numpy_tuple, scipy_tuple):
+            context.register_package_version(
+                PackageVersion(name=package_tuple[0], version="==" + package_tuple[1], index=pypi, develop=False)
+            )
+            context.graph.should_receive("get_python_package_hashes_sha256").with_args(*package_tuple).and_return(
+                [package_tuple[0]]
+            ).once()
+
+        numpy_dependent = (tensorflow_tuple, "fedora", "31", "3.7")
+        scipy_dependent = (numpy_tuple, "fedora", "31", "3.7")
+        context.dependents = {
+            "tensorflow": {tensorflow_tuple: {numpy_dependent}},
+            "numpy": {numpy_tuple: {numpy_dependent}},
+            "scipy": {scipy_tuple: {scipy_dependent}},
+        }
+        marker_kwargs = dict(os_name="fedora", os_version="31", python_version="3.7", marker_evaluation_result=True)
+        context.graph.should_receive("get_python_environment_marker").with_args(
+            *tensorflow_tuple, dependency_name="numpy", dependency_version="1.17.4", **marker_kwargs
+        ).and_return("python_version >= '3.7'").once()
+        context.graph.should_receive("get_python_environment_marker").with_args(
+            *numpy_tuple, dependency_name="scipy", dependency_version="1.4.0", **marker_kwargs
+        ).and_raise(NotFoundError).once()
+
+        # Tensorflow is a direct dependency, markers are taken from the Pipfile.
+        assert "tensorflow" in context.project.pipfile.packages.packages
+        context.prefetch_product_data([state1, state2])
+        context.prefetch_product_data([state2])
+
+        assert context.get_python_package_hashes_sha256(scipy_tuple) == ["scipy"]
+        assert context.get_python_environment_marker(numpy_dependent, numpy_tuple) == "python_version >= '3.7'"
+        with pytest.raises(NotFoundError):
+            context.get_python_environment_marker(scipy_dependent, scipy_tuple)
+
+    def test_prefetch_python_package_version_records(self, context: Context) -> None:
+        """Test records are fetched once per package name and version."""
+        records = [
+            {
+                "package_name": "selinonlib",
+                "package_version": "1.0.0",
+                "index_url": "https://pypi.org/simple",
+                "os_name": None,
+                "os_version": None,
+                "python_version": None,
+            }
+        ]
+        context.graph.should_receive("get_python_package_version_records").with_args(
+            package_name="selinonlib",
+            package_version="1.0.0",
+            index_url=None,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+        ).and_return(records).once()
+        context.graph.should_receive("get_python_package_version_records").with_args(
+            package_name="flexmock",
+            package_version="0.10.4",
+            index_url=None,
+            os_name=None,
+            os_version=None,
+            python_version=None,
+        ).and_return([]).once()
+
+        context.prefetch_python_package_version_records(
+            [("selinonlib", "1.0.0"), ("flexmock", "0.10.4"), ("selinonlib", "1.0.0")]
+        )
+        context.prefetch_python_package_version_records([("selinonlib", "1.0.0")])
+
+        assert context.get_python_package_version_records("selinonlib", "1.0.0") is records
+        assert context.get_python_package_version_records("flexmock", "0.10.4") == []
+
     def test_note_dependencies(self, context: Context) -> None:
         """Test noting dependencies to the context."""
         dependency_tuple = ("tensorboard", "2.1.0", "https://pypi.org/simple")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test running graph database queries concurrently."""
+
+import threading
+import time
+from typing import Any
+from typing import List
+
+import pytest
+from flexmock import flexmock
+from thoth.storages import GraphDatabase
+from thoth.storages.exceptions import NotFoundError
+
+from thoth.adviser.graph_io import AsyncGraph
+
+from .base import AdviserTestCase
+
+
+class TestAsyncGraph(AdviserTestCase):
+    """Test running graph database queries concurrently."""
+
+    @pytest.mark.parametrize("max_workers", [0, -1, None])
+    def test_max_workers(self, max_workers: int) -> None:
+        """Test validation of the number of workers."""
+        with pytest.raises(ValueError):
+            AsyncGraph(graph=GraphDatabase(), max_workers=max_workers)
+
+    def test_gather(self) -> None:
+        """Test queries are run concurrently and results are returned in order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_python_package_hashes_sha256(package_name: str, package_version: str, index_url: str) -> List[str]:
+            # Each query waits for the other ones - the test would time out if queries were run serially.
+            barrier.wait()
+            return [package_name]
+
+        graph = flexmock(get_python_package_hashes_sha256=get_python_package_hashes_sha256)
+        graph_io = AsyncGraph(graph=graph, max_workers=3)
+        try:
+            result = graph_io.gather(
+                *(
+                    graph_io.get_python_package_hashes_sha256(name, "1.0.0", "https://pypi.org/simple")
+                    for name in ("a", "b", "c")
+                )
+            )
+        finally:
+            graph_io.close()
+
+        assert result == [["a"], ["b"], ["c"]]
+
+    def test_gather_bounded(self) -> None:
+        """Test the number of concurrent queries is bounded by the number of workers."""
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def get_python_environment_marker(*args: Any, **kwargs: Any) -> None:
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+
+            time.sleep(0.01)
+
+            with lock:
+                running[0] -= 1
+
+        graph = flexmock(get_python_environment_marker=get_python_environment_marker)
+        graph_io = AsyncGraph(graph=graph, max_workers=2)
+        try:
+            assert graph_io.gather(*(graph_io.get_python_environment_marker() for _ in range(8))) == [None] * 8
+        finally:
+            graph_io.close()
+
+        assert max_running[0] <= 2
+
+    def test_gather_exceptions(self) -> None:
+        """Test exceptions raised by queries are propagated or returned."""
+        graph = GraphDatabase()
+        flexmock(graph).should_receive("get_python_cve_records_all").with_args(package_name="flask").and_raise(
+            NotFoundError
+        )
+        flexmock(graph).should_receive("get_python_cve_records_all").with_args(package_name="click").and_return([])
+
+        graph_io = AsyncGraph(graph=graph)
+        try:
+            with pytest.raises(NotFoundError):
+                graph_io.gather(graph_io.get_python_cve_records_all(package_name="flask"))
+
+            result = graph_io.gather(
+                graph_io.get_python_cve_records_all(package_name="flask"),
+                graph_io.get_python_cve_records_all(package_name="click"),
+                return_exceptions=True,
+            )
+        finally:
+            graph_io.close()
+
+        assert isinstance(result[0], NotFoundError)
+        assert result[1] == []
+
+    def test_close(self) -> None:
+        """Test the facade can be used after it was closed."""
+        graph = GraphDatabase()
+        flexmock(graph).should_receive("get_depends_on").and_return({None: []}).twice()
+
+        graph_io = AsyncGraph(graph=graph)
+        assert graph_io.gather() == []
+        assert graph_io.gather(graph_io.get_depends_on("flask", "1.0.0", "https://pypi.org/simple")) == [{None: []}]
+        graph_io.close()
+        assert graph_io.gather(graph_io.get_depends_on("flask", "1.0.0", "https://pypi.org/simple")) == [{None: []}]
+        graph_io.close()
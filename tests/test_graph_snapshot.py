@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test offline graph snapshots."""
+
+import datetime
+import json
+import struct
+
+import pytest
+from flexmock import flexmock
+
+from thoth.adviser.exceptions import GraphSnapshotError
+from thoth.adviser.graph_snapshot import GraphSnapshot
+from thoth.adviser.graph_snapshot import GraphSnapshotRecorder
+from thoth.storages import GraphDatabase
+from thoth.storages.exceptions import NotFoundError
+
+from .base import AdviserTestCase
+
+
+class TestGraphSnapshot(AdviserTestCase):
+    """Test recording and replaying graph database queries."""
+
+    def test_record_replay(self, tmp_path) -> None:
+        """Test queries recorded are answered from the snapshot."""
+        flexmock(GraphDatabase)
+        graph = GraphDatabase()
+        graph.should_receive("get_depends_on").with_args(
+            "flask", "1.1.2", "https://pypi.org/simple", extras=frozenset([None, "dotenv"]), is_missing=False
+        ).and_return({None: [("click", "7.1.2")], "dotenv": [("python-dotenv", "0.15.0")]}).once()
+        graph.should_receive("get_python_package_hashes_sha256").with_args(
+            "flask", "1.1.2", "https://pypi.org/simple"
+        ).and_raise(NotFoundError).once()
+
+        recorder = GraphSnapshotRecorder(graph)
+        assert recorder.get_depends_on(
+            "flask", "1.1.2", "https://pypi.org/simple", extras=frozenset(["dotenv", None]), is_missing=False
+        ) == {None: [("click", "7.1.2")], "dotenv": [("python-dotenv", "0.15.0")]}
+        with pytest.raises(NotFoundError):
+            recorder.get_python_package_hashes_sha256("flask", "1.1.2", "https://pypi.org/simple")
+
+        assert recorder.records_count == 2
+        assert recorder.DEFAULT_COUNT == GraphDatabase.DEFAULT_COUNT
+
+        snapshot_path = str(tmp_path / "graph.snapshot")
+        recorder.dump(snapshot_path)
+
+        snapshot = GraphSnapshot(snapshot_path)
+        assert not snapshot.is_connected()
+        snapshot.connect()
+        assert snapshot.is_connected()
+
+        assert snapshot.DEFAULT_COUNT == GraphDatabase.DEFAULT_COUNT
+        assert snapshot.get_depends_on(
+            "flask", "1.1.2", "https://pypi.org/simple", extras=frozenset([None, "dotenv"]), is_missing=False
+        ) == {None: [("click", "7.1.2")], "dotenv": [("python-dotenv", "0.15.0")]}
+        with pytest.raises(NotFoundError):
+            snapshot.get_python_package_hashes_sha256("flask", "1.1.2", "https://pypi.org/simple")
+
+        with pytest.raises(GraphSnapshotError):
+            snapshot.get_python_package_hashes_sha256("flask", "1.1.1", "https://pypi.org/simple")
+
+        snapshot.disconnect()
+        assert not snapshot.is_connected()
+
+    def test_invalid_snapshot(self, tmp_path) -> None:
+        """Test loading a file which is not a graph snapshot."""
+        snapshot_path = tmp_path / "graph.snapshot"
+        snapshot_path.write_bytes(b"Thoth")
+
+        with pytest.raises(GraphSnapshotError):
+            GraphSnapshot(str(snapshot_path)).connect()
+
+    def test_record_types(self, tmp_path) -> None:
+        """Test types not available in JSON are preserved in the snapshot."""
+        result = [
+            {
+                "package_name": "flask",
+                "extras": frozenset(["dotenv"]),
+                "names": {"flask"},
+                "versions": ("1.1.2", None),
+                "release": datetime.date(2020, 4, 3),
+                "analyzed": datetime.datetime(2021, 1, 2, 3, 4, 5),
+                ("nested", 1): [1.5, True],
+            }
+        ]
+        flexmock(GraphDatabase)
+        graph = GraphDatabase()
+        graph.should_receive("get_python_package_version_records").and_return(result).once()
+
+        recorder = GraphSnapshotRecorder(graph)
+        assert recorder.get_python_package_version_records(count=None) == result
+
+        snapshot_path = str(tmp_path / "graph.snapshot")
+        recorder.dump(snapshot_path)
+
+        replayed = GraphSnapshot(snapshot_path).get_python_package_version_records(count=None)
+        assert replayed == result
+        assert isinstance(replayed[0]["versions"], tuple)
+
+    def test_record_unsupported(self, tmp_path) -> None:
+        """Test query results that cannot be stored are reported."""
+        flexmock(GraphDatabase)
+        graph = GraphDatabase()
+        graph.should_receive("get_python_package_version_records").and_return([object()]).once()
+
+        recorder = GraphSnapshotRecorder(graph)
+        recorder.get_python_package_version_records(count=None)
+
+        with pytest.raises(GraphSnapshotError):
+            recorder.dump(str(tmp_path / "graph.snapshot"))
+
+    def test_snapshot_version(self, tmp_path) -> None:
+        """Test snapshots in a different format version are not loaded."""
+        snapshot_path = tmp_path / "graph.snapshot"
+        index = json.dumps({"attributes": {}, "index": {}}).encode()
+        snapshot_path.write_bytes(struct.pack("<7sBQ", b"THOTHGS", 1, 16) + index)
+
+        with pytest.raises(GraphSnapshotError):
+            GraphSnapshot(str(snapshot_path)).connect()
+
+    def test_snapshot_malformed_index(self, tmp_path) -> None:
+        """Test loading a snapshot with a malformed index."""
+        snapshot_path = tmp_path / "graph.snapshot"
+        snapshot_path.write_bytes(struct.pack("<7sBQ", b"THOTHGS", 2, 16) + b"[1, 2]")
+
+        with pytest.raises(GraphSnapshotError):
+            GraphSnapshot(str(snapshot_path)).connect()
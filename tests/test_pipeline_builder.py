@@ -18,6 +18,8 @@
 """Test pipeline builder used for building pipeline configuration."""
 
 import os
+from typing import Any
+from typing import Generator
 from typing import Union
 from typing import Dict
 
@@ -32,6 +34,8 @@ from thoth.adviser.enums import DecisionType
 from thoth.adviser.enums import RecommendationType
 from thoth.adviser.pipeline_builder import PipelineBuilder
 from thoth.adviser.pipeline_builder import PipelineBuilderContext
+from thoth.adviser.prescription import Prescription
+from thoth.adviser.prescription.v1 import UnitPrescription
 from thoth.adviser.pseudonym import Pseudonym
 from thoth.adviser.sieve import Sieve
 from thoth.adviser.step import Step
@@ -155,6 +159,23 @@ class TestPipelineBuilderContext(AdviserTestCase):
         assert builder_context.is_included(unit_class)
         assert getattr(builder_context, builder_context_attr)[-1] is unit
 
+    def test_track_dependencies(self) -> None:
+        """Test tracking parts of the pipeline configuration read by a unit."""
+        builder_context = PipelineBuilderContext(decision_type=DecisionType.RANDOM)
+        builder_context.add_unit(units.boots.Boot1())
+        assert builder_context.changes_count == 1
+
+        with builder_context.track_dependencies() as dependencies:
+            builder_context.is_included(units.steps.Step1)
+            list(builder_context.get_included_sieve_names())
+            builder_context.add_unit(units.wraps.Wrap1())
+
+        assert dependencies == {("steps", "Step1"), ("sieves", None)}
+        builder_context.is_included(units.boots.Boot2)
+        assert dependencies == {("steps", "Step1"), ("sieves", None)}
+        assert builder_context.get_changes() == [("boots", "Boot1"), ("wraps", "Wrap1")]
+        assert builder_context.get_changes(1) == [("wraps", "Wrap1")]
+
     def test_get_included_boots(self) -> None:
         """Test get included boots of the provided boot class."""
         builder_context = PipelineBuilderContext(decision_type=DecisionType.RANDOM)
@@ -240,22 +261,25 @@ class TestPipelineBuilder(AdviserTestCase):
     ) -> None:
         """Test building configuration."""
         # All test units do not register themselves - let's cherry-pick ones that should be present.
-        # There are done 3 iterations in total during pipeline configuration creation.
+        # Units are evaluated again only once a unit they check gets included or once they include themselves.
         flexmock(units.boots.Boot1).should_receive("should_include").and_yield(
             {"some_parameter": 1.0}
-        ).and_yield().and_yield().times(3)
-        flexmock(units.pseudonyms.Pseudonym2).should_receive("should_include").and_yield(
-            {}
-        ).and_yield().and_yield().times(3)
-        flexmock(units.sieves.Sieve2).should_receive("should_include").and_yield(
-            {"foo": "bar"}
-        ).and_yield().and_yield().times(3)
-        flexmock(units.steps.Step1).should_receive("should_include").and_yield({}).and_yield().and_yield().times(3)
-        flexmock(units.strides.Stride2).should_receive("should_include").and_yield({}).and_yield().and_yield().times(3)
-        flexmock(units.strides.Stride1).should_receive("should_include").and_yield().and_yield(
-            {"linus": "torvalds"}
-        ).and_yield().times(3)
-        flexmock(units.wraps.Wrap2).should_receive("should_include").and_yield({}).and_yield().and_yield().times(3)
+        ).and_yield().times(2)
+        flexmock(units.boots.Boot2).should_receive("should_include").and_yield().once()
+        flexmock(units.pseudonyms.Pseudonym2).should_receive("should_include").and_yield({}).and_yield().times(2)
+        flexmock(units.sieves.Sieve2).should_receive("should_include").and_yield({"foo": "bar"}).and_yield().times(2)
+        flexmock(units.steps.Step1).should_receive("should_include").and_yield({}).and_yield().times(2)
+        flexmock(units.strides.Stride2).should_receive("should_include").and_yield({}).and_yield().times(2)
+        flexmock(units.wraps.Wrap2).should_receive("should_include").and_yield({}).and_yield().times(2)
+
+        def _stride1_should_include(builder_context: PipelineBuilderContext) -> Generator[Dict[str, Any], None, None]:
+            # Included in the second round, once Wrap2 is included.
+            if builder_context.is_included(units.wraps.Wrap2) and not builder_context.is_included(
+                units.strides.Stride1
+            ):
+                yield {"linus": "torvalds"}
+
+        flexmock(units.strides.Stride1).should_receive("should_include").replace_with(_stride1_should_include).times(3)
 
         # It is not relevant if adviser/dependency monkey is called in this case.
         pipeline = getattr(PipelineBuilder, pipeline_config_method)(
@@ -349,6 +373,54 @@ class TestPipelineBuilder(AdviserTestCase):
         finally:
             os.environ.pop("THOTH_ADVISER_BLOCKED_UNITS")
 
+    @use_test_units
+    def test_prescription_inclusion_candidates(self, project: Project) -> None:
+        """Test including prescription units statically matching pipeline configuration."""
+
+        def _boot(name: str, should_include: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "name": name,
+                "type": "boot",
+                "should_include": should_include,
+                "run": {"log": {"message": "Some text printed", "type": "INFO"}},
+            }
+
+        prescription = Prescription.from_dict(
+            {
+                "units": {
+                    "boots": [
+                        _boot(
+                            "DependentBoot",
+                            {"adviser_pipeline": True, "dependencies": {"boots": ["thoth.AdviserBoot"]}},
+                        ),
+                        _boot("LabelBoot", {"adviser_pipeline": True, "labels": {"foo": "bar"}}),
+                        _boot("AdviserBoot", {"adviser_pipeline": True}),
+                    ],
+                },
+            },
+            prescription_instance=Prescription(),
+            prescription_name="thoth",
+            prescription_release="2021.06.15",
+        )
+
+        get_inclusion_candidates = Prescription.get_inclusion_candidates
+        flexmock(Prescription).should_receive("get_inclusion_candidates").replace_with(
+            lambda builder_context: get_inclusion_candidates(prescription, builder_context)
+        ).once()
+
+        pipeline = PipelineBuilder.get_adviser_pipeline_config(
+            recommendation_type=RecommendationType.LATEST,
+            graph=None,
+            project=project,
+            labels={},
+            library_usage=None,
+            prescription=prescription,
+            cli_parameters=None,
+        )
+
+        assert [boot.name for boot in pipeline.boots] == ["thoth.AdviserBoot", "thoth.DependentBoot"]
+        assert not UnitPrescription.SHOULD_INCLUDE_CACHE
+
     @use_test_units
     def test_from_dict(self) -> None:
         """Test instantiation of a pipeline from a dictionary."""
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test caching pipeline configurations across resolver runs."""
+
+from typing import Any
+from typing import Dict
+
+from flexmock import flexmock
+import pytest
+
+from thoth.adviser.enums import DecisionType
+from thoth.adviser.enums import RecommendationType
+from thoth.adviser.pipeline_cache import PipelineCache
+from thoth.adviser.prescription import Prescription
+from thoth.python import Project
+
+import tests.units as units
+
+from .base import AdviserTestCase
+from .helpers import use_test_units
+
+
+class TestPipelineCache(AdviserTestCase):
+    """Test caching pipeline configurations across resolver runs."""
+
+    @staticmethod
+    def _get_prescription() -> Prescription:
+        """Get a prescription with a single boot unit."""
+        return Prescription.from_dict(
+            {
+                "units": {
+                    "boots": [
+                        {
+                            "name": "AdviserBoot",
+                            "type": "boot",
+                            "should_include": {"adviser_pipeline": True},
+                            "run": {"log": {"message": "Some text printed", "type": "INFO"}},
+                        },
+                    ],
+                },
+            },
+            prescription_instance=Prescription(),
+            prescription_name="thoth",
+            prescription_release="2021.06.15",
+        )
+
+    @staticmethod
+    def _get_kwargs(project: Project, prescription: Prescription) -> Dict[str, Any]:
+        """Get arguments for obtaining adviser pipeline configuration."""
+        return {
+            "recommendation_type": RecommendationType.LATEST,
+            "graph": None,
+            "project": project,
+            "labels": {},
+            "library_usage": None,
+            "prescription": prescription,
+            "cli_parameters": {},
+        }
+
+    @use_test_units
+    def test_get_adviser_pipeline_config(self, project: Project) -> None:
+        """Test obtaining a pipeline configuration built once with fresh units."""
+        flexmock(units.boots.Boot1).should_receive("should_include").and_yield(
+            {"some_parameter": 1.0}
+        ).and_yield().times(2)
+        flexmock(units.steps.Step1).should_receive("should_include").and_yield({}).and_yield().times(2)
+
+        cache = PipelineCache()
+        kwargs = self._get_kwargs(project, self._get_prescription())
+
+        pipeline = cache.get_adviser_pipeline_config(**kwargs)
+        assert cache.hits == 0
+        assert cache.misses == 1
+        assert len(cache) == 1
+
+        cached_pipeline = cache.get_adviser_pipeline_config(**kwargs)
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+        assert cached_pipeline.to_dict() == pipeline.to_dict()
+        assert [unit.name for unit in cached_pipeline.boots] == ["Boot1", "thoth.AdviserBoot"]
+        assert cached_pipeline.boots[0].configuration["some_parameter"] == 1.0
+        for unit, cached_unit in zip(pipeline.iter_units(), cached_pipeline.iter_units()):
+            assert unit is not cached_unit
+            assert unit.configuration is not cached_unit.configuration
+
+    @use_test_units
+    def test_get_dependency_monkey_pipeline_config(self, project: Project) -> None:
+        """Test pipeline configurations for adviser and Dependency Monkey are cached separately."""
+        cache = PipelineCache()
+        kwargs = self._get_kwargs(project, self._get_prescription())
+        cache.get_adviser_pipeline_config(**kwargs)
+
+        kwargs.pop("recommendation_type")
+        pipeline = cache.get_dependency_monkey_pipeline_config(decision_type=DecisionType.RANDOM, **kwargs)
+        assert cache.hits == 0
+        assert cache.misses == 2
+        assert pipeline.boots == []
+
+    @use_test_units
+    def test_lru(self, project: Project) -> None:
+        """Test evicting least recently used pipeline configurations."""
+        cache = PipelineCache(max_size=2)
+        kwargs = self._get_kwargs(project, prescription=None)
+
+        cache.get_adviser_pipeline_config(**dict(kwargs, labels={"foo": "bar"}))
+        cache.get_adviser_pipeline_config(**dict(kwargs, labels={"foo": "baz"}))
+        cache.get_adviser_pipeline_config(**dict(kwargs, labels={"foo": "bar"}))
+        assert cache.hits == 1
+
+        cache.get_adviser_pipeline_config(**kwargs)
+        assert len(cache) == 2
+        cache.get_adviser_pipeline_config(**dict(kwargs, labels={"foo": "bar"}))
+        assert cache.hits == 2
+        cache.get_adviser_pipeline_config(**dict(kwargs, labels={"foo": "baz"}))
+        assert cache.hits == 2
+        assert cache.misses == 4
+
+    def test_compute_fingerprint(self, project: Project) -> None:
+        """Test computing fingerprint of inputs affecting pipeline configuration creation."""
+        kwargs = {"project": project, "labels": {}, "library_usage": None}
+        fingerprint = PipelineCache.compute_fingerprint(recommendation_type=RecommendationType.LATEST, **kwargs)
+
+        assert fingerprint == PipelineCache.compute_fingerprint(recommendation_type=RecommendationType.LATEST, **kwargs)
+        assert fingerprint != PipelineCache.compute_fingerprint(recommendation_type=RecommendationType.STABLE, **kwargs)
+        assert fingerprint != PipelineCache.compute_fingerprint(decision_type=DecisionType.RANDOM, **kwargs)
+        assert fingerprint != PipelineCache.compute_fingerprint(
+            recommendation_type=RecommendationType.LATEST, **dict(kwargs, labels={"foo": "bar"})
+        )
+        assert fingerprint != PipelineCache.compute_fingerprint(
+            recommendation_type=RecommendationType.LATEST, **dict(kwargs, library_usage={"tensorflow": []})
+        )
+
+    @pytest.mark.parametrize("max_size", [0, -1, None])
+    def test_max_size_error(self, max_size: Any) -> None:
+        """Test raising an error on invalid cache size."""
+        with pytest.raises(ValueError):
+            PipelineCache(max_size=max_size)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test snapshots of policies learnt by predictors."""
+
+import pytest
+
+from thoth.adviser.context import Context
+from thoth.adviser.exceptions import PolicySnapshotError
+from thoth.adviser.policy_snapshot import PolicySnapshot
+from thoth.adviser.predictors import MCTS
+from thoth.adviser.predictors import TemporalDifference
+
+from .base import AdviserTestCase
+
+
+class TestPolicySnapshot(AdviserTestCase):
+    """Test snapshots of policies learnt by predictors."""
+
+    _POLICY = {
+        ("tensorflow", "2.1.0", "https://pypi.org/simple"): [1.5, 3],
+        ("numpy", "1.19.0", "https://pypi.org/simple"): [-0.2, 1],
+    }
+
+    def test_get_set(self) -> None:
+        """Test storing and retrieving policies."""
+        snapshot = PolicySnapshot()
+        assert snapshot.get("fingerprint") is None
+
+        snapshot.set("fingerprint", self._POLICY)
+        policy = snapshot.get("fingerprint")
+        assert policy == self._POLICY
+        assert snapshot.get("another-fingerprint") is None
+
+        # Records are copied so that learning does not modify the snapshot.
+        policy[("numpy", "1.19.0", "https://pypi.org/simple")][1] += 1
+        assert snapshot.get("fingerprint") == self._POLICY
+
+    def test_dump_load(self, tmp_path) -> None:
+        """Test persisting the policy snapshot."""
+        path = str(tmp_path / "policy.snapshot")
+
+        snapshot = PolicySnapshot.load(path)
+        assert snapshot.get("fingerprint") is None
+        snapshot.set("fingerprint", self._POLICY)
+        snapshot.dump()
+
+        loaded = PolicySnapshot.load(path)
+        assert loaded.path == path
+        assert loaded.get("fingerprint") == self._POLICY
+
+    def test_load_error(self, tmp_path) -> None:
+        """Test loading a file which is not a policy snapshot."""
+        path = tmp_path / "policy.snapshot"
+        path.write_text('{"foo": "bar"}')
+
+        with pytest.raises(PolicySnapshotError):
+            PolicySnapshot.load(str(path))
+
+    def test_fingerprint(self, context: Context) -> None:
+        """Test computing a fingerprint of a predictor used in a context."""
+        fingerprint = PolicySnapshot.compute_fingerprint(TemporalDifference(), context)
+        assert fingerprint == PolicySnapshot.compute_fingerprint(TemporalDifference(), context)
+        assert fingerprint != PolicySnapshot.compute_fingerprint(MCTS(), context)
+
+        context.labels["foo"] = "bar"
+        assert fingerprint != PolicySnapshot.compute_fingerprint(TemporalDifference(), context)
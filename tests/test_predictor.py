@@ -21,6 +21,13 @@ import os
 from flexmock import flexmock
 import pytest
 
+from thoth.adviser.predictors import AdaptiveSimulatedAnnealing
+from thoth.adviser.predictors import ApproximatingLatest
+from thoth.adviser.predictors import HillClimbing
+from thoth.adviser.predictors import MCTS
+from thoth.adviser.predictors import Sampling
+from thoth.adviser.predictors import TemporalDifference
+
 from .base import AdviserTestCase
 
 
@@ -51,3 +58,18 @@ class TestPredictor(AdviserTestCase):
         context = flexmock()
         with predictor.assigned_context(context):
             assert predictor.context is context
+
+    @pytest.mark.parametrize(
+        "predictor_class,batched",
+        [
+            (HillClimbing, True),
+            (Sampling, True),
+            (ApproximatingLatest, False),
+            (AdaptiveSimulatedAnnealing, False),
+            (TemporalDifference, False),
+            (MCTS, False),
+        ],
+    )
+    def test_batched(self, predictor_class: type, batched: bool) -> None:
+        """Test only predictors not learning from the reward signal of each expansion support batched expansion."""
+        assert predictor_class.BATCHED is batched
@@ -23,6 +23,7 @@ import json
 from flexmock import flexmock
 from itertools import chain
 
+from thoth.adviser.graph_io import AsyncGraph
 from thoth.adviser.product import Product
 from thoth.adviser.state import State
 from thoth.adviser.context import Context
@@ -32,6 +33,7 @@ from thoth.python import PackageVersion
 from thoth.python import Pipfile
 from thoth.python import PipfileLock
 from thoth.python import Source
+from thoth.storages.exceptions import NotFoundError
 
 from .base import AdviserTestCase
 
@@ -469,7 +471,7 @@ black = true
             os_version="31",
             python_version="3.7",
             marker_evaluation_result=True,
-        ).and_return("python_version >= '3.7'").and_return("python_version >= '3' or 1").twice()
+        ).and_return("python_version >= '3.7'").once()
 
         product = Product.from_final_state(context=context, state=state)
         expected = {
@@ -556,9 +558,8 @@ black = true
 
         assert product.to_dict() == expected
 
-        # Markers should not intersect.
+        # Markers are retrieved once per run and they should not accumulate across products.
         product = Product.from_final_state(context=context, state=state)
-        expected["project"]["requirements_locked"]["default"]["numpy"]["markers"] = "python_version >= '3' or 1"
         assert product.to_dict() == expected
 
     def test_environment_markers_direct_dependency(self, context: Context) -> None:
@@ -971,6 +972,57 @@ black = true
 
         assert product.to_dict() == expected
 
+    def test_from_final_state_graph_io(self, context: Context) -> None:
+        """Test querying hashes and environment markers concurrently when instantiating a product."""
+        tensorflow_tuple = ("tensorflow", "2.0.0", "https://pypi.org/simple")
+        numpy_tuple = ("numpy", "1.17.4", "https://pypi.org/simple")
+        scipy_tuple = ("scipy", "1.4.0", "https://pypi.org/simple")
+        state = State(
+            score=0.0,
+            resolved_dependencies={"tensorflow": tensorflow_tuple, "numpy": numpy_tuple, "scipy": scipy_tuple},
+            unresolved_dependencies={},
+        )
+
+        pypi = Source("https://pypi.org/simple")
+        for package_tuple in state.resolved_dependencies.values():
+            context.register_package_version(
+                PackageVersion(name=package_tuple[0], version="==" + package_tuple[1], index=pypi, develop=False)
+            )
+            context.graph.should_receive("get_python_package_hashes_sha256").with_args(*package_tuple).and_return(
+                [package_tuple[0]]
+            ).once()
+
+        context.dependents = {
+            "tensorflow": {tensorflow_tuple: set()},
+            "numpy": {numpy_tuple: {(tensorflow_tuple, "fedora", "31", "3.7"), (scipy_tuple, "fedora", "31", "3.7")}},
+            "scipy": {scipy_tuple: {(tensorflow_tuple, "fedora", "31", "3.7")}},
+        }
+        marker_kwargs = dict(os_name="fedora", os_version="31", python_version="3.7", marker_evaluation_result=True)
+        context.graph.should_receive("get_python_environment_marker").with_args(
+            *tensorflow_tuple, dependency_name="numpy", dependency_version="1.17.4", **marker_kwargs
+        ).and_return("python_version >= '3.7'").once()
+        context.graph.should_receive("get_python_environment_marker").with_args(
+            *scipy_tuple, dependency_name="numpy", dependency_version="1.17.4", **marker_kwargs
+        ).and_raise(NotFoundError).once()
+        context.graph.should_receive("get_python_environment_marker").with_args(
+            *tensorflow_tuple, dependency_name="scipy", dependency_version="1.4.0", **marker_kwargs
+        ).and_return(None).once()
+
+        context.graph_io = AsyncGraph(graph=context.graph, max_workers=2)
+        try:
+            product = Product.from_final_state(context=context, state=state)
+        finally:
+            context.graph_io.close()
+
+        packages = product.project.pipfile_lock.packages.packages
+        assert {name: pv.hashes for name, pv in packages.items()} == {
+            "tensorflow": ["sha256:tensorflow"],
+            "numpy": ["sha256:numpy"],
+            "scipy": ["sha256:scipy"],
+        }
+        assert packages["numpy"].markers == "python_version >= '3.7'"
+        assert packages["scipy"].markers is None
+
     def test_construct_dependency_graph_basic(self) -> None:
         """Test constructing dependency graph."""
         context = flexmock(dependencies=self._DEPENDENCIES_NO_CYCLE)
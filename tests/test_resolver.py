@@ -29,13 +29,21 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Dict
+from typing import Any
+import queue
 import random
+import threading
+import yaml
 
 from thoth.adviser.beam import Beam
 from thoth.adviser.context import Context
 from thoth.adviser.resolver import Resolver
+import thoth.adviser.resolver as resolver_module
+from thoth.adviser.policy_snapshot import PolicySnapshot
+from thoth.adviser.sieve_cache import SieveCache
 from thoth.adviser.state import State
 from thoth.adviser.predictor import Predictor
+from thoth.adviser.predictors import TemporalDifference
 from thoth.adviser.product import Product
 from thoth.adviser.pipeline_config import PipelineConfig
 from thoth.adviser.pipeline_builder import PipelineBuilder
@@ -43,6 +51,7 @@ from thoth.adviser.enums import RecommendationType
 from thoth.adviser.enums import DecisionType
 from thoth.adviser.step import Step
 from thoth.adviser.sieve import Sieve
+from thoth.adviser.unit import Unit
 from thoth.common import RuntimeEnvironment
 from thoth.python import PackageVersion
 from thoth.python import Source
@@ -51,6 +60,8 @@ from thoth.python import PipfileLock
 from thoth.storages import GraphDatabase
 from thoth.storages.exceptions import NotFoundError
 
+from thoth.adviser.prescription.v1 import WrapPrescription
+from thoth.adviser.prescription.v1.schema import PRESCRIPTION_WRAP_SCHEMA
 from thoth.adviser.exceptions import BootError
 from thoth.adviser.exceptions import SkipPackage
 from thoth.adviser.exceptions import CannotProduceStack
@@ -257,6 +268,119 @@ class TestResolver(AdviserTestCase):
         resolver.pipeline._sieves = {"tensorflow": [sieves.Sieve1()]}
         assert list(resolver._run_sieves(tf_package_versions)) == []
 
+    def test_run_sieves_cached(self, resolver: Resolver, tf_package_versions: List[PackageVersion]) -> None:
+        """Test re-using results of sieves stored in the sieve cache."""
+        flexmock(sieves.Sieve1, CACHEABLE=True)
+
+        sieves.Sieve1.should_receive("run").with_args(object).and_yield(*tf_package_versions[1:]).once()
+
+        resolver.pipeline._sieves = {"tensorflow": [sieves.Sieve1()]}
+        resolver.sieve_cache = SieveCache()
+        resolver._init_context()
+
+        assert list(resolver._run_sieves(tf_package_versions)) == tf_package_versions[1:]
+        assert list(resolver._run_sieves(tf_package_versions)) == tf_package_versions[1:]
+        assert resolver.sieve_cache.hits == 1
+        assert resolver.sieve_cache.misses == 1
+
+    def test_run_sieves_cached_skip_package(
+        self, resolver: Resolver, tf_package_versions: List[PackageVersion]
+    ) -> None:
+        """Test skipping a package based on the sieve cache."""
+        flexmock(sieves.Sieve1, CACHEABLE=True)
+
+        sieves.Sieve1.should_receive("run").with_args(object).and_raise(SkipPackage).once()
+
+        resolver.pipeline._sieves = {"tensorflow": [sieves.Sieve1()]}
+        resolver.sieve_cache = SieveCache()
+        resolver._init_context()
+
+        for _ in range(2):
+            with pytest.raises(SkipPackage):
+                list(resolver._run_sieves(tf_package_versions))
+
+    def test_run_sieves_cached_not_cacheable(
+        self, resolver: Resolver, tf_package_versions: List[PackageVersion]
+    ) -> None:
+        """Test sieves that are not cacheable are always run, keeping their side effects."""
+        flexmock(sieves.Sieve1, CACHEABLE=True)
+        flexmock(sieves.Sieve2)
+
+        stack_info_entry = {
+            "type": "WARNING",
+            "message": "Some packages were removed",
+            "link": "https://thoth-station.ninja",
+        }
+
+        def run(package_versions: Generator[PackageVersion, None, None]) -> Generator[PackageVersion, None, None]:
+            resolver.context.stack_info.append(stack_info_entry)
+            yield from package_versions
+
+        sieves.Sieve1.should_receive("run").with_args(object).replace_with(lambda pvs: pvs).once()
+        sieves.Sieve2.should_receive("run").with_args(object).replace_with(run).twice()
+
+        resolver.pipeline._sieves = {"tensorflow": [sieves.Sieve1(), sieves.Sieve2()]}
+        resolver.sieve_cache = SieveCache()
+        resolver._init_context()
+
+        assert list(resolver._run_sieves(tf_package_versions)) == tf_package_versions
+        assert list(resolver._run_sieves(tf_package_versions)) == tf_package_versions
+        assert resolver.context.stack_info == [stack_info_entry, stack_info_entry]
+        assert resolver.sieve_cache.hits == 1
+        assert resolver.sieve_cache.misses == 1
+
+    def test_run_sieves_cached_default(self, resolver: Resolver, tf_package_versions: List[PackageVersion]) -> None:
+        """Test results of cacheable sieves are re-used with the default adviser sieve set."""
+        pipeline = PipelineBuilder.get_adviser_pipeline_config(
+            recommendation_type=RecommendationType.LATEST,
+            graph=resolver.graph,
+            project=resolver.project,
+            labels={},
+            library_usage=None,
+            prescription=None,
+            cli_parameters={},
+        )
+        default_sieves = pipeline.sieves_dict[None]
+        assert not all(sieve.CACHEABLE for sieve in default_sieves)
+        cacheable_count = sum(sieve.CACHEABLE for sieve in default_sieves)
+        assert cacheable_count > 0
+
+        for sieve in default_sieves:
+            if not sieve.CACHEABLE:
+                # Sieves querying the database are always run.
+                flexmock(sieve.__class__).should_receive("run").replace_with(lambda pvs: pvs).twice()
+
+        resolver.pipeline = pipeline
+        resolver.sieve_cache = SieveCache()
+        resolver._init_context()
+
+        with Unit.assigned_context(resolver.context):
+            for sieve in default_sieves:
+                sieve.pre_run()
+
+            result = list(resolver._run_sieves(tf_package_versions))
+            assert list(resolver._run_sieves(tf_package_versions)) == result
+
+        assert resolver.sieve_cache.hits == cacheable_count
+        assert resolver.sieve_cache.misses == cacheable_count
+
+    def test_store_restore_policy(self, resolver: Resolver) -> None:
+        """Test warm-starting a predictor with a policy learnt in a previous resolution."""
+        policy = {("tensorflow", "2.0.0", "https://pypi.org/simple"): [1.0, 2]}
+        resolver.policy_snapshot = PolicySnapshot()
+        resolver.predictor = TemporalDifference()
+        resolver._init_context()
+
+        resolver._restore_policy()
+        assert resolver.predictor.get_policy() == {}
+
+        resolver.predictor.set_policy(policy)
+        resolver._store_policy()
+
+        resolver.predictor = TemporalDifference()
+        resolver._restore_policy()
+        assert resolver.predictor.get_policy() == policy
+
     def test_run_steps_not_acceptable(self, resolver: Resolver, package_version: PackageVersion) -> None:
         """Test running steps when not acceptable is raised."""
         state1 = State()
@@ -731,6 +855,7 @@ class TestResolver(AdviserTestCase):
         ).once()
         assert resolver._expand_state(state, to_expand_package_tuple) is None
         assert resolver.beam.size == 0
+        assert resolver.context.is_conflicting(State(), to_expand_package_tuple)
 
     def test_expand_state_not_found_more_unresolved(self, resolver: Resolver, state: State) -> None:
         """Test expanding a state (with more unresolved dependencies) when a package was not found."""
@@ -1101,6 +1226,53 @@ class TestResolver(AdviserTestCase):
         ).once()
         assert resolver._expand_state(state, to_expand_package_tuple) is None
 
+        # Versions allowed by the expanded package are learnt.
+        another_state = State()
+        another_state.add_unresolved_dependency(("absl-py", "0.7.0", "https://pypi.org/simple"))
+        assert resolver.context.is_conflicting(another_state, to_expand_package_tuple)
+        another_state.add_unresolved_dependency(("absl-py", "0.8.0", "https://pypi.org/simple"))
+        assert not resolver.context.is_conflicting(another_state, to_expand_package_tuple)
+
+    def test_expand_state_conflict_learnt(self, resolver: Resolver, state: State) -> None:
+        """Test expanding a state with a package known to lead to a conflict."""
+        to_expand_package_tuple = state.get_first_unresolved_dependency()
+
+        resolver._init_context()
+        resolver.beam.add_state(state)
+        resolver.context.register_package_tuple(
+            to_expand_package_tuple,
+            develop=False,
+            os_name="fedora",
+            os_version="31",
+            python_version="3.7",
+        )
+        resolver.context.learn_conflict(to_expand_package_tuple, state.resolved_dependencies["numpy"])
+
+        resolver.graph.should_receive("get_depends_on").times(0)
+        resolver.predictor.should_receive("set_reward_signal").with_args(
+            state, to_expand_package_tuple, math.nan
+        ).once()
+        assert resolver._expand_state(state, to_expand_package_tuple) is None
+        assert resolver.beam.size == 0
+
+    def test_remove_conflicting_dependencies(self, resolver: Resolver, state: State) -> None:
+        """Test removing unresolved dependencies known to lead to a conflict."""
+        tensorflow_tuple = state.get_first_unresolved_dependency()
+        another_tensorflow_tuple = ("tensorflow", "2.1.0", "https://pypi.org/simple")
+        state.add_unresolved_dependency(another_tensorflow_tuple)
+
+        resolver._init_context()
+        assert resolver._remove_conflicting_dependencies(state) is True
+        assert set(state.iter_unresolved_dependencies()) == {tensorflow_tuple, another_tensorflow_tuple}
+
+        resolver.context.learn_unsolvable(tensorflow_tuple)
+        assert resolver._remove_conflicting_dependencies(state) is True
+        assert list(state.iter_unresolved_dependencies()) == [another_tensorflow_tuple]
+
+        resolver.context.learn_unsolvable(another_tensorflow_tuple)
+        assert resolver._remove_conflicting_dependencies(state) is False
+        assert list(state.iter_unresolved_dependencies()) == [another_tensorflow_tuple]
+
     def test_expand_state_sieves_discarded(self, resolver: Resolver, state: State) -> None:
         """Test expanding a state but all dependencies are filtered out by sieves."""
         to_expand_package_tuple = ("tensorflow", "2.0.0", "https://pypi.org/simple")
@@ -1554,13 +1726,14 @@ class TestResolver(AdviserTestCase):
 
         resolver.project.runtime_environment.should_receive("is_fully_specified").and_return(True).once()
 
-        package_version = resolver.context.register_package_tuple(
+        resolver.context.register_package_tuple(
             package_tuple,
             develop=False,
             os_name=None,
             os_version=None,
             python_version=None,
         )
+        package_version = resolver.context.get_package_version(package_tuple)
 
         step = steps.Step1()
         step.should_receive("run").with_args(state, package_version).and_return((0.1, [])).once()
@@ -1734,6 +1907,64 @@ class TestResolver(AdviserTestCase):
         assert len(report.products) == 1
         assert report.products[0].score == state.score
 
+    def test_resolve_stream(self, resolver: Resolver) -> None:
+        """Test yielding products once they are guaranteed to be part of the report."""
+        resolver.limit = 3
+        resolver.count = 2
+        yielded = []
+
+        def _do_resolve_states(with_devel: bool, user_stack_scoring: bool) -> Generator[State, None, None]:
+            for score in (1.0, 3.0, 2.0):
+                state = State(score=score)
+                resolver.context.accepted_final_states_count += 1
+                yielded.append(score)
+                yield state
+
+        resolver.should_receive("_do_resolve_states").replace_with(_do_resolve_states).once()
+        flexmock(Product).should_receive("from_final_state").replace_with(
+            lambda context, state: flexmock(to_dict=lambda: {"score": state.score})
+        )
+        resolver.pipeline.should_receive("call_post_run_report").once()
+        resolver.predictor.should_receive("post_run_report").once()
+
+        records = []
+        for record in resolver.resolve_stream(with_devel=True):
+            records.append((len(yielded), record))
+
+        assert [(n, r["type"]) for n, r in records] == [(2, "product"), (3, "product"), (3, "summary")]
+        assert [r["product"]["score"] for _, r in records[:2]] == [3.0, 2.0]
+
+        summary = records[-1][1]["report"]
+        assert "products" not in summary
+        assert summary["products_count"] == 2
+        assert summary["accepted_final_states_count"] == 3
+
+    def test_resolve_stream_terminated(self, resolver: Resolver) -> None:
+        """Test yielding kept products once the resolution is terminated before reaching the limit."""
+        resolver.limit = 10
+        resolver.count = 2
+        states = [State(score=score) for score in (1.0, 3.0, 2.0)]
+
+        resolver.should_receive("_do_resolve_states").and_return(states).once()
+        flexmock(Product).should_receive("from_final_state").replace_with(
+            lambda context, state: flexmock(to_dict=lambda: {"score": state.score})
+        )
+        resolver.pipeline.should_receive("call_post_run_report").once()
+        resolver.predictor.should_receive("post_run_report").once()
+
+        records = list(resolver.resolve_stream(with_devel=False))
+        assert [r["type"] for r in records] == ["product", "product", "summary"]
+        assert [r["product"]["score"] for r in records[:2]] == [3.0, 2.0]
+        assert records[-1]["report"]["products_count"] == 2
+
+    def test_resolve_stream_no_stack(self, resolver: Resolver) -> None:
+        """Test no product is yielded if no stack was resolved."""
+        resolver.should_receive("_do_resolve_states").and_return([]).once()
+        resolver.pipeline.should_receive("call_post_run_report").times(0)
+
+        with pytest.raises(CannotProduceStack):
+            list(resolver.resolve_stream())
+
     def test_get_adviser_instance(self, predictor_mock: Predictor) -> None:
         """Test getting a resolver for adviser."""
         flexmock(GraphDatabase)
@@ -3143,3 +3374,350 @@ class TestResolver(AdviserTestCase):
             {"link": "https://foo/bar", "message": "Info about 'b'", "package_name": "b", "type": "INFO"},
         ]
         self.verify_justification_schema(state.justification)
+
+    def test_get_partitions(self, resolver: Resolver) -> None:
+        """Test partitioning resolution space among resolver workers."""
+        resolver.workers = 2
+
+        state = State()
+        numpy_tuples = [("numpy", f"1.{i}.0", "https://pypi.org/simple") for i in range(3)]
+        state.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        for package_tuple in numpy_tuples:
+            state.add_unresolved_dependency(package_tuple)
+
+        resolver.beam.add_state(state)
+
+        partition_name, partitions = resolver._get_partitions()
+        assert partition_name == "numpy"
+        assert partitions == [[numpy_tuples[0], numpy_tuples[2]], [numpy_tuples[1]]]
+
+        resolver.workers = 5
+        assert resolver._get_partitions() == ("numpy", [[t] for t in numpy_tuples])
+
+    def test_get_partitions_empty(self, resolver: Resolver) -> None:
+        """Test partitioning when there are no unresolved dependencies."""
+        resolver.workers = 2
+        resolver.beam.add_state(State())
+        assert resolver._get_partitions() == (None, [])
+
+    def test_pack_final_state(self, context: Context, resolver: Resolver) -> None:
+        """Test transferring a final state computed in a worker to the coordinator."""
+        package_tuple = ("numpy", "1.16.2", "https://pypi.org/simple")
+        dependent_tuple = ("tensorflow", "2.0.0", "https://pypi.org/simple")
+        runtime_environment = context.project.runtime_environment
+
+        state = State(score=0.5, iteration=3, justification=[{"type": "INFO", "message": "foo", "link": "bar"}])
+        state.add_resolved_dependency(package_tuple)
+        context.register_package_tuple(
+            package_tuple,
+            develop=False,
+            dependent_tuple=dependent_tuple,
+            os_name=runtime_environment.operating_system.name,
+            os_version=runtime_environment.operating_system.version,
+            python_version=runtime_environment.python_version,
+        )
+        resolver._context = context
+        payload = resolver._pack_final_state(state)
+
+        coordinator_context = Context(
+            project=context.project,
+            graph=context.graph,
+            library_usage=None,
+            labels={},
+            limit=100,
+            count=1,
+            beam=Beam(),
+            recommendation_type=RecommendationType.LATEST,
+        )
+        resolver._context = coordinator_context
+        final_state = resolver._unpack_final_state(payload)
+
+        assert final_state.score == 0.5
+        assert final_state.iteration == 3
+        assert final_state.resolved_dependencies == {"numpy": package_tuple}
+        assert final_state.justification == state.justification
+        assert coordinator_context.get_package_version(package_tuple) == context.get_package_version(package_tuple)
+        assert coordinator_context.dependents["numpy"][package_tuple] == context.dependents["numpy"][package_tuple]
+
+    def test_unpack_final_state_develop(self, context: Context, resolver: Resolver) -> None:
+        """Test package versions resolved in a worker are registered to the coordinator's context."""
+        prescription_str = """
+name: WrapUnit
+type: wrap
+should_include:
+  times: 1
+  adviser_pipeline: true
+match:
+  state:
+    resolved_dependencies:
+      - name: flask
+        develop: true
+run:
+  justification:
+    - type: INFO
+      message: Flask is a development dependency
+      link: https://thoth-station.ninja
+"""
+        prescription = yaml.safe_load(prescription_str)
+        PRESCRIPTION_WRAP_SCHEMA(prescription)
+        WrapPrescription.set_prescription(prescription)
+
+        package_tuple = ("flask", "2.0.1", "https://pypi.org/simple")
+        state = State(score=0.5)
+        state.add_resolved_dependency(package_tuple)
+        context.register_package_tuple(package_tuple, develop=True, os_name=None, os_version=None, python_version=None)
+        context.get_package_version(package_tuple)
+        resolver._context = context
+        payload = resolver._pack_final_state(state)
+
+        coordinator_context = Context(
+            project=context.project,
+            graph=context.graph,
+            library_usage=None,
+            labels={},
+            limit=100,
+            count=1,
+            beam=Beam(),
+            recommendation_type=RecommendationType.LATEST,
+        )
+        resolver._context = coordinator_context
+        final_state = resolver._unpack_final_state(payload)
+
+        package_record = coordinator_context.get_package_record(package_tuple)
+        assert package_record is not None
+        assert package_record.develop is True
+        assert coordinator_context.get_version_rank(package_tuple) == 0
+        # Packages stated in worker's state are not direct dependencies of the coordinator's context.
+        assert coordinator_context.dependents["flask"][package_tuple] == set()
+
+        unit = WrapPrescription()
+        unit.pre_run()
+        with unit.assigned_context(coordinator_context):
+            assert unit.run(final_state) is None
+
+        assert final_state.justification == unit.run_prescription["justification"]
+
+    def test_parallel_worker_policy(self, resolver: Resolver) -> None:
+        """Test a worker reports policy learnt back to the coordinator."""
+        policy = {("flask", "1.1.1", "https://pypi.org/simple"): [1.0, 2]}
+        resolver._init_context()
+        resolver.predictor.should_receive("get_policy").and_return(policy).once()
+        GraphDatabase.should_receive("connect").once()
+
+        result_queue = flexmock(close=lambda: None, join_thread=lambda: None)
+        result_queue.should_receive("put").with_args(("done", 0, 0, {"stack_info": [], "policy": policy})).once()
+
+        resolver._parallel_worker(result_queue, threading.Event(), 0, "flask", [[]], 42)
+
+    def test_merge_policy(self, resolver: Resolver) -> None:
+        """Test merging policies learnt by workers forked with a restored policy."""
+        package_tuple1 = ("flask", "1.1.1", "https://pypi.org/simple")
+        package_tuple2 = ("flask", "1.0.0", "https://pypi.org/simple")
+        package_tuple3 = ("click", "7.0", "https://pypi.org/simple")
+        policy_base = {package_tuple1: [1.0, 1], package_tuple2: [2.0, 2]}
+
+        resolver.predictor = TemporalDifference()
+        resolver.predictor.set_policy(policy_base)
+
+        resolver._merge_policy(
+            policy_base, {package_tuple1: [1.5, 2], package_tuple2: [2.0, 2], package_tuple3: [0.5, 1]}
+        )
+        resolver._merge_policy(policy_base, {package_tuple1: [2.0, 3], package_tuple2: [2.0, 2]})
+        resolver._merge_policy(policy_base, None)
+
+        assert resolver.predictor.get_policy() == {
+            package_tuple1: [2.5, 4],
+            package_tuple2: [2.0, 2],
+            package_tuple3: [0.5, 1],
+        }
+
+    def test_stop_workers(self, resolver: Resolver) -> None:
+        """Test gathering policy learnt by workers asked to stop."""
+        package_tuple = ("flask", "1.1.1", "https://pypi.org/simple")
+        resolver.predictor = TemporalDifference()
+
+        result_queue: "queue.Queue[Tuple[str, int, int, Any]]" = queue.Queue()
+        result_queue.put(("final", 0, 3, {}))
+        result_queue.put(("done", 0, 4, {"stack_info": [], "policy": {package_tuple: [0.5, 1]}}))
+        result_queue.put(("error", 1, 2, "Some error"))
+        stop_event = threading.Event()
+
+        resolver._stop_workers([], result_queue, stop_event, 2, {})
+
+        assert stop_event.is_set()
+        assert result_queue.empty()
+        assert resolver.predictor.get_policy() == {package_tuple: [0.5, 1]}
+
+    def test_do_resolve_iteration_batch(self, resolver: Resolver, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test expanding multiple states picked by predictor in one iteration."""
+        monkeypatch.setattr(type(resolver.predictor), "BATCHED", True)
+        resolver.batch_size = 3
+        resolver._init_context()
+
+        package_tuple1 = ("flask", "1.1.1", "https://pypi.org/simple")
+        package_tuple2 = ("flask", "1.0.0", "https://pypi.org/simple")
+        state1 = State(score=1.0)
+        state1.add_unresolved_dependency(package_tuple1)
+        state2 = State(score=0.5)
+        state2.add_unresolved_dependency(package_tuple2)
+        resolver.beam.add_state(state1)
+        resolver.beam.add_state(state2)
+
+        final_state = State(score=1.0)
+        to_expand = [(state1, package_tuple1), (state2, package_tuple2), (state1, package_tuple2)]
+        resolver.predictor.should_receive("run_batch").with_args(3).and_return(to_expand).once()
+        resolver.predictor.should_receive("run").times(0)
+        resolver.should_receive("_prefetch_expansions").with_args(to_expand).once()
+        resolver.should_receive("_expand_state").with_args(state1, package_tuple1).and_return(final_state).once()
+        resolver.should_receive("_expand_state").with_args(state2, package_tuple2).and_return(None).once()
+
+        assert resolver._do_resolve_iteration() == [final_state]
+        assert resolver.context.iteration == 1
+
+    def test_do_resolve_iteration_batch_unsupported(self, resolver: Resolver) -> None:
+        """Test expanding one state per iteration if the predictor does not support batched expansion."""
+        resolver.batch_size = 3
+        resolver._init_context()
+
+        package_tuple = ("flask", "1.1.1", "https://pypi.org/simple")
+        state = State(score=1.0)
+        state.add_unresolved_dependency(package_tuple)
+        resolver.beam.add_state(state)
+
+        resolver.predictor.should_receive("run").and_return(state, package_tuple).once()
+        resolver.predictor.should_receive("run_batch").times(0)
+        resolver.should_receive("_prefetch_expansions").times(0)
+        resolver.should_receive("_expand_state").with_args(state, package_tuple).and_return(None).once()
+
+        assert resolver._do_resolve_iteration() == []
+        assert resolver.context.iteration == 1
+
+    @pytest.mark.parametrize("batched,warnings", [(False, 1), (True, 0)])
+    def test_do_resolve_states_batch_unsupported(
+        self, resolver: Resolver, monkeypatch: pytest.MonkeyPatch, batched: bool, warnings: int
+    ) -> None:
+        """Test warning about the batch size configured if the predictor does not support batched expansion."""
+        monkeypatch.setattr(type(resolver.predictor), "BATCHED", batched)
+        resolver.batch_size = 3
+        resolver._init_context()
+
+        flexmock(resolver_module._LOGGER).should_receive("warning").with_args(str, "PredictorMock", 3).times(warnings)
+        resolver.predictor.should_receive("pre_run").and_raise(ValueError).once()
+
+        with pytest.raises(ValueError):
+            list(resolver._do_resolve_states(with_devel=False, user_stack_scoring=False))
+
+    def test_init_score_bound(self, resolver: Resolver) -> None:
+        """Test computing the highest scores package specific steps can add."""
+        step1 = steps.Step1()
+        step2 = steps.Step2()
+        step3 = steps.Step1()
+        flexmock(step2).should_receive("get_score_max").and_return(-0.5)
+        flexmock(step3).should_receive("get_score_max").and_return(0.25)
+        resolver.pipeline._steps = {"tensorflow": [step1, step3], "thoth-adviser": [step2]}
+
+        resolver._init_score_bound()
+        assert resolver._step_score_max is None
+
+        resolver.prune_states = True
+        resolver._init_score_bound()
+        assert resolver._step_score_max == {"tensorflow": 1.25}
+        assert resolver._step_score_max_total == 1.25
+
+        step1.configuration["multi_package_resolution"] = True
+        resolver._init_score_bound()
+        assert resolver._step_score_max is None
+
+        step1.configuration["multi_package_resolution"] = False
+        resolver.pipeline._steps[None] = [step2]
+        resolver._init_score_bound()
+        assert resolver._step_score_max == {"tensorflow": 1.25}
+
+        resolver.pipeline._steps[None] = [step3]
+        resolver._init_score_bound()
+        assert resolver._step_score_max is None
+
+    @pytest.mark.parametrize("package_name,score_max", [("tensorflow", math.inf), (None, 0.5)])
+    def test_init_score_bound_unbound(
+        self, resolver: Resolver, state: State, package_name: Optional[str], score_max: float
+    ) -> None:
+        """Test states are not pruned if any step included cannot bound the score it adds."""
+        step1 = steps.Step1()
+        step2 = steps.Step2()
+        flexmock(step2).should_receive("get_score_max").and_return(score_max)
+        resolver.pipeline._steps = {"tensorflow": [step1], package_name: [step2]}
+        resolver.prune_states = True
+        resolver.count = 1
+        resolver._init_context()
+
+        resolver._init_score_bound()
+        assert resolver._step_score_max is None
+        assert resolver._step_score_max_total == 0.0
+
+        resolver.context.register_accepted_final_state(State(score=100.0))
+        assert resolver._should_prune(state) is False
+        assert resolver._pruned_states_count == 0
+
+    def test_should_prune(self, resolver: Resolver, state: State) -> None:
+        """Test pruning states that cannot make it to the top-count accepted final states."""
+        resolver.count = 1
+        resolver._init_context()
+        resolver._step_score_max = {"tensorflow": 1.0, "numpy": 0.5}
+        resolver._step_score_max_total = 1.5
+
+        assert resolver._get_score_bound(state) == 1.5
+        assert resolver._should_prune(state) is False
+
+        resolver.context.register_accepted_final_state(State(score=1.5))
+        assert resolver._should_prune(state) is False
+
+        resolver.context.register_accepted_final_state(State(score=1.75))
+        assert resolver._should_prune(state) is True
+        assert resolver._pruned_states_count == 1
+
+        resolver._step_score_max = None
+        assert resolver._should_prune(state) is False
+
+    def test_do_resolve_iteration_prune(self, resolver: Resolver, state: State) -> None:
+        """Test states that cannot make it to the top-count are not expanded."""
+        resolver._init_context()
+        resolver.beam.add_state(state)
+        package_tuple = state.get_first_unresolved_dependency()
+
+        resolver.predictor.should_receive("run").and_return((state, package_tuple)).once()
+        resolver.should_receive("_should_prune").with_args(state).and_return(True).once()
+        resolver.predictor.should_receive("set_reward_signal").with_args(state, package_tuple, math.nan).once()
+        resolver.should_receive("_expand_state").times(0)
+
+        assert resolver._do_resolve_iteration() == []
+        assert resolver.beam.size == 0
+
+    def test_prefetch_expansions(self, context: Context, resolver: Resolver) -> None:
+        """Test retrieving data needed to expand multiple states in bulk."""
+        resolver._context = context
+
+        package_tuple1 = ("flask", "1.1.1", "https://pypi.org/simple")
+        package_tuple2 = ("selinon", "1.0.0", "https://pypi.org/simple")
+        for package_tuple in (package_tuple1, package_tuple2):
+            context.register_package_tuple(
+                package_tuple,
+                develop=False,
+                os_name=None,
+                os_version=None,
+                python_version=None,
+            )
+
+        context.should_receive("prefetch_depends_on").with_args(
+            [(package_tuple1, frozenset([None])), (package_tuple2, frozenset([None]))]
+        ).and_return(None).once()
+        context.should_receive("get_depends_on").with_args(package_tuple1, extras=frozenset([None])).and_return(
+            {None: [("click", "8.0.0"), ("jinja2", "3.0.0")]}
+        ).once()
+        context.should_receive("get_depends_on").with_args(package_tuple2, extras=frozenset([None])).and_raise(
+            NotFoundError
+        ).once()
+        context.should_receive("prefetch_python_package_version_records").with_args(
+            [("click", "8.0.0"), ("jinja2", "3.0.0")]
+        ).and_return(None).once()
+
+        resolver._prefetch_expansions([(State(), package_tuple1), (State(), package_tuple2)])
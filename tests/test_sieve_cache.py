@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test caching results of pipeline sieves."""
+
+import pytest
+
+from thoth.adviser.context import Context
+from thoth.adviser.exceptions import SieveCacheError
+from thoth.adviser.sieve_cache import SKIP_PACKAGE
+from thoth.adviser.sieve_cache import SieveCache
+
+from .base import AdviserTestCase
+from .units.sieves import Sieve1
+from .units.sieves import Sieve2
+
+
+class TestSieveCache(AdviserTestCase):
+    """Test caching results of pipeline sieves."""
+
+    _TUPLES = (
+        ("tensorflow", "2.1.0", "https://pypi.org/simple"),
+        ("tensorflow", "2.0.0", "https://pypi.org/simple"),
+    )
+
+    def test_get_set(self) -> None:
+        """Test storing and retrieving results of sieves."""
+        cache = SieveCache()
+        assert cache.get("fingerprint", self._TUPLES) == (False, None)
+
+        cache.set("fingerprint", self._TUPLES, self._TUPLES[1:])
+        cache.set("fingerprint", self._TUPLES[1:], SKIP_PACKAGE)
+
+        assert cache.get("fingerprint", self._TUPLES) == (True, self._TUPLES[1:])
+        assert cache.get("fingerprint", self._TUPLES[1:]) == (True, SKIP_PACKAGE)
+        assert cache.get("another-fingerprint", self._TUPLES) == (False, None)
+        assert cache.hits == 2
+        assert cache.misses == 2
+
+    def test_dump_load(self, tmp_path) -> None:
+        """Test persisting the sieve cache."""
+        path = str(tmp_path / "sieve.cache")
+
+        cache = SieveCache.load(path)
+        assert cache.get("fingerprint", self._TUPLES) == (False, None)
+        cache.set("fingerprint", self._TUPLES, self._TUPLES[1:])
+        cache.set("fingerprint", self._TUPLES[1:], SKIP_PACKAGE)
+        cache.dump()
+
+        loaded = SieveCache.load(path)
+        assert loaded.path == path
+        assert loaded.get("fingerprint", self._TUPLES) == (True, self._TUPLES[1:])
+        assert loaded.get("fingerprint", self._TUPLES[1:]) == (True, SKIP_PACKAGE)
+
+    def test_load_error(self, tmp_path) -> None:
+        """Test loading a file which is not a sieve cache."""
+        path = tmp_path / "sieve.cache"
+        path.write_text('{"foo": "bar"}')
+
+        with pytest.raises(SieveCacheError):
+            SieveCache.load(str(path))
+
+    def test_fingerprint(self, context: Context) -> None:
+        """Test computing a fingerprint of sieves."""
+        fingerprint = SieveCache.compute_fingerprint([Sieve1(), Sieve2()], context)
+
+        assert fingerprint == SieveCache.compute_fingerprint([Sieve1(), Sieve2()], context)
+        assert fingerprint != SieveCache.compute_fingerprint([Sieve2(), Sieve1()], context)
+        assert fingerprint != SieveCache.compute_fingerprint([Sieve1()], context)
+
+        sieve = Sieve1()
+        sieve.update_configuration({"flying_circus": "1970"})
+        assert fingerprint != SieveCache.compute_fingerprint([sieve, Sieve2()], context)
+
+        context.labels["foo"] = "bar"
+        assert fingerprint != SieveCache.compute_fingerprint([Sieve1(), Sieve2()], context)
@@ -108,9 +108,9 @@ class TestState(AdviserTestCase):
             assert (
                 cloned_state.unresolved_dependencies[dependency_name] == state.unresolved_dependencies[dependency_name]
             )
+            # Nested dicts are shared until modified (copy-on-write).
             assert (
-                cloned_state.unresolved_dependencies[dependency_name]
-                is not state.unresolved_dependencies[dependency_name]
+                cloned_state.unresolved_dependencies[dependency_name] is state.unresolved_dependencies[dependency_name]
             )
 
         assert cloned_state.resolved_dependencies is not state.resolved_dependencies
@@ -121,6 +121,100 @@ class TestState(AdviserTestCase):
         assert cloned_state.justification == state.justification
         assert cloned_state.advised_manifest_changes is not state.advised_manifest_changes
 
+    def test_eq_clone_history(self) -> None:
+        """Test states with the same dependencies are equal regardless of how they were cloned."""
+        state = State()
+        state.add_unresolved_dependency(("flask", "1.1.1", "https://pypi.org/simple"))
+        state.add_resolved_dependency(("click", "7.0", "https://pypi.org/simple"))
+
+        cloned_state = state.clone()
+        another_cloned_state = state.clone()
+        assert cloned_state == another_cloned_state
+
+        # Cloning marks nested unresolved dependencies of the cloned state as shared.
+        cloned_state.clone()
+        another_cloned_state.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        another_cloned_state.remove_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+
+        assert cloned_state == another_cloned_state
+
+    def test_clone_copy_on_write(self) -> None:
+        """Test modifications of cloned states do not affect shared unresolved dependencies."""
+        flask_tuple = ("flask", "1.1.1", "https://pypi.org/simple")
+        numpy_tuples = [
+            ("numpy", "1.0.0", "https://pypi.org/simple"),
+            ("numpy", "1.1.0", "https://pypi.org/simple"),
+        ]
+        state = State()
+        state.add_unresolved_dependency(flask_tuple)
+        state.set_unresolved_dependencies({"numpy": numpy_tuples})
+        unresolved_dependencies = {k: v.copy() for k, v in state.unresolved_dependencies.items()}
+
+        cloned_state = state.clone()
+        another_cloned_state = state.clone()
+
+        cloned_state.add_unresolved_dependency(("flask", "1.0.0", "https://pypi.org/simple"))
+        cloned_state.remove_unresolved_dependency(numpy_tuples[0])
+        cloned_state.update_unresolved_dependencies({"numpy": [("numpy", "2.0.0", "https://pypi.org/simple")]})
+        cloned_state.remove_unresolved_dependency(flask_tuple)
+
+        assert state.unresolved_dependencies == unresolved_dependencies
+        assert another_cloned_state.unresolved_dependencies == unresolved_dependencies
+        assert set(cloned_state.iter_unresolved_dependencies()) == {
+            ("flask", "1.0.0", "https://pypi.org/simple"),
+            numpy_tuples[1],
+            ("numpy", "2.0.0", "https://pypi.org/simple"),
+        }
+
+        state.remove_unresolved_dependency_subtree("flask")
+        state.remove_unresolved_dependency(numpy_tuples[1])
+        assert another_cloned_state.unresolved_dependencies == unresolved_dependencies
+        assert state.unresolved_dependencies == {"numpy": {hash(numpy_tuples[0]): numpy_tuples[0]}}
+
+    def test_fingerprint(self) -> None:
+        """Test fingerprint is maintained incrementally when dependencies of a state change."""
+        flask_tuples = [("flask", "1.1.1", "https://pypi.org/simple"), ("flask", "1.0.0", "https://pypi.org/simple")]
+        numpy_tuples = [("numpy", "1.0.0", "https://pypi.org/simple"), ("numpy", "1.1.0", "https://pypi.org/simple")]
+        click_tuple = ("click", "7.0", "https://pypi.org/simple")
+
+        state = State()
+        state.add_unresolved_dependency(flask_tuples[0])
+        state.set_unresolved_dependencies({"numpy": numpy_tuples})
+        assert state.fingerprint != State().fingerprint
+
+        cloned_state = state.clone()
+        cloned_state.add_unresolved_dependency(flask_tuples[1])
+        cloned_state.update_unresolved_dependencies({"click": [click_tuple]})
+        cloned_state.remove_unresolved_dependency(numpy_tuples[0])
+        cloned_state.set_unresolved_dependencies({"numpy": [numpy_tuples[1]]})
+        cloned_state.mark_dependency_resolved(flask_tuples[0])
+
+        # A state with the same dependencies created in a different order.
+        other_state = State()
+        other_state.add_resolved_dependency(flask_tuples[0])
+        other_state.add_unresolved_dependency(click_tuple)
+        other_state.add_unresolved_dependency(numpy_tuples[1])
+
+        assert cloned_state.fingerprint == other_state.fingerprint
+        assert cloned_state.is_equivalent(other_state)
+        assert not state.is_equivalent(other_state)
+
+        # A resolved dependency contributes to the fingerprint differently than the same unresolved dependency.
+        resolved_state = State(resolved_dependencies={"click": click_tuple})
+        unresolved_state = State(unresolved_dependencies={"click": {hash(click_tuple): click_tuple}})
+        assert resolved_state.fingerprint != unresolved_state.fingerprint
+
+        # Fingerprint computed from scratch matches the one maintained incrementally.
+        fresh_state = State(
+            resolved_dependencies=dict(cloned_state.resolved_dependencies),
+            unresolved_dependencies={k: dict(v) for k, v in cloned_state.unresolved_dependencies.items()},
+        )
+        assert fresh_state.fingerprint == cloned_state.fingerprint
+
+        cloned_state.remove_unresolved_dependency_subtree("click")
+        cloned_state.remove_unresolved_dependency(numpy_tuples[1])
+        assert cloned_state.fingerprint == State(resolved_dependencies={"flask": flask_tuples[0]}).fingerprint
+
     def test_parent(self) -> None:
         """Test referencing parent and weak reference handling."""
         state = State()
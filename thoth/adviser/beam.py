@@ -19,6 +19,7 @@
 
 import random
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Tuple
 from typing import Generator
@@ -61,14 +62,28 @@ class Beam:
     addition to the beam with beam_width checks in O(log(N)) and removals of the states in
     O(log(N)). To satisfy removals in O(log(N)), the beam maintains a dictionary mapping a state
     to its index in the beam.
+
+    If deduplication is turned on, the beam keeps a transposition table mapping fingerprints of states
+    to states kept in the beam. A state equivalent to a state already present in the beam (same resolved
+    and unresolved dependencies reached via a different resolution path) is not added twice, only the one
+    with a higher score is kept. States are checked when added to the beam. States kept in the beam
+    report changes of their fingerprint done by the resolver and are re-keyed before the next lookup.
     """
 
     width = attr.ib(default=None, type=Optional[int])
     keep_history = attr.ib(type=bool, kw_only=True, default=None, converter=should_keep_history)
+    deduplicate = attr.ib(type=bool, kw_only=True, default=False)
 
     _beam_history = attr.ib(type=List[Tuple[int, Optional[float]]], default=attr.Factory(list), kw_only=True)
 
     _heap = attr.ib(type=ExtHeapQueue, init=False)
+    # Transposition table - states kept in the beam by their fingerprint.
+    _transpositions = attr.ib(type=Dict[int, State], default=attr.Factory(dict), init=False)
+    # Fingerprints states were stored under in the transposition table, keyed by id of the state.
+    _transposition_keys = attr.ib(type=Dict[int, int], default=attr.Factory(dict), init=False)
+    # States kept in the beam that were adjusted by the resolver since the transposition table was updated.
+    _fingerprint_changes = attr.ib(type=Dict[int, State], default=attr.Factory(dict), init=False)
+    duplicates_count = attr.ib(type=int, default=0, init=False)
     _WIDTH_VALIDATOR_ERR_MSG = "Beam width has to be None or positive integer, got {!r}"
 
     @width.validator
@@ -173,8 +188,16 @@ class Beam:
 
     def wipe(self) -> None:
         """Remove all states from beam."""
+        if self.deduplicate:
+            for state in self.iter_states():
+                state.track_fingerprint_changes(None)
+
         self._beam_history.clear()
         self._heap.clear()
+        self._transpositions.clear()
+        self._transposition_keys.clear()
+        self._fingerprint_changes.clear()
+        self.duplicates_count = 0
 
     def iter_states(self) -> List[State]:
         """Iterate over states, do not respect their score in order of iteration."""
@@ -192,8 +215,66 @@ class Beam:
 
     def add_state(self, state: State) -> None:
         """Add state to the internal state listing (do it in O(log(N)) time."""
+        if self.deduplicate:
+            self._add_state_deduplicated(state)
+            return
+
         self._heap.push(state.score, state)
 
+    def _add_state_deduplicated(self, state: State) -> None:
+        """Add state to the beam if no equivalent state with a higher or the same score is kept in the beam."""
+        if self._fingerprint_changes:
+            self._update_transpositions()
+
+        fingerprint = state.fingerprint
+        known_state = self._transpositions.get(fingerprint)
+        if known_state is not None and known_state is not state and known_state.is_equivalent(state):
+            # States kept in the beam can be adjusted by the resolver, the equivalence check covers such states.
+            self.duplicates_count += 1
+            if known_state.score >= state.score:
+                return
+
+            self.remove(known_state)
+
+        if self.width is not None and self.size == self.width:
+            lowest_state: State = self._heap.get_top()
+            if state.score <= lowest_state.score:
+                # Not added to the full beam.
+                return
+
+            self._forget_transposition(lowest_state)
+
+        self._heap.push(state.score, state)
+        self._transpositions[fingerprint] = state
+        self._transposition_keys[id(state)] = fingerprint
+        state.track_fingerprint_changes(self._fingerprint_changes)
+
+    def _update_transpositions(self) -> None:
+        """Re-key states adjusted by the resolver after they were added to the beam by their current fingerprint."""
+        for state in self._fingerprint_changes.values():
+            fingerprint = self._transposition_keys.get(id(state))
+            if fingerprint is None:
+                continue
+
+            if self._transpositions.get(fingerprint) is state:
+                del self._transpositions[fingerprint]
+
+            fingerprint = state.fingerprint
+            self._transposition_keys[id(state)] = fingerprint
+            known_state = self._transpositions.get(fingerprint)
+            if known_state is None or known_state.score < state.score:
+                self._transpositions[fingerprint] = state
+
+        self._fingerprint_changes.clear()
+
+    def _forget_transposition(self, state: State) -> None:
+        """Remove the given state from the transposition table."""
+        state.track_fingerprint_changes(None)
+        self._fingerprint_changes.pop(id(state), None)
+        fingerprint = self._transposition_keys.pop(id(state), None)
+        if fingerprint is not None and self._transpositions.get(fingerprint) is state:
+            del self._transpositions[fingerprint]
+
     def get(self, idx: int) -> State:
         """Get i-th element from the beam (constant time), keep it in the beam.
 
@@ -217,6 +298,9 @@ class Beam:
 
     def remove(self, state: State) -> None:
         """Remove the given state from beam."""
+        if self.deduplicate:
+            self._forget_transposition(state)
+
         try:
             self._heap.remove(state)
         except ValueError:  # TODO: fix
@@ -235,4 +319,7 @@ class Beam:
             to_pop_state = self._heap.get(idx)
 
         self._heap.remove(to_pop_state)
+        if self.deduplicate:
+            self._forget_transposition(to_pop_state)
+
         return to_pop_state
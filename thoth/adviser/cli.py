@@ -23,14 +23,17 @@ import logging
 import os
 import pickle
 import random
+import socketserver
 import sys
 import time
 from functools import partial
 from typing import Any
+from typing import BinaryIO
 from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import TextIO
 from typing import Tuple
 
 import attr
@@ -45,6 +48,7 @@ from thoth.python import Pipfile
 from thoth.python import PipfileLock
 from thoth.python import Project
 from thoth.python.exceptions import UnsupportedConfigurationError
+from thoth.storages import GraphDatabase
 from prometheus_client import CollectorRegistry
 from prometheus_client import Gauge
 from prometheus_client import push_to_gateway
@@ -56,7 +60,12 @@ from thoth.adviser.enums import PythonRecommendationOutput
 from thoth.adviser.enums import RecommendationType
 from thoth.adviser.exceptions import AdviserException
 from thoth.adviser.exceptions import InternalError
+from thoth.adviser.graph_snapshot import GraphSnapshot
+from thoth.adviser.graph_snapshot import GraphSnapshotRecorder
+from thoth.adviser.policy_snapshot import PolicySnapshot
+from thoth.adviser.sieve_cache import SieveCache
 from thoth.adviser.pipeline_builder import PipelineBuilder
+from thoth.adviser.pipeline_cache import PipelineCache
 from thoth.adviser.prescription import Prescription
 from thoth.adviser import Resolver
 from thoth.adviser import __title__ as analyzer_name
@@ -102,6 +111,173 @@ class _PrintFunc:
         self.func(duration=duration, result=result)
 
 
+@attr.s(slots=True)
+class _StreamWriter:
+    """Write report records as JSON Lines to a file or to the standard output as they are produced."""
+
+    output = attr.ib(type=str)
+    _file = attr.ib(type=Optional[TextIO], default=None, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Truncate the output file, records are appended to it."""
+        if self.output != "-":
+            open(self.output, "w").close()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Write the given record on a separate line and flush it so that consumers can process it right away."""
+        if self._file is None:
+            # Opened lazily so that the file is opened in the (possibly forked) process producing records.
+            self._file = sys.stdout if self.output == "-" else open(self.output, "a")
+
+        self._file.write(json.dumps(record, sort_keys=True) + "\n")
+        self._file.flush()
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        self._write(record)
+
+    def print_summary(self, duration: float, result: Dict[str, Any]) -> None:
+        """Write the summary record as the last record of the output."""
+        self._write(
+            {
+                "type": "summary",
+                "metadata": {
+                    "analyzer": analyzer_name,
+                    "analyzer_version": analyzer_version,
+                    "document_id": os.getenv("THOTH_DOCUMENT_ID"),
+                    "duration": int(duration),
+                },
+                "result": result,
+            }
+        )
+        if self._file is not sys.stdout:
+            self._file.close()
+
+        self._file = None
+
+
+@attr.s(slots=True)
+class _AdviserWorker:
+    """Compute advises requested as JSON Lines, keeping prescriptions, pipelines and graph database across requests."""
+
+    graph = attr.ib(type=GraphDatabase, kw_only=True)
+    prescription = attr.ib(type=Optional[Prescription], kw_only=True, default=None)
+    pipeline_cache = attr.ib(type=PipelineCache, kw_only=True, factory=PipelineCache)
+    sieve_cache = attr.ib(type=Optional[SieveCache], kw_only=True, default=None)
+    verbose = attr.ib(type=bool, kw_only=True, default=False)
+
+    def _get_resolver(self, request: Dict[str, Any], parameters: Dict[str, Any]) -> Resolver:
+        """Get resolver instance for the given request, parameters reported are adjusted."""
+        runtime_environment = RuntimeEnvironment.from_dict(request.get("runtime_environment") or {})
+        recommendation_type = RecommendationType.by_name(request.get("recommendation_type", "stable"))
+        project = _instantiate_project(
+            request["requirements"],
+            request.get("requirements_locked"),
+            runtime_environment=runtime_environment,
+            constraints=request.get("constraints"),
+        )
+        parameters["project"] = project.to_dict()
+
+        predictor_class, predictor_kwargs = _get_adviser_predictor(
+            request.get("predictor", "AUTO"), recommendation_type
+        )
+        predictor_kwargs = request.get("predictor_config") or predictor_kwargs
+
+        seed = request.get("seed")
+        seed = seed if seed is not None else int(time.time())
+        parameters["seed"] = seed
+        random.seed(seed)
+        termial_random.seed(seed)
+
+        return Resolver.get_adviser_instance(
+            predictor=predictor_class(**predictor_kwargs),
+            graph=self.graph,
+            project=project,
+            labels=request.get("labels") or {},
+            library_usage=request.get("library_usage"),
+            recommendation_type=recommendation_type,
+            limit=request.get("limit", Resolver.DEFAULT_LIMIT),
+            count=request.get("count", Resolver.DEFAULT_COUNT),
+            beam_width=request.get("beam_width", Resolver.DEFAULT_BEAM_WIDTH),
+            limit_latest_versions=request.get("limit_latest_versions", Resolver.DEFAULT_LIMIT_LATEST_VERSIONS),
+            prescription=self.prescription,
+            cli_parameters=parameters,
+            sieve_cache=self.sieve_cache,
+            pipeline_cache=self.pipeline_cache,
+        )
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute advise for the given request, the result has the same structure as the output of advise."""
+        start_time = time.monotonic()
+        parameters = dict(request)
+        parameters.pop("id", None)
+        response: Dict[str, Any] = {
+            "id": request.get("id"),
+            "metadata": {"analyzer": analyzer_name, "analyzer_version": analyzer_version},
+        }
+
+        try:
+            resolver = self._get_resolver(request, parameters)
+        except Exception as exc:
+            _LOGGER.exception("Failed to process request %r", request.get("id"))
+            response["metadata"]["duration"] = int(time.monotonic() - start_time)
+            response["result"] = {
+                "error": True,
+                "error_msg": f"Failed to process request: {str(exc)}",
+                "report": None,
+                "parameters": parameters,
+            }
+            return response
+
+        def _print_func(duration: float, result: Dict[str, Any]) -> None:
+            response["metadata"]["duration"] = int(duration)
+            response["result"] = result
+
+        subprocess_run(
+            resolver,
+            _print_func,
+            result_dict={"parameters": parameters},
+            with_devel=request.get("dev", False),
+            user_stack_scoring=request.get("user_stack_scoring", True),
+            verbose=self.verbose,
+            # Results and caches warmed during the resolution need to be kept in the serving process.
+            fork=False,
+        )
+        _LOGGER.info(
+            "Pipeline cache statistics: %d hits, %d misses", self.pipeline_cache.hits, self.pipeline_cache.misses
+        )
+        return response
+
+    def serve(self, input_file: BinaryIO, output_file: BinaryIO) -> None:
+        """Read requests, one JSON object per line, and write responses on separate lines."""
+        for line in input_file:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError(f"Request should be a JSON object, got {type(request).__name__}")
+            except ValueError as exc:
+                _LOGGER.error("Failed to parse request: %s", str(exc))
+                response: Dict[str, Any] = {
+                    "id": None,
+                    "result": {"error": True, "error_msg": f"Failed to parse request: {str(exc)}", "report": None},
+                }
+            else:
+                response = self.handle(request)
+
+            output_file.write(json.dumps(response, sort_keys=True).encode() + b"\n")
+            output_file.flush()
+
+
+class _AdviserRequestHandler(socketserver.StreamRequestHandler):
+    """Serve requests submitted over a connection to the worker's socket."""
+
+    def handle(self) -> None:
+        """Serve requests until the client closes the connection."""
+        self.server.worker.serve(self.rfile, self.wfile)
+
+
 def _print_version(ctx: click.Context, _, value: str):
     """Print adviser version and exit."""
     if not value or ctx.resilient_parsing:
@@ -513,6 +689,72 @@ def provenance(
     show_default=True,
     help="Consider or do not consider development dependencies during resolution.",
 )
+@click.option(
+    "--graph-snapshot",
+    envvar="THOTH_ADVISER_GRAPH_SNAPSHOT",
+    default=None,
+    type=str,
+    metavar="SNAPSHOT",
+    help="Resolve using an offline graph snapshot instead of the graph database, disjoint with "
+    "--graph-snapshot-output.",
+)
+@click.option(
+    "--graph-snapshot-output",
+    envvar="THOTH_ADVISER_GRAPH_SNAPSHOT_OUTPUT",
+    default=None,
+    type=str,
+    metavar="SNAPSHOT",
+    help="Record graph database queries performed during the resolution and store them as an offline graph snapshot.",
+)
+@click.option(
+    "--sieve-cache",
+    envvar="THOTH_ADVISER_SIEVE_CACHE",
+    default=None,
+    type=str,
+    metavar="CACHE",
+    help="Re-use results of pipeline sieves stored in the given file, the file is updated after the resolution.",
+)
+@click.option(
+    "--policy-snapshot",
+    envvar="THOTH_ADVISER_POLICY_SNAPSHOT",
+    default=None,
+    type=str,
+    metavar="SNAPSHOT",
+    help="Warm-start the predictor with a policy learnt in previous runs, the file is updated after the resolution.",
+)
+@click.option(
+    "--workers",
+    envvar="THOTH_ADVISER_WORKERS",
+    default=1,
+    type=int,
+    show_default=True,
+    metavar="WORKERS",
+    help="Number of worker processes exploring disjoint parts of the resolution space.",
+)
+@click.option(
+    "--batch-size",
+    envvar="THOTH_ADVISER_BATCH_SIZE",
+    default=1,
+    type=int,
+    show_default=True,
+    metavar="SIZE",
+    help="Number of states expanded together in one resolver iteration, if supported by the predictor.",
+)
+@click.option(
+    "--graph-io-workers",
+    envvar="THOTH_ADVISER_GRAPH_IO_WORKERS",
+    default=0,
+    type=int,
+    show_default=True,
+    metavar="WORKERS",
+    help="Number of concurrent graph database queries issued when retrieving data in bulk, 0 queries serially.",
+)
+@click.option(
+    "--stream",
+    envvar="THOTH_ADVISER_STREAM",
+    is_flag=True,
+    help="Write products as JSON Lines as soon as they are known to be part of the report, followed by a summary.",
+)
 def advise(
     click_ctx: click.Context,
     *,
@@ -538,6 +780,14 @@ def advise(
     user_stack_scoring: bool = True,
     dev: bool = False,
     labels: Optional[str] = None,
+    graph_snapshot: Optional[str] = None,
+    graph_snapshot_output: Optional[str] = None,
+    sieve_cache: Optional[str] = None,
+    policy_snapshot: Optional[str] = None,
+    workers: int = 1,
+    batch_size: int = 1,
+    graph_io_workers: int = 0,
+    stream: bool = False,
 ):
     """Advise package and package versions in the given stack or on solely package only."""
     parameters = locals()
@@ -546,6 +796,15 @@ def advise(
     if pipeline and prescription:
         sys.exit("Options --pipeline/--prescription are disjoint")
 
+    if graph_snapshot and graph_snapshot_output:
+        sys.exit("Options --graph-snapshot/--graph-snapshot-output are disjoint")
+
+    if workers > 1 and graph_snapshot_output:
+        sys.exit("Option --graph-snapshot-output cannot be used with multiple workers")
+
+    if stream and output.startswith(("http://", "https://")):
+        sys.exit("Option --stream requires output to be a file or the standard output")
+
     if library_usage:
         if os.path.isfile(library_usage):
             try:
@@ -615,8 +874,19 @@ def advise(
     random.seed(seed)
     termial_random.seed(seed)
 
+    graph = None
+    graph_snapshot_recorder = None
+    if graph_snapshot:
+        _LOGGER.info("Using offline graph snapshot %r", graph_snapshot)
+        graph = GraphSnapshot(graph_snapshot)
+    elif graph_snapshot_output:
+        graph_snapshot_recorder = GraphSnapshotRecorder(GraphDatabase())
+        graph_snapshot_recorder.connect()
+        graph = graph_snapshot_recorder
+
     resolver = Resolver.get_adviser_instance(
         predictor=predictor_instance,
+        graph=graph,
         project=project,
         labels=labels_dict,
         library_usage=library_usage,
@@ -628,20 +898,29 @@ def advise(
         pipeline_config=pipeline_config,
         prescription=prescription_instance,
         cli_parameters=parameters,
+        sieve_cache=SieveCache.load(sieve_cache) if sieve_cache else None,
+        policy_snapshot=PolicySnapshot.load(policy_snapshot) if policy_snapshot else None,
+        workers=workers,
+        batch_size=batch_size,
+        graph_io_workers=graph_io_workers,
     )
 
     del prescription  # No longer needed, garbage collect it.
 
-    print_func = _PrintFunc(
-        partial(
-            print_command_result,
-            click_ctx=click_ctx,
-            analyzer=analyzer_name,
-            analyzer_version=analyzer_version,
-            output=output,
-            pretty=not no_pretty,
+    stream_writer = _StreamWriter(output) if stream else None
+    if stream_writer is not None:
+        print_func = _PrintFunc(stream_writer.print_summary)
+    else:
+        print_func = _PrintFunc(
+            partial(
+                print_command_result,
+                click_ctx=click_ctx,
+                analyzer=analyzer_name,
+                analyzer_version=analyzer_version,
+                output=output,
+                pretty=not no_pretty,
+            )
         )
-    )
 
     exit_code = subprocess_run(
         resolver,
@@ -651,10 +930,13 @@ def advise(
         with_devel=dev,
         user_stack_scoring=user_stack_scoring,
         verbose=click_ctx.parent.params.get("verbose", False),
+        graph_snapshot_recorder=graph_snapshot_recorder,
+        graph_snapshot_output=graph_snapshot_output,
+        stream_func=stream_writer,
     )
 
     # Push metrics.
-    if _THOTH_METRICS_PUSHGATEWAY_URL:
+    if _THOTH_METRICS_PUSHGATEWAY_URL and not graph_snapshot:
         _METRIC_INFO.labels(_THOTH_DEPLOYMENT_NAME, analyzer_version).inc()
         _METRIC_DATABASE_SCHEMA_SCRIPT.labels(
             analyzer_name, resolver.graph.get_script_alembic_version_head(), _THOTH_DEPLOYMENT_NAME
@@ -966,6 +1248,86 @@ class _LogErrorCounter(logging.Handler):
             self.count += 1
 
 
+@cli.command("serve")
+@click.pass_context
+@click.option(
+    "--prescription",
+    envvar="THOTH_ADVISER_PRESCRIPTION",
+    default=None,
+    type=str,
+    multiple=True,
+    metavar="PRESCRIPTION",
+    help="Pipeline prescription supplied in a form of JSON/YAML or a path to a file, "
+    "multiple files can be supplied by using `,' as a delimiter.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    envvar="THOTH_ADVISER_SERVE_SOCKET",
+    default=None,
+    type=str,
+    metavar="SOCKET",
+    help="Accept requests on the given Unix socket instead of the standard input.",
+)
+@click.option(
+    "--pipeline-cache-size",
+    envvar="THOTH_ADVISER_PIPELINE_CACHE_SIZE",
+    default=PipelineCache.DEFAULT_MAX_SIZE,
+    type=int,
+    show_default=True,
+    metavar="SIZE",
+    help="Number of pipeline configurations kept across requests.",
+)
+@click.option(
+    "--sieve-cache",
+    envvar="THOTH_ADVISER_SIEVE_CACHE",
+    default=None,
+    type=str,
+    metavar="CACHE",
+    help="Re-use results of pipeline sieves stored in the given file, the file is updated after each request.",
+)
+def serve(
+    click_ctx: click.Context,
+    *,
+    prescription: Optional[str] = None,
+    socket_path: Optional[str] = None,
+    pipeline_cache_size: int = PipelineCache.DEFAULT_MAX_SIZE,
+    sieve_cache: Optional[str] = None,
+) -> None:
+    """Run a long-lived worker computing advises requested as JSON Lines on the standard input or a Unix socket."""
+    prescription_instance = None
+    if prescription:
+        if len(prescription) == 1:
+            # Click does not support multiple parameters when supplied via env vars. Perform split on delimiter.
+            prescription_instance = Prescription.load(*prescription[0].split(","))
+        else:
+            prescription_instance = Prescription.load(*prescription)
+
+    graph = GraphDatabase()
+    graph.connect()
+
+    worker = _AdviserWorker(
+        graph=graph,
+        prescription=prescription_instance,
+        pipeline_cache=PipelineCache(max_size=pipeline_cache_size),
+        sieve_cache=SieveCache.load(sieve_cache) if sieve_cache else None,
+        verbose=click_ctx.parent.params.get("verbose", False),
+    )
+
+    if socket_path is None:
+        _LOGGER.info("Accepting requests on the standard input")
+        worker.serve(sys.stdin.buffer, sys.stdout.buffer)
+        return
+
+    with socketserver.UnixStreamServer(socket_path, _AdviserRequestHandler) as server:
+        server.worker = worker
+        _LOGGER.info("Accepting requests on %r", socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
 @cli.command("validate-prescriptions")
 @click.argument("prescriptions", nargs=-1, metavar="PRESCRIPTION_DIR", type=click.Path(exists=True))
 @click.option(
@@ -984,8 +1346,22 @@ class _LogErrorCounter(logging.Handler):
     required=False,
     help="Serialize validated prescriptions into an output pickle file.",
 )
+@click.option(
+    "--output-bundle",
+    envvar="THOTH_ADVISER_VALIDATE_PRESCRIPTION_OUTPUT_BUNDLE",
+    type=str,
+    metavar="PRESCRIPTIONS.bundle",
+    required=False,
+    help="Compile validated prescriptions into a bundle file which is loaded lazily by adviser.",
+)
 @click.option("--pre-commit", envvar="PRE_COMMIT_MODE", type=bool, metavar="PRECOMMIT", required=False, default=False)
-def validate_prescription(prescriptions: List[str], show_unit_names: bool, output: str, pre_commit: bool) -> None:
+def validate_prescription(
+    prescriptions: List[str],
+    show_unit_names: bool,
+    output: str,
+    pre_commit: bool,
+    output_bundle: Optional[str] = None,
+) -> None:
     """Validate the given prescription."""
     if pre_commit:
         _LOGGER.setLevel(logging.ERROR)
@@ -1030,5 +1406,9 @@ def validate_prescription(prescriptions: List[str], show_unit_names: bool, outpu
         with open(output, "wb") as fp:
             pickle.dump(prescription, fp)
 
+    if output_bundle:
+        _LOGGER.info("Writing validated prescriptions bundle to %r", output_bundle)
+        prescription.dump_bundle(output_bundle)
+
 
 __name__ == "__main__" and cli()
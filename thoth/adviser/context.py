@@ -19,12 +19,15 @@
 
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
 from typing import List
 from typing import Optional
 from typing import Generator
+from typing import Iterable
 from typing import Tuple
 from typing import TYPE_CHECKING
 from typing import Set
+import bisect
 import operator
 import heapq
 
@@ -32,11 +35,14 @@ import attr
 
 from thoth.python import PackageVersion
 from thoth.python import Source
+from thoth.python.package_version import Version
 from thoth.python import Project
 from thoth.storages import GraphDatabase
+from thoth.storages.exceptions import NotFoundError
 
 from .beam import Beam
 from .exceptions import NotFound
+from .graph_io import AsyncGraph
 from .enums import RecommendationType
 from .enums import DecisionType
 from .state import State
@@ -44,6 +50,19 @@ from .state import State
 if TYPE_CHECKING:
     from .prescription import Prescription  # noqa: F401
 
+# A dependent introducing a dependency - the dependent package tuple and the runtime environment it was solved for.
+_Dependent = Tuple[Tuple[str, str, str], Optional[str], Optional[str], Optional[str]]
+# A marker stating no environment marker was found for a dependency.
+_MARKER_NOT_FOUND = object()
+
+
+@attr.s(slots=True)
+class PackageRecord:
+    """A lightweight record of a package registered to the context, see Context.get_package_version."""
+
+    develop = attr.ib(type=bool, kw_only=True)
+    extras = attr.ib(type=Optional[List[str]], kw_only=True, default=None)
+
 
 @attr.s(slots=True)
 class Context:
@@ -51,6 +70,8 @@ class Context:
 
     It's suitable to cache entries such as PackageVersion to optimize memory usage and optimize overhead
     needed - for example for parsing version strings (this is lazily pre-cached in PackageVersion).
+
+    Package tuples registered are kept as package records, package versions are created lazily once asked for.
     """
 
     project = attr.ib(type=Project, kw_only=True)
@@ -95,6 +116,7 @@ class Context:
     prescription = attr.ib(type=Optional["Prescription"], default=None, kw_only=True)
     cli_parameters = attr.ib(type=Dict[str, Any], kw_only=True, default=attr.Factory(dict))
     stack_info = attr.ib(type=List[Dict[str, Any]], kw_only=True, default=attr.Factory(list))
+    graph_io = attr.ib(type=Optional[AsyncGraph], kw_only=True, default=None)
     accepted_final_states_count = attr.ib(type=int, kw_only=True, default=0)
     discarded_final_states_count = attr.ib(type=int, kw_only=True, default=0)
 
@@ -104,6 +126,60 @@ class Context:
         default=attr.Factory(list),
     )
     _accepted_states_counter = attr.ib(type=int, kw_only=True, default=0)
+    # None stands for a negative result - the given package was not found in the database.
+    _depends_on_cache = attr.ib(
+        type=Dict[
+            Tuple[Tuple[str, str, str], FrozenSet[Optional[str]]],
+            Optional[Dict[str, List[Tuple[str, str]]]],
+        ],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # All the package tuples registered, package_versions holds only package versions created out of them.
+    _package_records = attr.ib(
+        type=Dict[Tuple[str, str, str], PackageRecord],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # Interning table - states refer to the same package tuple instances instead of keeping their own copies.
+    _package_tuples = attr.ib(
+        type=Dict[Tuple[str, str, str], Tuple[str, str, str]],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # Record index of solved package versions in the runtime environment used, keyed by (name, version).
+    _version_records = attr.ib(
+        type=Dict[Tuple[str, str], List[Dict[str, Any]]],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # Hashes and environment markers used when constructing products, see prefetch_product_data.
+    _hashes = attr.ib(type=Dict[Tuple[str, str, str], List[str]], kw_only=True, default=attr.Factory(dict))
+    _environment_markers = attr.ib(
+        type=Dict[Tuple[_Dependent, Tuple[str, str, str]], Any],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # Ranks of versions within their package name computed on registration, a newer version has a higher rank.
+    _version_ranks = attr.ib(type=Dict[str, Dict[str, int]], kw_only=True, default=attr.Factory(dict))
+    # Distinct versions registered for each package name, sorted in ascending order.
+    _versions_sorted = attr.ib(type=Dict[str, List[Version]], kw_only=True, default=attr.Factory(dict))
+    # Learned conflicts (nogoods) - package tuples that cannot be resolved in any state, versions of dependencies
+    # allowed by package tuples and resolved package tuples the given package tuples conflict with.
+    learned_conflicts_count = attr.ib(type=int, kw_only=True, default=0)
+    _unsolvable = attr.ib(type=Set[Tuple[str, str, str]], kw_only=True, default=attr.Factory(set))
+    _requirements = attr.ib(
+        type=Dict[Tuple[str, str, str], Dict[str, FrozenSet[Tuple[str, str, str]]]],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    _conflicts = attr.ib(
+        type=Dict[Tuple[str, str, str], Set[Tuple[str, str, str]]],
+        kw_only=True,
+        default=attr.Factory(dict),
+    )
+    # Package tuples with a conflict learned, keyed by package name.
+    _conflicting_tuples = attr.ib(type=Dict[str, Set[Tuple[str, str, str]]], kw_only=True, default=attr.Factory(dict))
 
     def __attrs_post_init__(self) -> None:
         """Verify we have only adviser or dependency monkey specific context."""
@@ -121,30 +197,340 @@ class Context:
         """Get accepted final states by resolution pipeline sorted by score and their precedence."""
         return (item[1] for item in sorted(self._accepted_states, key=operator.itemgetter(0), reverse=reverse))
 
+    def intern_package_tuple(self, package_tuple: Tuple[str, str, str]) -> Tuple[str, str, str]:
+        """Get the canonical instance of the given package tuple.
+
+        Package tuples are constructed repeatedly from database records and package versions during the
+        resolution. States keep the canonical instance to share the tuple (and strings it holds) across the beam.
+        """
+        return self._package_tuples.setdefault(package_tuple, package_tuple)
+
     def get_package_version(
         self, package_tuple: Tuple[str, str, str], *, graceful: bool = False
     ) -> Optional[PackageVersion]:
-        """Get the given package version registered to the context."""
+        """Get the given package version registered to the context, create it on the first access."""
         package_version = self.package_versions.get(package_tuple)
-        if package_version is None and not graceful:
-            raise NotFound(f"Package {package_tuple!r} not found in the pipeline context")
+        if package_version is not None:
+            return package_version
+
+        record = self._package_records.get(package_tuple)
+        if record is None:
+            if not graceful:
+                raise NotFound(f"Package {package_tuple!r} not found in the pipeline context")
+
+            return None
+
+        source = self.sources.get(package_tuple[2])
+        if not source:
+            source = Source(package_tuple[2])
+            self.sources[package_tuple[2]] = source
 
+        package_version = PackageVersion(
+            name=package_tuple[0],
+            version="==" + package_tuple[1],
+            index=source,
+            extras=record.extras,
+            develop=record.develop,
+        )
+        self.package_versions[package_tuple] = package_version
         return package_version
 
+    def get_package_record(
+        self, package_tuple: Tuple[str, str, str], *, graceful: bool = False
+    ) -> Optional[PackageRecord]:
+        """Get record of the given package registered to the context without creating its package version."""
+        record = self._package_records.get(package_tuple)
+        if record is None and not graceful:
+            raise NotFound(f"Package {package_tuple!r} not found in the pipeline context")
+
+        return record
+
+    def _mark_develop(self, package_tuple: Tuple[str, str, str], record: PackageRecord, develop: bool) -> None:
+        """Propagate the develop flag to the package record and the package version, if created."""
+        # If the given package is shared in develop and in the main part, make it main stack part.
+        record.develop = record.develop or develop
+        package_version = self.package_versions.get(package_tuple)
+        if package_version is not None:
+            package_version.develop = record.develop
+
+    def prefetch_depends_on(self, depends_on: Iterable[Tuple[Tuple[str, str, str], FrozenSet[Optional[str]]]]) -> None:
+        """Fetch dependencies of all the given package tuples and extras not yet present in the cache in one pass.
+
+        Results are cached including negative ones so that the graph database is queried at most once per
+        package tuple and extras during the whole resolution.
+        """
+        runtime_environment = self.project.runtime_environment
+        # Keep insertion order to query the database deterministically.
+        to_fetch = list(dict.fromkeys(key for key in depends_on if key not in self._depends_on_cache))
+        kwargs = {
+            "os_name": runtime_environment.operating_system.name,
+            "os_version": runtime_environment.operating_system.version,
+            "python_version": runtime_environment.python_version,
+            "marker_evaluation_result": True if runtime_environment.is_fully_specified() else None,
+            "is_missing": False,
+        }
+
+        if self.graph_io is not None and len(to_fetch) > 1:
+            results = self.graph_io.gather(
+                *(self.graph_io.get_depends_on(*t, extras=extras, **kwargs) for t, extras in to_fetch),
+                return_exceptions=True,
+            )
+            for key, result in zip(to_fetch, results):
+                if isinstance(result, NotFoundError):
+                    result = None
+                elif isinstance(result, BaseException):
+                    raise result
+
+                self._depends_on_cache[key] = result
+
+            return
+
+        for package_tuple, extras in to_fetch:
+            try:
+                dependencies = self.graph.get_depends_on(*package_tuple, extras=extras, **kwargs)
+            except NotFoundError:
+                dependencies = None
+
+            self._depends_on_cache[(package_tuple, extras)] = dependencies
+
+    def get_depends_on(
+        self, package_tuple: Tuple[str, str, str], *, extras: FrozenSet[Optional[str]]
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """Get dependencies of the given package tuple in the runtime environment used, cached for the whole run.
+
+        @raises NotFoundError: if the given package tuple was not found in the graph database
+        """
+        key = (package_tuple, extras)
+        try:
+            dependencies = self._depends_on_cache[key]
+        except KeyError:
+            self.prefetch_depends_on((key,))
+            dependencies = self._depends_on_cache[key]
+
+        if dependencies is None:
+            raise NotFoundError(f"No package record for {package_tuple!r} with extras {set(extras)!r} found")
+
+        return dependencies
+
+    def prefetch_python_package_version_records(self, dependencies: Iterable[Tuple[str, str]]) -> None:
+        """Fetch records of all the given (name, version) pairs not yet present in the record index in one pass.
+
+        The given pairs can come from a single state expansion or from multiple expansions at once. Each pair is
+        retrieved from the graph database at most once during the whole resolution.
+        """
+        runtime_environment = self.project.runtime_environment
+        # Keep insertion order to query the database deterministically.
+        to_fetch = list(dict.fromkeys(d for d in dependencies if d not in self._version_records))
+        kwargs = {
+            "index_url": None,  # Do cross-index resolving.
+            "os_name": runtime_environment.operating_system.name,
+            "os_version": runtime_environment.operating_system.version,
+            "python_version": runtime_environment.python_version,
+        }
+
+        if self.graph_io is not None and len(to_fetch) > 1:
+            results = self.graph_io.gather(
+                *(
+                    self.graph_io.get_python_package_version_records(package_name=n, package_version=v, **kwargs)
+                    for n, v in to_fetch
+                )
+            )
+            self._version_records.update(zip(to_fetch, results))
+            return
+
+        for package_name, package_version in to_fetch:
+            self._version_records[(package_name, package_version)] = self.graph.get_python_package_version_records(
+                package_name=package_name, package_version=package_version, **kwargs
+            )
+
+    def get_python_package_version_records(self, package_name: str, package_version: str) -> List[Dict[str, Any]]:
+        """Get records of the given package solved in the runtime environment used, regardless of the index."""
+        records = self._version_records.get((package_name, package_version))
+        if records is None:
+            self.prefetch_python_package_version_records(((package_name, package_version),))
+            records = self._version_records[(package_name, package_version)]
+
+        return records
+
+    def _get_product_data_queries(
+        self, states: Iterable[State]
+    ) -> Tuple[List[Tuple[str, str, str]], List[Tuple[_Dependent, Tuple[str, str, str]]]]:
+        """Get hashes and environment markers needed to construct products out of the given states, not cached yet."""
+        seen = set()
+        hashes_keys = []
+        markers_keys = []
+        direct_dependencies = self.project.pipfile.packages.packages
+        for state in states:
+            for package_tuple in state.resolved_dependencies.values():
+                if package_tuple in seen:
+                    continue
+
+                seen.add(package_tuple)
+                package_version: PackageVersion = self.get_package_version(package_tuple, graceful=False)
+                if not package_version.hashes and package_tuple not in self._hashes:
+                    hashes_keys.append(package_tuple)
+
+                if package_version.name in direct_dependencies:
+                    # Markers of direct dependencies are stated by the user.
+                    continue
+
+                for dependent in self.dependents[package_tuple[0]][package_tuple]:
+                    if (dependent, package_tuple) not in self._environment_markers:
+                        markers_keys.append((dependent, package_tuple))
+
+        return hashes_keys, markers_keys
+
+    def prefetch_product_data(self, states: Iterable[State]) -> None:
+        """Fetch hashes and environment markers needed to construct products out of the given final states.
+
+        Data are fetched for the union of packages present in the given states so that each package is queried at
+        most once regardless of the number of products constructed.
+        """
+        hashes_keys, markers_keys = self._get_product_data_queries(states)
+
+        if self.graph_io is not None and len(hashes_keys) + len(markers_keys) > 1:
+            graph_io = self.graph_io
+            results = graph_io.gather(
+                *(graph_io.get_python_package_hashes_sha256(*package_tuple) for package_tuple in hashes_keys),
+                *(
+                    graph_io.get_python_environment_marker(
+                        *dependent[0],
+                        dependency_name=package_tuple[0],
+                        dependency_version=package_tuple[1],
+                        os_name=dependent[1],
+                        os_version=dependent[2],
+                        python_version=dependent[3],
+                        marker_evaluation_result=True,
+                    )
+                    for dependent, package_tuple in markers_keys
+                ),
+                return_exceptions=True,
+            )
+
+            for idx, result in enumerate(results):
+                if isinstance(result, NotFoundError) and idx >= len(hashes_keys):
+                    results[idx] = _MARKER_NOT_FOUND
+                elif isinstance(result, BaseException):
+                    raise result
+
+            self._hashes.update(zip(hashes_keys, results[: len(hashes_keys)]))
+            self._environment_markers.update(zip(markers_keys, results[len(hashes_keys) :]))
+            return
+
+        for package_tuple in hashes_keys:
+            self.get_python_package_hashes_sha256(package_tuple)
+
+        for dependent, package_tuple in markers_keys:
+            try:
+                self.get_python_environment_marker(dependent, package_tuple)
+            except NotFoundError:
+                # Noted in the cache, reported once the marker is requested when constructing the product.
+                pass
+
+    def get_python_package_hashes_sha256(self, package_tuple: Tuple[str, str, str]) -> List[str]:
+        """Get hashes of the given package, cached for the whole run."""
+        hashes = self._hashes.get(package_tuple)
+        if hashes is None:
+            hashes = self.graph.get_python_package_hashes_sha256(*package_tuple)
+            self._hashes[package_tuple] = hashes
+
+        return hashes
+
+    def get_python_environment_marker(
+        self, dependent: _Dependent, package_tuple: Tuple[str, str, str]
+    ) -> Optional[str]:
+        """Get environment marker of the given package introduced by the given dependent, cached for the whole run.
+
+        @raises NotFoundError: if the given dependency was not found in the graph database
+        """
+        key = (dependent, package_tuple)
+        try:
+            marker = self._environment_markers[key]
+        except KeyError:
+            try:
+                marker = self.graph.get_python_environment_marker(
+                    *dependent[0],
+                    dependency_name=package_tuple[0],
+                    dependency_version=package_tuple[1],
+                    os_name=dependent[1],
+                    os_version=dependent[2],
+                    python_version=dependent[3],
+                    marker_evaluation_result=True,
+                )
+            except NotFoundError:
+                self._environment_markers[key] = _MARKER_NOT_FOUND
+                raise
+
+            self._environment_markers[key] = marker
+
+        if marker is _MARKER_NOT_FOUND:
+            raise NotFoundError(f"No environment marker for {package_tuple!r} introduced by {dependent[0]!r} found")
+
+        return marker  # type: ignore[no-any-return]
+
     def register_package_version(self, package_version: PackageVersion) -> bool:
         """Register the given package version to the context."""
         package_tuple = package_version.to_tuple()
-        registered = self.package_versions.get(package_tuple)
-        if registered:
-            # If the given package is shared in develop and in the main part, make it main stack part.
-            registered.develop = registered.develop or package_version.develop
+        record = self._package_records.get(package_tuple)
+        if record is not None:
+            self.package_versions.setdefault(package_tuple, package_version)
+            self._mark_develop(package_tuple, record, package_version.develop)
             return True
 
         # Direct dependency, no dependency introduced this one.
         self._note_dependencies(package_tuple=None, dependency_tuple=package_tuple)
+        self._package_records[package_tuple] = PackageRecord(
+            develop=package_version.develop, extras=package_version.extras
+        )
         self.package_versions[package_tuple] = package_version
+        self._rank_package_tuple(package_tuple, package_version.semantic_version)
         return False
 
+    def merge_package_version(self, package_version: PackageVersion) -> PackageVersion:
+        """Merge the given package version created in another context, for example a worker's one.
+
+        Unlike register_package_version, the package version is not noted as a direct dependency - dependencies
+        and dependents are merged separately. Return the package version kept in the context.
+        """
+        package_tuple = package_version.to_tuple()
+        record = self._package_records.get(package_tuple)
+        if record is None:
+            record = PackageRecord(develop=package_version.develop, extras=package_version.extras)
+            self._package_records[package_tuple] = record
+            self._rank_package_tuple(package_tuple, package_version.semantic_version)
+
+        registered = self.package_versions.setdefault(package_tuple, package_version)
+        self._mark_develop(package_tuple, record, package_version.develop)
+        return registered
+
+    def _rank_package_tuple(self, package_tuple: Tuple[str, str, str], semantic_version: Version) -> None:
+        """Assign a rank to the given package tuple within versions of the same package registered."""
+        version_ranks = self._version_ranks.setdefault(package_tuple[0], {})
+        if package_tuple[1] in version_ranks:
+            return
+
+        versions = self._versions_sorted.setdefault(package_tuple[0], [])
+        rank = bisect.bisect_left(versions, semantic_version)
+        if rank == len(versions) or versions[rank] != semantic_version:
+            # A new distinct version, shift ranks of newer versions. Versions equal semantically share the rank.
+            versions.insert(rank, semantic_version)
+            for version, version_rank in version_ranks.items():
+                if version_rank >= rank:
+                    version_ranks[version] = version_rank + 1
+
+        version_ranks[package_tuple[1]] = rank
+
+    def get_version_ranks(self, package_name: str) -> Dict[str, int]:
+        """Get ranks of versions registered for the given package, suitable as sort keys."""
+        return self._version_ranks.get(package_name, {})
+
+    def get_version_rank(self, package_tuple: Tuple[str, str, str]) -> int:
+        """Get rank of the given package tuple within versions of the same package registered."""
+        try:
+            return self._version_ranks[package_tuple[0]][package_tuple[1]]
+        except KeyError as exc:
+            raise NotFound(f"Package {package_tuple!r} not found in the pipeline context") from exc
+
     def register_accepted_final_state(self, state: State) -> None:
         """Register an accepted state by the resolution pipeline."""
         # We keep only `count' states as that was requested by pipeline caller.
@@ -156,6 +542,13 @@ class Context:
         else:
             heapq.heappush(self._accepted_states, item)
 
+    def get_accepted_final_states_threshold(self) -> Optional[float]:
+        """Get score a final state has to exceed to be kept in accepted final states, None if there is a free slot."""
+        if self.count is None or len(self._accepted_states) < self.count:
+            return None
+
+        return self._accepted_states[0][0][0]
+
     def get_top_accepted_final_state(self) -> Optional[State]:
         """Get the best accepted final state so far computed by the resolution pipeline."""
         if not self._accepted_states:
@@ -168,6 +561,73 @@ class Context:
 
         return result[1]
 
+    def _note_conflict(self, package_tuple: Tuple[str, str, str]) -> None:
+        """Note a conflict was learned for the given package tuple."""
+        self.learned_conflicts_count += 1
+        self._conflicting_tuples.setdefault(package_tuple[0], set()).add(package_tuple)
+
+    def learn_unsolvable(self, package_tuple: Tuple[str, str, str]) -> None:
+        """Learn the given package tuple cannot be resolved in any state."""
+        if package_tuple not in self._unsolvable:
+            self._unsolvable.add(package_tuple)
+            self._note_conflict(package_tuple)
+
+    def learn_requirement(
+        self,
+        package_tuple: Tuple[str, str, str],
+        dependency_name: str,
+        dependency_tuples: Iterable[Tuple[str, str, str]],
+    ) -> None:
+        """Learn versions of a dependency allowed by the given package tuple, none of them was found in a state."""
+        requirements = self._requirements.setdefault(package_tuple, {})
+        if dependency_name not in requirements:
+            requirements[dependency_name] = frozenset(dependency_tuples)
+            self._note_conflict(package_tuple)
+
+    def learn_conflict(self, package_tuple: Tuple[str, str, str], resolved_tuple: Tuple[str, str, str]) -> None:
+        """Learn the given package tuple cannot be resolved in states with the given package tuple resolved."""
+        conflicts = self._conflicts.setdefault(package_tuple, set())
+        if resolved_tuple not in conflicts:
+            conflicts.add(resolved_tuple)
+            self._note_conflict(package_tuple)
+
+    def is_conflicting(self, state: State, package_tuple: Tuple[str, str, str]) -> bool:
+        """Check if resolving the given package tuple in the given state is known to lead to a dead end."""
+        if package_tuple in self._unsolvable:
+            return True
+
+        for resolved_tuple in self._conflicts.get(package_tuple, ()):
+            if state.resolved_dependencies.get(resolved_tuple[0]) == resolved_tuple:
+                return True
+
+        for dependency_name, dependency_tuples in self._requirements.get(package_tuple, {}).items():
+            dependency_tuple = state.resolved_dependencies.get(dependency_name)
+            if dependency_tuple is not None:
+                if dependency_tuple not in dependency_tuples:
+                    return True
+            elif dependency_name in state.unresolved_dependencies and dependency_tuples.isdisjoint(
+                state.unresolved_dependencies[dependency_name].values()
+            ):
+                return True
+
+        return False
+
+    def get_conflicting_dependencies(self, state: State) -> Dict[str, List[Tuple[str, str, str]]]:
+        """Get unresolved dependencies of the given state known to lead to a dead end, keyed by package name."""
+        if len(self._conflicting_tuples) < len(state.unresolved_dependencies):
+            package_names: Iterable[str] = [n for n in self._conflicting_tuples if n in state.unresolved_dependencies]
+        else:
+            package_names = [n for n in state.unresolved_dependencies if n in self._conflicting_tuples]
+
+        result: Dict[str, List[Tuple[str, str, str]]] = {}
+        for package_name in package_names:
+            unresolved = state.unresolved_dependencies[package_name]
+            for package_tuple in self._conflicting_tuples[package_name]:
+                if hash(package_tuple) in unresolved and self.is_conflicting(state, package_tuple):
+                    result.setdefault(package_name, []).append(package_tuple)
+
+        return result
+
     def register_package_tuple(
         self,
         package_tuple: Tuple[str, str, str],
@@ -180,11 +640,34 @@ class Context:
         python_version: Optional[str],
     ) -> PackageVersion:
         """Register the given package tuple to pipeline context and return its package version representative."""
-        registered = self.package_versions.get(package_tuple)
+        self.register_package_record(
+            package_tuple,
+            develop=develop,
+            dependent_tuple=dependent_tuple,
+            extras=extras,
+            os_name=os_name,
+            os_version=os_version,
+            python_version=python_version,
+        )
+        package_version: PackageVersion = self.get_package_version(package_tuple)
+        return package_version
+
+    def register_package_record(
+        self,
+        package_tuple: Tuple[str, str, str],
+        *,
+        develop: bool,
+        dependent_tuple: Optional[Tuple[str, str, str]] = None,
+        extras: Optional[List[str]] = None,
+        os_name: Optional[str],
+        os_version: Optional[str],
+        python_version: Optional[str],
+    ) -> PackageRecord:
+        """Register the given package tuple to pipeline context, its package version is created once asked for."""
+        registered = self._package_records.get(package_tuple)
 
         if registered:
-            # If the given package is shared in develop and in the main part, make it main stack part.
-            registered.develop = registered.develop or develop
+            self._mark_develop(package_tuple, registered, develop)
             self._note_dependencies(
                 dependent_tuple,
                 package_tuple,
@@ -197,19 +680,9 @@ class Context:
             # in this function call.
             return registered
 
-        source = self.sources.get(package_tuple[2])
-        if not source:
-            source = Source(package_tuple[2])
-            self.sources[package_tuple[2]] = source
-
-        package_version = PackageVersion(
-            name=package_tuple[0],
-            version="==" + package_tuple[1],
-            index=source,
-            extras=extras,
-            develop=develop,
-        )
-        self.package_versions[package_tuple] = package_version
+        record = PackageRecord(develop=develop, extras=extras)
+        self._package_records[package_tuple] = record
+        self._rank_package_tuple(package_tuple, PackageVersion.parse_semantic_version(package_tuple[1]))
         self._note_dependencies(
             dependent_tuple,
             package_tuple,
@@ -217,7 +690,7 @@ class Context:
             os_version=os_version,
             python_version=python_version,
         )
-        return package_version
+        return record
 
     def _note_dependencies(
         self,
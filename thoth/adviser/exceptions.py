@@ -63,6 +63,26 @@ class UnableLock(AdviserException):  # noqa: N818
     """Raised if it is unable to lock dependencies given the set of constraints."""
 
 
+class GraphSnapshotError(AdviserException):
+    """An exception raised if the given graph snapshot is not valid or it cannot answer the given query."""
+
+
+class SieveCacheError(AdviserException):
+    """An exception raised if the given sieve cache cannot be loaded or stored."""
+
+
+class PolicySnapshotError(AdviserException):
+    """An exception raised if the given policy snapshot cannot be loaded or stored."""
+
+
+class PrescriptionBundleError(AdviserException):
+    """An exception raised if the given file is not a valid compiled prescription bundle."""
+
+
+class ResolverWorkerError(AdviserException):
+    """An exception raised when a resolver worker process fails."""
+
+
 class NoHistoryKept(AdviserException):  # noqa: N818
     """Raised if a user asks for history, but history was not kept (e.g. temperature function history in annealing)."""
 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""An asyncio facade over graph database queries performed during the resolution.
+
+The graph database adapter is blocking. The facade runs queries in a bounded
+pool of threads - each thread holds at most one database session at a time, so
+the number of threads bounds the number of database connections used. This
+allows issuing independent queries concurrently so that latency of a remote
+database is paid once per batch of queries instead of once per query.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import attr
+from thoth.storages.graph.postgres import GraphDatabase
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@attr.s(slots=True)
+class AsyncGraph:
+    """Run blocking graph database queries concurrently in a bounded pool of threads."""
+
+    # Matches the default connection pool size of SQLAlchemy engine used by the graph database adapter.
+    DEFAULT_MAX_WORKERS = 5
+
+    graph = attr.ib(type=GraphDatabase, kw_only=True)
+    max_workers = attr.ib(type=int, kw_only=True, default=DEFAULT_MAX_WORKERS)
+
+    _executor = attr.ib(type=Optional[ThreadPoolExecutor], default=None, init=False)
+    _loop = attr.ib(type=Optional[asyncio.AbstractEventLoop], default=None, init=False)
+
+    @max_workers.validator
+    def _max_workers_validator(self, _: Any, value: int) -> None:
+        """Validate number of threads used to query the graph database."""
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"Number of graph database workers should be a positive integer, got {value!r}")
+
+    async def _call(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """Run the given graph database adapter method in the thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="graph-io")
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(getattr(self.graph, method_name), *args, **kwargs)
+        )
+
+    async def get_depends_on(self, *args: Any, **kwargs: Any) -> Dict[Optional[str], List[Tuple[str, str]]]:
+        """Get dependencies of the given package, see GraphDatabase.get_depends_on."""
+        result: Dict[Optional[str], List[Tuple[str, str]]] = await self._call("get_depends_on", *args, **kwargs)
+        return result
+
+    async def get_python_package_version_records(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Get records of the given package, see GraphDatabase.get_python_package_version_records."""
+        result: List[Dict[str, Any]] = await self._call("get_python_package_version_records", *args, **kwargs)
+        return result
+
+    async def get_python_package_hashes_sha256(self, *args: Any, **kwargs: Any) -> List[str]:
+        """Get hashes of the given package, see GraphDatabase.get_python_package_hashes_sha256."""
+        result: List[str] = await self._call("get_python_package_hashes_sha256", *args, **kwargs)
+        return result
+
+    async def get_python_environment_marker(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Get environment marker of a dependency, see GraphDatabase.get_python_environment_marker."""
+        result: Optional[str] = await self._call("get_python_environment_marker", *args, **kwargs)
+        return result
+
+    async def get_python_cve_records_all(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Get CVE records of the given package, see GraphDatabase.get_python_cve_records_all."""
+        result: List[Dict[str, Any]] = await self._call("get_python_cve_records_all", *args, **kwargs)
+        return result
+
+    def gather(self, *awaitables: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """Run the given queries concurrently from synchronous code, results are returned in the order given."""
+        if not awaitables:
+            return []
+
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+
+        async def _gather() -> List[Any]:
+            results: List[Any] = await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+            return results
+
+        return self._loop.run_until_complete(_gather())
+
+    def close(self) -> None:
+        """Release threads and the event loop used, the facade can be used again after closing."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
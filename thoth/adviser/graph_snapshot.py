@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Offline snapshots of the knowledge graph used during a resolver run.
+
+A snapshot captures responses of all the graph database queries performed
+during a resolution (solved versions, dependencies, environment markers, hashes,
+CVE records, ...). The snapshot can be later used instead of a live graph
+database - this makes resolver runs repeatable and independent of database
+availability.
+
+The snapshot file is made out of a header, JSON encoded records and a JSON
+encoded index stored at the end of the file. The index maps a query to the
+position of its record in the file. Records are read lazily from a memory-mapped
+file. Unlike pickle, loading a snapshot obtained from a shared location cannot
+execute any code.
+"""
+
+import datetime
+import json
+import logging
+import mmap
+import struct
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import attr
+from thoth.storages.graph.postgres import GraphDatabase
+from thoth.storages.exceptions import NotFoundError
+
+from .exceptions import GraphSnapshotError
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"THOTHGS"
+_FORMAT_VERSION = 2
+# Magic, format version and offset of the index.
+_HEADER = struct.Struct("<7sBQ")
+# Attributes of the graph adapter which are not queries but are used by the resolver.
+_ATTRIBUTES = ("DEFAULT_COUNT",)
+
+
+def _canonical(value: Any) -> Any:
+    """Turn the given value into a JSON serializable value that does not depend on ordering of sets."""
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(i) for i in value), key=lambda i: (i is not None, json.dumps(i)))
+
+    if isinstance(value, (list, tuple)):
+        return [_canonical(i) for i in value]
+
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda i: str(i[0]))}
+
+    return value
+
+
+def _query_key(method_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Compute a key uniquely identifying the given query."""
+    return json.dumps([method_name, _canonical(args), _canonical(kwargs)], sort_keys=True)
+
+
+def _encode(value: Any) -> Any:
+    """Turn the given query result into a JSON serializable value, types not available in JSON are tagged."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, list):
+        return [_encode(i) for i in value]
+
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(i) for i in value]}
+
+    if isinstance(value, frozenset):
+        return {"frozenset": [_encode(i) for i in value]}
+
+    if isinstance(value, set):
+        return {"set": [_encode(i) for i in value]}
+
+    if isinstance(value, dict):
+        return {"dict": [[_encode(k), _encode(v)] for k, v in value.items()]}
+
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+
+    if isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+
+    raise GraphSnapshotError(f"Value {value!r} of type {type(value).__name__!r} cannot be stored in a graph snapshot")
+
+
+def _decode(value: Any) -> Any:
+    """Turn a value stored in the snapshot into the query result recorded."""
+    if isinstance(value, list):
+        return [_decode(i) for i in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    ((tag, item),) = value.items()
+    if tag == "tuple":
+        return tuple(_decode(i) for i in item)
+
+    if tag == "frozenset":
+        return frozenset(_decode(i) for i in item)
+
+    if tag == "set":
+        return {_decode(i) for i in item}
+
+    if tag == "dict":
+        return {_decode(k): _decode(v) for k, v in item}
+
+    if tag == "datetime":
+        return datetime.datetime.fromisoformat(item)
+
+    if tag == "date":
+        return datetime.date.fromisoformat(item)
+
+    raise ValueError(f"Unknown type {tag!r} stored in the graph snapshot")
+
+
+@attr.s(slots=True)
+class GraphSnapshotRecorder:
+    """Record responses of a graph database to create an offline snapshot."""
+
+    graph = attr.ib(type=GraphDatabase)
+
+    _records = attr.ib(type=Dict[str, Tuple[bool, Any]], factory=dict, init=False)
+
+    def __getattr__(self, name: str) -> Any:
+        """Proxy attributes to the graph database, record responses of queries."""
+        attribute = getattr(self.graph, name)
+        if not callable(attribute) or name in ("connect", "is_connected", "disconnect"):
+            return attribute
+
+        def query(*args: Any, **kwargs: Any) -> Any:
+            key = _query_key(name, args, kwargs)
+            try:
+                result = attribute(*args, **kwargs)
+            except NotFoundError as exc:
+                self._records[key] = (False, str(exc))
+                raise
+
+            self._records[key] = (True, result)
+            return result
+
+        return query
+
+    @property
+    def records_count(self) -> int:
+        """Get number of queries recorded."""
+        return len(self._records)
+
+    def dump(self, path: str) -> None:
+        """Write recorded responses to the given file."""
+        index: Dict[str, Tuple[int, int]] = {}
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, 0))
+            for key, (found, result) in self._records.items():
+                serialized = json.dumps([found, _encode(result)], separators=(",", ":")).encode()
+                index[key] = (snapshot_file.tell(), len(serialized))
+                snapshot_file.write(serialized)
+
+            index_offset = snapshot_file.tell()
+            content = {
+                "attributes": {a: getattr(self.graph, a) for a in _ATTRIBUTES if hasattr(self.graph, a)},
+                "index": index,
+            }
+            snapshot_file.write(json.dumps(content).encode())
+            snapshot_file.seek(0)
+            snapshot_file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, index_offset))
+
+        _LOGGER.info("Graph snapshot with %d records written to %r", len(index), path)
+
+
+@attr.s(slots=True)
+class GraphSnapshot:
+    """A read-only graph database adapter answering queries from an offline snapshot."""
+
+    path = attr.ib(type=str)
+
+    _mmap = attr.ib(type=Optional[mmap.mmap], default=None, init=False)
+    _index = attr.ib(type=Dict[str, Tuple[int, int]], factory=dict, init=False)
+    _attributes = attr.ib(type=Dict[str, Any], factory=dict, init=False)
+
+    def is_connected(self) -> bool:
+        """Check if the snapshot was loaded."""
+        return self._mmap is not None
+
+    def connect(self) -> None:
+        """Load the snapshot file, map records into memory."""
+        if self._mmap is not None:
+            return
+
+        with open(self.path, "rb") as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise GraphSnapshotError(f"File {self.path!r} is not a graph snapshot: {str(exc)}") from exc
+
+        try:
+            magic, version, index_offset = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error as exc:
+            raise GraphSnapshotError(f"File {self.path!r} is not a graph snapshot: {str(exc)}") from exc
+
+        if magic != _MAGIC or version != _FORMAT_VERSION or index_offset == 0:
+            raise GraphSnapshotError(f"File {self.path!r} is not a graph snapshot in version {_FORMAT_VERSION}")
+
+        try:
+            content = json.loads(self._mmap[index_offset:])
+            self._index = {key: (offset, length) for key, (offset, length) in content["index"].items()}
+            self._attributes = dict(content["attributes"])
+        except (ValueError, TypeError, KeyError) as exc:
+            raise GraphSnapshotError(f"Index of graph snapshot {self.path!r} is malformed: {str(exc)}") from exc
+
+        _LOGGER.debug("Loaded graph snapshot %r with %d records", self.path, len(self._index))
+
+    def disconnect(self) -> None:
+        """Release the memory mapped snapshot."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Answer the given query based on the snapshot."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if self._mmap is None:
+            self.connect()
+
+        if name in self._attributes:
+            return self._attributes[name]
+
+        def query(*args: Any, **kwargs: Any) -> Any:
+            return self._query(name, args, kwargs)
+
+        return query
+
+    def _query(self, method_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """Look up the recorded response of the given query."""
+        position = self._index.get(_query_key(method_name, args, kwargs))
+        if position is None:
+            raise GraphSnapshotError(
+                f"Query {method_name!r} with arguments {args!r} and {kwargs!r} is not recorded in "
+                f"graph snapshot {self.path!r}"
+            )
+
+        offset, length = position
+        try:
+            found, result = json.loads(self._mmap[offset : offset + length])  # type: ignore
+            result = _decode(result)
+        except (ValueError, TypeError) as exc:
+            raise GraphSnapshotError(
+                f"Record of query {method_name!r} in graph snapshot {self.path!r} is malformed: {str(exc)}"
+            ) from exc
+
+        if not found:
+            raise NotFoundError(result)
+
+        return result
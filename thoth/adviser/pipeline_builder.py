@@ -20,9 +20,14 @@
 import os
 import logging
 import json
+import time
+from contextlib import contextmanager
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
 from typing import Generator
+from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import List
 from typing import Optional
@@ -82,6 +87,10 @@ class PipelineBuilderContext:
     _steps_included = attr.ib(type=Dict[str, List["StepType"]], factory=dict, kw_only=True)
     _strides_included = attr.ib(type=Dict[str, List["StrideType"]], factory=dict, kw_only=True)
     _wraps_included = attr.ib(type=Dict[str, List["WrapType"]], factory=dict, kw_only=True)
+    # Units added to the pipeline configuration as (unit_type, unit_name), in the order they were added.
+    _changes = attr.ib(type=List[Tuple[str, str]], factory=list, init=False)
+    # Parts of the pipeline configuration read by the unit currently evaluated, if tracked.
+    _dependencies = attr.ib(type=Optional[Set[Tuple[str, Optional[str]]]], default=None, init=False)
 
     @authenticated.default
     def _authenticated_default(self) -> bool:
@@ -92,61 +101,73 @@ class PipelineBuilderContext:
     @property
     def boots(self) -> List["BootType"]:
         """Get all boots registered to this pipeline builder context."""
+        self._record_dependency("boots")
         return list(chain(*self._boots.values()))
 
     @property
     def boots_dict(self) -> Dict[Optional[str], List["BootType"]]:
         """Get boots as a dictionary mapping."""
+        self._record_dependency("boots")
         return self._boots
 
     @property
     def pseudonyms(self) -> List["PseudonymType"]:
         """Get all pseudonyms registered to this pipeline builder context."""
+        self._record_dependency("pseudonyms")
         return list(chain(*self._pseudonyms.values()))
 
     @property
     def pseudonyms_dict(self) -> Dict[str, List["PseudonymType"]]:
         """Get pseudonyms as a dictionary mapping."""
+        self._record_dependency("pseudonyms")
         return self._pseudonyms
 
     @property
     def sieves(self) -> List["SieveType"]:
         """Get all sieves registered to this pipeline builder context."""
+        self._record_dependency("sieves")
         return list(chain(*self._sieves.values()))
 
     @property
     def sieves_dict(self) -> Dict[Optional[str], List["SieveType"]]:
         """Get sieves as a dictionary mapping."""
+        self._record_dependency("sieves")
         return self._sieves
 
     @property
     def steps(self) -> List["StepType"]:
         """Get all steps registered to this pipeline builder context."""
+        self._record_dependency("steps")
         return list(chain(*self._steps.values()))
 
     @property
     def steps_dict(self) -> Dict[Optional[str], List["StepType"]]:
         """Get steps as a dictionary mapping."""
+        self._record_dependency("steps")
         return self._steps
 
     @property
     def strides(self) -> List["StrideType"]:
         """Get all strides registered to this pipeline builder context."""
+        self._record_dependency("strides")
         return list(chain(*self._strides.values()))
 
     @property
     def strides_dict(self) -> Dict[Optional[str], List["StrideType"]]:
         """Get strides as a dictionary mapping."""
+        self._record_dependency("strides")
         return self._strides
 
     @property
     def wraps(self) -> List["WrapType"]:
         """Get all wraps registered to this pipeline builder context."""
+        self._record_dependency("wraps")
         return list(chain(*self._wraps.values()))
 
     @property
     def wraps_dict(self) -> Dict[Optional[str], List["WrapType"]]:
         """Get wraps as a dictionary mapping."""
+        self._record_dependency("wraps")
         return self._wraps
 
     def __attrs_post_init__(self) -> None:
@@ -157,75 +178,136 @@ class PipelineBuilderContext:
         if self.decision_type is None and self.recommendation_type is None:
             raise ValueError("Cannot instantiate builder context not specific to adviser nor dependency monkey")
 
+    @staticmethod
+    def get_unit_type(unit_class: Type["UnitType"]) -> str:
+        """Get type of the given pipeline unit as used in pipeline configuration (e.g. "boots")."""
+        if unit_class.is_boot_unit_type():
+            return "boots"
+        elif unit_class.is_pseudonym_unit_type():
+            return "pseudonyms"
+        elif unit_class.is_sieve_unit_type():
+            return "sieves"
+        elif unit_class.is_step_unit_type():
+            return "steps"
+        elif unit_class.is_stride_unit_type():
+            return "strides"
+        elif unit_class.is_wrap_unit_type():
+            return "wraps"
+
+        raise InternalError(f"Unknown unit {unit_class.get_unit_name()!r} of type {unit_class}")
+
+    def _record_dependency(self, unit_type: str, unit_name: Optional[str] = None) -> None:
+        """Record a read of the pipeline configuration, no unit name means any unit of the given type."""
+        if self._dependencies is not None:
+            self._dependencies.add((unit_type, unit_name))
+
+    @contextmanager
+    def track_dependencies(self) -> Generator[Set[Tuple[str, Optional[str]]], None, None]:
+        """Track parts of the pipeline configuration read, as (unit_type, unit_name), within the context."""
+        dependencies: Set[Tuple[str, Optional[str]]] = set()
+        self._dependencies = dependencies
+        try:
+            yield dependencies
+        finally:
+            self._dependencies = None
+
+    @property
+    def changes_count(self) -> int:
+        """Get number of units added to the pipeline configuration so far."""
+        return len(self._changes)
+
+    def get_changes(self, since: int = 0) -> List[Tuple[str, str]]:
+        """Get units added to the pipeline configuration as (unit_type, unit_name), optionally since the given count."""
+        return self._changes[since:]
+
     def is_included(self, unit_class: Type["UnitType"]) -> bool:
         """Check if the given pipeline unit is already included in the pipeline configuration."""
+        unit_name = unit_class.get_unit_name()
         if unit_class.is_boot_unit_type():
-            return unit_class.get_unit_name() in self._boots_included
+            self._record_dependency("boots", unit_name)
+            return unit_name in self._boots_included
         elif unit_class.is_pseudonym_unit_type():
-            return unit_class.get_unit_name() in self._pseudonyms_included
+            self._record_dependency("pseudonyms", unit_name)
+            return unit_name in self._pseudonyms_included
         elif unit_class.is_sieve_unit_type():
-            return unit_class.get_unit_name() in self._sieves_included
+            self._record_dependency("sieves", unit_name)
+            return unit_name in self._sieves_included
         elif unit_class.is_step_unit_type():
-            return unit_class.get_unit_name() in self._steps_included
+            self._record_dependency("steps", unit_name)
+            return unit_name in self._steps_included
         elif unit_class.is_stride_unit_type():
-            return unit_class.get_unit_name() in self._strides_included
+            self._record_dependency("strides", unit_name)
+            return unit_name in self._strides_included
         elif unit_class.is_wrap_unit_type():
-            return unit_class.get_unit_name() in self._wraps_included
+            self._record_dependency("wraps", unit_name)
+            return unit_name in self._wraps_included
 
-        raise InternalError(f"Unknown unit {unit_class.get_unit_name()!r} of type {unit_class}")
+        raise InternalError(f"Unknown unit {unit_name!r} of type {unit_class}")
 
     def get_included_boots(self, boot_class: Type["UnitType"]) -> Generator["BootType", None, None]:
         """Get included boots of the provided boot class."""
         assert boot_class.is_boot_unit_type()
+        self._record_dependency("boots", boot_class.get_unit_name())
         yield from self._boots_included.get(boot_class.get_unit_name(), [])
 
     def get_included_boot_names(self) -> Generator[str, None, None]:
         """Get names of included boots."""
+        self._record_dependency("boots")
         yield from self._boots_included.keys()
 
     def get_included_pseudonyms(self, pseudonym_class: Type["PseudonymType"]) -> Generator["PseudonymType", None, None]:
         """Get included sieves of the provided sieve class."""
         assert pseudonym_class.is_pseudonym_unit_type()
+        self._record_dependency("pseudonyms", pseudonym_class.get_unit_name())
         yield from self._pseudonyms_included.get(pseudonym_class.get_unit_name(), [])
 
     def get_included_pseudonym_names(self) -> Generator[str, None, None]:
         """Get names of included pseudonyms."""
+        self._record_dependency("pseudonyms")
         yield from self._pseudonyms_included.keys()
 
     def get_included_sieves(self, sieve_class: Type["SieveType"]) -> Generator["SieveType", None, None]:
         """Get included sieves of the provided sieve class."""
         assert sieve_class.is_sieve_unit_type()
+        self._record_dependency("sieves", sieve_class.get_unit_name())
         yield from self._sieves_included.get(sieve_class.get_unit_name(), [])
 
     def get_included_sieve_names(self) -> Generator[str, None, None]:
         """Get names of included sieves."""
+        self._record_dependency("sieves")
         yield from self._sieves_included.keys()
 
     def get_included_steps(self, step_class: Type["StepType"]) -> Generator["StepType", None, None]:
         """Get included steps of the provided step class."""
         assert step_class.is_step_unit_type()
+        self._record_dependency("steps", step_class.get_unit_name())
         yield from self._steps_included.get(step_class.get_unit_name(), [])
 
     def get_included_step_names(self) -> Generator[str, None, None]:
         """Get names of included steps."""
+        self._record_dependency("steps")
         yield from self._steps_included.keys()
 
     def get_included_strides(self, stride_class: Type["StrideType"]) -> Generator["StrideType", None, None]:
         """Get included strides of the provided stride class."""
         assert stride_class.is_stride_unit_type()
+        self._record_dependency("strides", stride_class.get_unit_name())
         yield from self._strides_included.get(stride_class.get_unit_name(), [])
 
     def get_included_stride_names(self) -> Generator[str, None, None]:
         """Get names of included strides."""
+        self._record_dependency("strides")
         yield from self._strides_included.keys()
 
     def get_included_wraps(self, wrap_class: Type["WrapType"]) -> Generator["WrapType", None, None]:
         """Get included wraps of the provided wrap class."""
         assert wrap_class.is_wrap_unit_type()
+        self._record_dependency("wraps", wrap_class.get_unit_name())
         yield from self._wraps_included.get(wrap_class.get_unit_name(), [])
 
     def get_included_wrap_names(self) -> Generator[str, None, None]:
         """Get names of included wraps."""
+        self._record_dependency("wraps")
         yield from self._wraps_included.keys()
 
     def is_adviser_pipeline(self) -> bool:
@@ -243,6 +325,7 @@ class PipelineBuilderContext:
         if unit.is_boot_unit_type():
             self._boots_included.setdefault(unit.name, []).append(unit)
             self._boots.setdefault(package_name, []).append(unit)
+            self._changes.append(("boots", unit.name))
             return
         elif unit.is_pseudonym_unit_type():
             if not package_name:
@@ -252,22 +335,27 @@ class PipelineBuilderContext:
                 )
             self._pseudonyms_included.setdefault(unit.name, []).append(unit)
             self._pseudonyms.setdefault(package_name, []).append(unit)
+            self._changes.append(("pseudonyms", unit.name))
             return
         elif unit.is_sieve_unit_type():
             self._sieves_included.setdefault(unit.name, []).append(unit)
             self._sieves.setdefault(package_name, []).append(unit)
+            self._changes.append(("sieves", unit.name))
             return
         elif unit.is_step_unit_type():
             self._steps_included.setdefault(unit.name, []).append(unit)
             self._steps.setdefault(package_name, []).append(unit)
+            self._changes.append(("steps", unit.name))
             return
         elif unit.is_stride_unit_type():
             self._strides_included.setdefault(unit.name, []).append(unit)
             self._strides.setdefault(package_name, []).append(unit)
+            self._changes.append(("strides", unit.name))
             return
         elif unit.is_wrap_unit_type():
             self._wraps_included.setdefault(unit.name, []).append(unit)
             self._wraps.setdefault(package_name, []).append(unit)
+            self._changes.append(("wraps", unit.name))
             return
 
         raise InternalError(f"Unknown unit {unit!r} of type {unit.name!r}")
@@ -283,8 +371,14 @@ class PipelineBuilder:
         raise NotImplementedError("Cannot instantiate pipeline builder")
 
     @staticmethod
-    def _iter_units(ctx: PipelineBuilderContext) -> Generator["UnitType", None, None]:
-        """Iterate over pipeline units available in this implementation."""
+    def _iter_units(
+        ctx: PipelineBuilderContext, candidates: Optional[Dict[str, List[str]]] = None
+    ) -> Generator[Type["UnitType"], None, None]:
+        """Iterate over pipeline units available in this implementation.
+
+        If candidates are given, only the named prescription units are considered, see
+        Prescription.get_inclusion_candidates.
+        """
         # Imports placed here to simplify tests.
         import thoth.adviser.boots
         import thoth.adviser.pseudonyms
@@ -296,32 +390,47 @@ class PipelineBuilder:
         for boot_name in thoth.adviser.boots.__all__:
             yield getattr(thoth.adviser.boots, boot_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_boot_units()
+            yield from ctx.prescription.iter_boot_units(candidates["boots"] if candidates else None)
 
         for pseudonym_name in thoth.adviser.pseudonyms.__all__:
             yield getattr(thoth.adviser.pseudonyms, pseudonym_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_pseudonym_units()
+            yield from ctx.prescription.iter_pseudonym_units(candidates["pseudonyms"] if candidates else None)
 
         for sieve_name in thoth.adviser.sieves.__all__:
             yield getattr(thoth.adviser.sieves, sieve_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_sieve_units()
+            yield from ctx.prescription.iter_sieve_units(candidates["sieves"] if candidates else None)
 
         for step_name in thoth.adviser.steps.__all__:
             yield getattr(thoth.adviser.steps, step_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_step_units()
+            yield from ctx.prescription.iter_step_units(candidates["steps"] if candidates else None)
 
         for stride_name in thoth.adviser.strides.__all__:
             yield getattr(thoth.adviser.strides, stride_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_stride_units()
+            yield from ctx.prescription.iter_stride_units(candidates["strides"] if candidates else None)
 
         for wrap_name in thoth.adviser.wraps.__all__:
             yield getattr(thoth.adviser.wraps, wrap_name)
         if ctx.prescription:
-            yield from ctx.prescription.iter_wrap_units()
+            yield from ctx.prescription.iter_wrap_units(candidates["wraps"] if candidates else None)
+
+    @staticmethod
+    def _should_evaluate(
+        ctx: PipelineBuilderContext, evaluation: Optional[Tuple[int, FrozenSet[Tuple[str, Optional[str]]]]]
+    ) -> bool:
+        """Check if a unit should be evaluated given its last evaluation - changes count and dependencies tracked."""
+        if evaluation is None:
+            return True
+
+        changes_count, dependencies = evaluation
+        for unit_type, unit_name in ctx.get_changes(changes_count):
+            if (unit_type, unit_name) in dependencies or (unit_type, None) in dependencies:
+                return True
+
+        return False
 
     @classmethod
     def _build_configuration(cls, ctx: PipelineBuilderContext) -> PipelineConfig:
@@ -336,13 +445,24 @@ class PipelineBuilder:
             else set()
         )
 
+        # Units are re-evaluated only if units they checked during their last evaluation were added since then.
+        # A unit that included itself is always re-evaluated in the next round.
+        evaluated: Dict[Tuple[str, str], Tuple[int, FrozenSet[Tuple[str, Optional[str]]]]] = {}
+        # Number of evaluations and time spent in should_include per unit.
+        profile: Dict[str, List[float]] = {}
+        evaluations = 0
+        start_time = time.monotonic()
+
         change = True
         ctx.iteration = -1
         try:
+            # Static parts of should_include of prescription units do not change during the construction,
+            # evaluate them once to limit the units checked in each round.
+            candidates = ctx.prescription.get_inclusion_candidates(ctx) if ctx.prescription else None
             while change:
                 change = False
                 ctx.iteration += 1
-                for unit_class in cls._iter_units(ctx):
+                for unit_class in cls._iter_units(ctx, candidates):
                     unit_name = unit_class.get_unit_name()
                     if unit_name in blocked_units:
                         _LOGGER.debug(
@@ -351,37 +471,66 @@ class PipelineBuilder:
                         )
                         continue
 
-                    for unit_configuration in unit_class.should_include(ctx):
-                        if unit_configuration is None:
+                    unit_key = (ctx.get_unit_type(unit_class), unit_name)
+                    if not cls._should_evaluate(ctx, evaluated.get(unit_key)):
+                        continue
+
+                    changes_count = ctx.changes_count
+                    unit_start_time = time.perf_counter()
+                    with ctx.track_dependencies() as dependencies:
+                        for unit_configuration in unit_class.should_include(ctx):
+                            if unit_configuration is None:
+                                _LOGGER.debug(
+                                    "Pipeline unit %r will not be included in the pipeline configuration "
+                                    "in this round",
+                                    unit_name,
+                                )
+                                continue
+
+                            change = True
+                            dependencies.add(unit_key)
+
                             _LOGGER.debug(
-                                "Pipeline unit %r will not be included in the pipeline configuration in this round",
+                                "Including pipeline unit %r in pipeline configuration with unit configuration %r",
                                 unit_name,
+                                unit_configuration,
                             )
-                            continue
-
-                        change = True
-
-                        _LOGGER.debug(
-                            "Including pipeline unit %r in pipeline configuration with unit configuration %r",
-                            unit_name,
-                            unit_configuration,
-                        )
-                        unit_instance = unit_class()  # type: ignore
-
-                        # Always perform update, even with an empty dict. Update triggers a schema check.
-                        try:
-                            unit_instance.update_configuration(unit_configuration)
-                        except Exception as exc:
-                            raise PipelineConfigurationError(
-                                f"Filed to initialize pipeline unit configuration for {unit_name!r} "
-                                f"with configuration {unit_configuration!r}: {str(exc)}"
-                            ) from exc
-
-                        ctx.add_unit(unit_instance)
+                            unit_instance = unit_class()
+
+                            # Always perform update, even with an empty dict. Update triggers a schema check.
+                            try:
+                                unit_instance.update_configuration(unit_configuration)
+                            except Exception as exc:
+                                raise PipelineConfigurationError(
+                                    f"Filed to initialize pipeline unit configuration for {unit_name!r} "
+                                    f"with configuration {unit_configuration!r}: {str(exc)}"
+                                ) from exc
+
+                            ctx.add_unit(unit_instance)
+
+                    evaluated[unit_key] = (changes_count, frozenset(dependencies))
+                    unit_profile = profile.setdefault(unit_name, [0, 0.0])
+                    unit_profile[0] += 1
+                    unit_profile[1] += time.perf_counter() - unit_start_time
+                    evaluations += 1
         finally:
             # Once the build pipeline is constructed or fails to construct, we can clear cached results.
             UnitPrescription.SHOULD_INCLUDE_CACHE.clear()
 
+        _LOGGER.info(
+            "Pipeline configuration created in %d rounds with %d unit evaluations in %.3f seconds",
+            ctx.iteration + 1,
+            evaluations,
+            time.monotonic() - start_time,
+        )
+        if _LOGGER.getEffectiveLevel() <= logging.DEBUG:
+            for unit_name, (unit_evaluations, duration) in sorted(
+                profile.items(), key=lambda item: item[1][1], reverse=True
+            ):
+                _LOGGER.debug(
+                    "Pipeline unit %r evaluated %d times in %.6f seconds", unit_name, unit_evaluations, duration
+                )
+
         pipeline = PipelineConfig(
             boots=ctx.boots_dict,
             pseudonyms=ctx.pseudonyms_dict,
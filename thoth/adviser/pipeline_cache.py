@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""An LRU cache of pipeline configurations for long-lived adviser workers.
+
+Pipeline units keep state during a resolver run, so pipeline configurations
+are not shared across runs. The cache keeps the units included - their
+classes, prescriptions and configuration - keyed by a fingerprint of inputs
+affecting the pipeline configuration creation. Units are instantiated for each
+run without asking units to be included again. The cache is bound to the graph
+database and prescriptions it is used with.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TYPE_CHECKING
+
+import attr
+from thoth.python import Project
+from thoth.storages.graph.postgres import GraphDatabase
+
+from .enums import DecisionType
+from .enums import RecommendationType
+from .pipeline_builder import PipelineBuilder
+from .pipeline_config import PipelineConfig
+from .prescription import UnitPrescription
+
+if TYPE_CHECKING:
+    from .prescription import Prescription  # noqa: F401
+    from .unit_types import UnitType  # noqa: F401
+
+_LOGGER = logging.getLogger(__name__)
+
+# Unit type, unit class, prescription of a prescription unit and unit configuration.
+_UnitEntry = Tuple[str, Type["UnitType"], Optional[Dict[str, Any]], Dict[str, Any]]
+
+
+@attr.s(slots=True)
+class PipelineCache:
+    """Keep pipeline configurations created, least recently used ones are evicted."""
+
+    DEFAULT_MAX_SIZE = 32
+
+    max_size = attr.ib(type=int, kw_only=True, default=DEFAULT_MAX_SIZE)
+    hits = attr.ib(type=int, default=0, init=False)
+    misses = attr.ib(type=int, default=0, init=False)
+
+    _entries = attr.ib(type="OrderedDict[str, List[_UnitEntry]]", factory=OrderedDict, init=False)
+
+    @max_size.validator
+    def _max_size_validator(self, _: Any, value: int) -> None:
+        """Validate size of the cache."""
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"Size of the pipeline cache should be a positive integer, got {value!r}")
+
+    def __len__(self) -> int:
+        """Get number of pipeline configurations cached."""
+        return len(self._entries)
+
+    @staticmethod
+    def compute_fingerprint(
+        *,
+        project: Project,
+        labels: Dict[str, str],
+        library_usage: Optional[Dict[str, Any]],
+        recommendation_type: Optional[RecommendationType] = None,
+        decision_type: Optional[DecisionType] = None,
+    ) -> str:
+        """Compute a fingerprint of inputs affecting the pipeline configuration creation."""
+        content = {
+            "project": project.to_dict(keep_thoth_section=True),
+            "labels": labels,
+            "library_usage": library_usage,
+            "recommendation_type": recommendation_type.name if recommendation_type is not None else None,
+            "decision_type": decision_type.name if decision_type is not None else None,
+            # Respected by units, see PipelineBuilderContext.authenticated.
+            "authenticated": os.getenv("THOTH_AUTHENTICATED_ADVISE"),
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _get_entries(pipeline: PipelineConfig) -> List[_UnitEntry]:
+        """Get units included in the given pipeline configuration in the order they were included."""
+        result = []
+        for unit_type in ("boots", "pseudonyms", "sieves", "steps", "strides", "wraps"):
+            for unit in getattr(pipeline, unit_type):
+                prescription = unit.prescription if isinstance(unit, UnitPrescription) else None
+                result.append((unit_type, unit.__class__, prescription, copy.deepcopy(unit.configuration)))
+
+        return result
+
+    @staticmethod
+    def _instantiate(entries: List[_UnitEntry]) -> PipelineConfig:
+        """Instantiate units and create a pipeline configuration out of them."""
+        units: Dict[str, Dict[Optional[str], List["UnitType"]]] = {}
+        for unit_type, unit_class, prescription, configuration in entries:
+            if prescription is not None:
+                unit_class.set_prescription(prescription)  # type: ignore
+
+            unit = unit_class()
+            unit.update_configuration(copy.deepcopy(configuration))
+            units.setdefault(unit_type, {}).setdefault(configuration.get("package_name"), []).append(unit)
+
+        return PipelineConfig(**units)  # type: ignore
+
+    def _get_pipeline_config(self, fingerprint: str) -> Optional[PipelineConfig]:
+        """Get pipeline configuration for the given fingerprint, if cached."""
+        entries = self._entries.get(fingerprint)
+        if entries is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(fingerprint)
+        return self._instantiate(entries)
+
+    def _set_pipeline_config(self, fingerprint: str, pipeline: PipelineConfig) -> None:
+        """Store the given pipeline configuration."""
+        self._entries[fingerprint] = self._get_entries(pipeline)
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            _LOGGER.debug("Evicted pipeline configuration %r from the pipeline cache", evicted)
+
+    def get_adviser_pipeline_config(
+        self,
+        *,
+        recommendation_type: RecommendationType,
+        graph: GraphDatabase,
+        project: Project,
+        labels: Dict[str, str],
+        library_usage: Optional[Dict[str, Any]],
+        prescription: Optional["Prescription"],
+        cli_parameters: Dict[str, Any],
+    ) -> PipelineConfig:
+        """Get pipeline configuration for adviser, see PipelineBuilder.get_adviser_pipeline_config."""
+        fingerprint = self.compute_fingerprint(
+            project=project, labels=labels, library_usage=library_usage, recommendation_type=recommendation_type
+        )
+        pipeline = self._get_pipeline_config(fingerprint)
+        if pipeline is not None:
+            _LOGGER.info("Using cached pipeline configuration %r", fingerprint)
+            return pipeline
+
+        pipeline = PipelineBuilder.get_adviser_pipeline_config(
+            recommendation_type=recommendation_type,
+            graph=graph,
+            project=project,
+            labels=labels,
+            library_usage=library_usage,
+            prescription=prescription,
+            cli_parameters=cli_parameters,
+        )
+        self._set_pipeline_config(fingerprint, pipeline)
+        return pipeline
+
+    def get_dependency_monkey_pipeline_config(
+        self,
+        *,
+        decision_type: DecisionType,
+        graph: GraphDatabase,
+        project: Project,
+        labels: Dict[str, str],
+        library_usage: Optional[Dict[str, Any]],
+        prescription: Optional["Prescription"],
+        cli_parameters: Dict[str, Any],
+    ) -> PipelineConfig:
+        """Get Dependency Monkey pipeline configuration, see PipelineBuilder.get_dependency_monkey_pipeline_config."""
+        fingerprint = self.compute_fingerprint(
+            project=project, labels=labels, library_usage=library_usage, decision_type=decision_type
+        )
+        pipeline = self._get_pipeline_config(fingerprint)
+        if pipeline is not None:
+            _LOGGER.info("Using cached pipeline configuration %r", fingerprint)
+            return pipeline
+
+        pipeline = PipelineBuilder.get_dependency_monkey_pipeline_config(
+            decision_type=decision_type,
+            graph=graph,
+            project=project,
+            labels=labels,
+            library_usage=library_usage,
+            prescription=prescription,
+            cli_parameters=cli_parameters,
+        )
+        self._set_pipeline_config(fingerprint, pipeline)
+        return pipeline
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Snapshots of policies learnt by predictors to warm-start subsequent resolver runs.
+
+Predictors learning from the reward signal (such as TemporalDifference or MCTS)
+accumulate a policy - rewards obtained by resolving package tuples. The policy
+is stored keyed by a fingerprint of the predictor and inputs affecting rewards
+(Pipfile, runtime environment, recommendation type and labels) so that a later
+resolution of the same project can exploit the policy learnt right away. The
+snapshot is persisted as a gzip compressed JSON file.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from typing import TYPE_CHECKING
+
+import attr
+
+from .exceptions import PolicySnapshotError
+
+if TYPE_CHECKING:
+    from .context import Context  # noqa: F401
+    from .predictor import Predictor  # noqa: F401
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+
+Policy = Dict[Tuple[str, str, str], List[Union[float, int]]]
+
+
+@attr.s(slots=True)
+class PolicySnapshot:
+    """Persist policies learnt by predictors across resolver runs."""
+
+    path = attr.ib(type=Optional[str], default=None, kw_only=True)
+
+    _entries = attr.ib(type=Dict[str, Policy], factory=dict, init=False)
+
+    @classmethod
+    def load(cls, path: str) -> "PolicySnapshot":
+        """Load policy snapshot from the given file, an empty snapshot is created if the file does not exist yet."""
+        instance = cls(path=path)
+        if not os.path.isfile(path):
+            _LOGGER.debug("Policy snapshot %r does not exist yet, starting with an empty snapshot", path)
+            return instance
+
+        try:
+            with gzip.open(path, "rt") as snapshot_file:
+                content = json.load(snapshot_file)
+        except Exception as exc:
+            raise PolicySnapshotError(f"Failed to load policy snapshot from {path!r}: {str(exc)}") from exc
+
+        if not isinstance(content, dict) or content.get("version") != _FORMAT_VERSION:
+            raise PolicySnapshotError(f"File {path!r} is not a policy snapshot in version {_FORMAT_VERSION}")
+
+        for fingerprint, records in content["entries"].items():
+            instance._entries[fingerprint] = {
+                (package_name, package_version, index_url): [reward, count]
+                for package_name, package_version, index_url, reward, count in records
+            }
+
+        _LOGGER.debug("Loaded policy snapshot %r with %d fingerprints", path, len(instance._entries))
+        return instance
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """Persist the policy snapshot to the given file, defaults to the file the snapshot was loaded from."""
+        path = path or self.path
+        if path is None:
+            raise PolicySnapshotError("No path to store the policy snapshot to provided")
+
+        content = {
+            "version": _FORMAT_VERSION,
+            "entries": {
+                fingerprint: [[*package_tuple, reward, count] for package_tuple, (reward, count) in policy.items()]
+                for fingerprint, policy in self._entries.items()
+            },
+        }
+        with gzip.open(path, "wt") as snapshot_file:
+            json.dump(content, snapshot_file, separators=(",", ":"))
+
+        _LOGGER.info("Policy snapshot with %d fingerprints written to %r", len(self._entries), path)
+
+    @staticmethod
+    def compute_fingerprint(predictor: "Predictor", context: "Context") -> str:
+        """Compute a fingerprint of the given predictor used in the given context."""
+        content: Dict[str, Any] = {
+            "predictor": f"{predictor.__class__.__module__}.{predictor.__class__.__qualname__}",
+            "recommendation_type": context.recommendation_type.name if context.recommendation_type else None,
+            "decision_type": context.decision_type.name if context.decision_type else None,
+            "runtime_environment": context.project.runtime_environment.to_dict(),
+            "labels": context.labels,
+            "pipfile": context.project.pipfile.to_dict(),
+        }
+        serialized = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Policy]:
+        """Get policy stored for the given fingerprint."""
+        policy = self._entries.get(fingerprint)
+        if policy is None:
+            return None
+
+        return {package_tuple: list(record) for package_tuple, record in policy.items()}
+
+    def set(self, fingerprint: str, policy: Policy) -> None:
+        """Store policy for the given fingerprint, any policy previously stored is replaced."""
+        self._entries[fingerprint] = {package_tuple: list(record) for package_tuple, record in policy.items()}
@@ -23,9 +23,12 @@ from contextlib import contextmanager
 
 import attr
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Tuple
 from typing import Optional
 from typing import Generator
+from typing import Union
 from typing import TYPE_CHECKING
 
 from .context import Context
@@ -46,6 +49,10 @@ class Predictor:
 
     keep_history = attr.ib(type=bool, kw_only=True, default=None, converter=should_keep_history)
 
+    # The predictor picks multiple states in run_batch. Predictors learning from the reward signal of each
+    # expansion (or relying on the state expanded last) expand one state per iteration regardless of the batch size.
+    BATCHED = False
+
     _CONTEXT: Optional[Context] = None
 
     @classmethod
@@ -84,6 +91,15 @@ class Predictor:
         """Run the main method used to run the predictor."""
         raise NotImplementedError
 
+    def run_batch(self, k: int) -> List[Tuple[State, Tuple[str, str, str]]]:
+        """Pick up to k states and their unresolved dependencies to be expanded together in one resolver iteration.
+
+        Each returned pair should refer to a distinct state. The resolver calls this method only for predictors with
+        BATCHED set, the default implementation returns a single pair as predictors learning from reward signals
+        expect a reward for each pick before making the next one.
+        """
+        return [self.run()]
+
     def post_run(self) -> None:
         """Post-run method run after the resolving has been done."""
         # noop
@@ -116,6 +132,21 @@ class Predictor:
         """
         # noop
 
+    def get_policy(self) -> Optional[Dict[Tuple[str, str, str], List[Union[float, int]]]]:
+        """Get policy learnt during the resolution to warm-start a subsequent resolution, if any.
+
+        The policy maps package tuples to the sum of rewards obtained and the number of rewards recorded.
+        The default implementation does not learn any policy.
+        """
+        return None
+
+    def set_policy(self, policy: Dict[Tuple[str, str, str], List[Union[float, int]]]) -> None:
+        """Restore policy learnt in a previous resolution, called after pre_run.
+
+        The default implementation ignores the policy.
+        """
+        # noop
+
     def plot(self) -> "matplotlib.figure.Figure":
         """Plot information about predictor."""
         _LOGGER.error(
@@ -17,7 +17,9 @@
 
 """Implementation of hill climbing in the state space."""
 
+import heapq
 import logging
+import operator
 
 import attr
 from typing import List
@@ -39,6 +41,8 @@ _LOGGER = logging.getLogger(__name__)
 class HillClimbing(Predictor):
     """Implementation of hill climbing in the state space."""
 
+    BATCHED = True
+
     _history = attr.ib(type=List[Tuple[float, int]], default=attr.Factory(list), init=False)
 
     def run(self) -> Tuple[State, Tuple[str, str, str]]:
@@ -50,6 +54,18 @@ class HillClimbing(Predictor):
 
         return state, state.get_first_unresolved_dependency()
 
+    def run_batch(self, k: int) -> List[Tuple[State, Tuple[str, str, str]]]:
+        """Get top k states from the beam for the next resolution round."""
+        if k == 1:
+            return [self.run()]
+
+        states = heapq.nlargest(k, self.context.beam.iter_states(), key=operator.attrgetter("score"))
+
+        if self.keep_history:
+            self._history.extend((state.score, self.context.accepted_final_states_count) for state in states)
+
+        return [(state, state.get_first_unresolved_dependency()) for state in states]
+
     def pre_run(self) -> None:
         """Initialize before the actual hill climbing run."""
         self._history = []
@@ -45,6 +45,8 @@ class ApproximatingLatest(HillClimbing):
     if resolution to all latest cannot be satisfied.
     """
 
+    BATCHED = False
+
     prioritized_packages = attr.ib(type=List[str], default=attr.Factory(list), kw_only=True)
     _hop = attr.ib(type=bool, default=False, init=False)
     _hop_logged = attr.ib(type=bool, default=False, init=False)
@@ -148,3 +150,7 @@ class ApproximatingLatest(HillClimbing):
                 return state, state.get_first_unresolved_dependency(prioritized_package)
 
         return state, state.get_first_unresolved_dependency()
+
+    def run_batch(self, k: int) -> List[Tuple[State, Tuple[str, str, str]]]:
+        """Expand one state per iteration regardless of the batch size, heat-up and hops rely on the last state."""
+        return [self.run()]
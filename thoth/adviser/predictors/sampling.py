@@ -18,6 +18,7 @@
 """Implementation of a random sampling of the state space."""
 
 import logging
+import random
 
 import attr
 from typing import List
@@ -39,6 +40,8 @@ _LOGGER = logging.getLogger(__name__)
 class Sampling(Predictor):
     """Implementation of a random sampling of the state space."""
 
+    BATCHED = True
+
     _history = attr.ib(type=List[Tuple[float, int]], default=attr.Factory(list), init=False)
 
     def run(self) -> Tuple[State, Tuple[str, str, str]]:
@@ -50,6 +53,16 @@ class Sampling(Predictor):
 
         return state, state.get_random_unresolved_dependency(prefer_recent=False)
 
+    def run_batch(self, k: int) -> List[Tuple[State, Tuple[str, str, str]]]:
+        """Get k distinct random states and their random unresolved dependencies for the next resolution round."""
+        beam = self.context.beam
+        states = [beam.get(idx) for idx in random.sample(range(beam.size), min(k, beam.size))]
+
+        if self.keep_history:
+            self._history.extend((state.score, self.context.accepted_final_states_count) for state in states)
+
+        return [(state, state.get_random_unresolved_dependency(prefer_recent=False)) for state in states]
+
     def pre_run(self) -> None:
         """Initialize before the sampling run."""
         self._history = []
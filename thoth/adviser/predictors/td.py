@@ -91,6 +91,14 @@ class TemporalDifference(AdaptiveSimulatedAnnealing):
         self._old_handler = None
         _INSTANCE = None
 
+    def get_policy(self) -> Optional[Dict[Tuple[str, str, str], List[Union[float, int]]]]:
+        """Get policy learnt during the resolution."""
+        return self._policy
+
+    def set_policy(self, policy: Dict[Tuple[str, str, str], List[Union[float, int]]]) -> None:
+        """Restore policy learnt in a previous resolution so that exploitation is guided from the first iteration."""
+        self._policy.update(policy)
+
     def set_reward_signal(self, state: State, package_tuple: Tuple[str, str, str], reward: float) -> None:
         """Note down reward signal of the last action performed."""
         trajectory_end = math.isnan(reward) or math.isinf(reward)
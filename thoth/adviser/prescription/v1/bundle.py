@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Compiled prescription bundles loaded lazily from a memory-mapped file.
+
+A bundle stores prescription units that were already validated, so neither YAML
+parsing nor schema validation is done when the bundle is loaded. The bundle file
+is made out of a header, JSON encoded units and a JSON encoded index stored at
+the end of the file. The index maps unit type and unit name to the position of
+the unit in the file together with the key of its should_include part that does
+not change during pipeline construction (see
+UnitPrescription.get_should_include_key). Units are decoded only once they are
+accessed.
+"""
+
+import json
+import logging
+import mmap
+import struct
+from collections.abc import Mapping
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+import attr
+
+from ...exceptions import PrescriptionBundleError
+from .unit import UnitPrescription
+
+if TYPE_CHECKING:
+    from .prescription import Prescription  # noqa: F401
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"THOTHPB"
+_FORMAT_VERSION = 2
+# Magic, format version and offset of the index.
+_HEADER = struct.Struct("<7sBQ")
+UNIT_TYPES = ("boots", "pseudonyms", "sieves", "steps", "strides", "wraps")
+
+
+@attr.s(slots=True, repr=False, eq=False)
+class LazyUnits(Mapping):  # type: ignore
+    """A read-only mapping of unit names to prescriptions of units, units are decoded on access."""
+
+    _mmap = attr.ib(type=mmap.mmap)
+    _index = attr.ib(type=Dict[str, Tuple[int, int, Optional[str]]])
+    _units = attr.ib(type=Dict[str, Dict[str, Any]], factory=dict, init=False)
+
+    def __getitem__(self, unit_name: str) -> Dict[str, Any]:
+        """Get prescription of the given unit, decode it if it was not accessed yet."""
+        unit = self._units.get(unit_name)
+        if unit is None:
+            offset, length, _ = self._index[unit_name]
+            unit = json.loads(self._mmap[offset : offset + length])
+            self._units[unit_name] = unit
+
+        return unit
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over unit names in the order the units were stored."""
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        """Get number of units stored."""
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        """Do not decode units when representing the mapping."""
+        return f"{self.__class__.__name__}({list(self._index)!r})"
+
+    @property
+    def decoded_count(self) -> int:
+        """Get number of units decoded so far."""
+        return len(self._units)
+
+    def get_should_include_key(self, unit_name: str) -> Optional[str]:
+        """Get key of the static should_include part of the given unit without decoding the unit."""
+        return self._index[unit_name][2]
+
+
+def dump_bundle(prescription: "Prescription", path: str) -> None:
+    """Compile the given prescription into a bundle stored in the given file."""
+    units_index: Dict[str, List[Any]] = {}
+    with open(path, "wb") as bundle_file:
+        bundle_file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, 0))
+        for unit_type in UNIT_TYPES:
+            entries = units_index[unit_type] = []
+            for unit_name, unit in getattr(prescription, f"{unit_type}_dict").items():
+                serialized = json.dumps(unit, separators=(",", ":")).encode()
+                entries.append(
+                    [
+                        unit_name,
+                        bundle_file.tell(),
+                        len(serialized),
+                        UnitPrescription.get_should_include_key(unit),
+                    ]
+                )
+                bundle_file.write(serialized)
+
+        index_offset = bundle_file.tell()
+        bundle_file.write(json.dumps({"prescriptions": prescription.prescriptions, "units": units_index}).encode())
+        bundle_file.seek(0)
+        bundle_file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, index_offset))
+
+    _LOGGER.info("Prescription bundle with %d units written to %r", sum(len(e) for e in units_index.values()), path)
+
+
+def load_bundle(path: str) -> Tuple[List[Tuple[str, str]], Dict[str, LazyUnits]]:
+    """Load the given bundle, return prescription names with releases and lazily decoded units by their type."""
+    with open(path, "rb") as bundle_file:
+        try:
+            bundle_mmap = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise PrescriptionBundleError(f"File {path!r} is not a prescription bundle: {str(exc)}") from exc
+
+    try:
+        magic, version, index_offset = _HEADER.unpack_from(bundle_mmap, 0)
+    except struct.error as exc:
+        raise PrescriptionBundleError(f"File {path!r} is not a prescription bundle: {str(exc)}") from exc
+
+    if magic != _MAGIC or version != _FORMAT_VERSION or index_offset == 0:
+        raise PrescriptionBundleError(f"File {path!r} is not a prescription bundle in version {_FORMAT_VERSION}")
+
+    try:
+        content = json.loads(bundle_mmap[index_offset:])
+        units = {
+            unit_type: LazyUnits(
+                bundle_mmap,
+                {
+                    unit_name: (offset, length, should_include_key)
+                    for unit_name, offset, length, should_include_key in content["units"].get(unit_type, [])
+                },
+            )
+            for unit_type in UNIT_TYPES
+        }
+    except (ValueError, TypeError, KeyError) as exc:
+        raise PrescriptionBundleError(f"Index of prescription bundle {path!r} is malformed: {str(exc)}") from exc
+
+    _LOGGER.debug("Loaded prescription bundle %r with %d units", path, sum(len(u) for u in units.values()))
+    return [tuple(p) for p in content["prescriptions"]], units  # type: ignore
@@ -27,6 +27,7 @@ from collections import OrderedDict, defaultdict
 from collections import deque
 from typing import Any
 from typing import List
+from typing import Mapping
 from typing import Tuple
 from typing import Dict
 from typing import Generator
@@ -43,6 +44,10 @@ from ...exceptions import InternalError
 from ...exceptions import PrescriptionSchemaError
 from .add_package_step import AddPackageStepPrescription
 from .boot import BootPrescription
+from .bundle import LazyUnits
+from .bundle import UNIT_TYPES
+from .bundle import dump_bundle
+from .bundle import load_bundle
 from .gh_release_notes import GHReleaseNotesWrapPrescription
 from .group import GroupStepPrescription
 from .pseudonym import PseudonymPrescription
@@ -52,9 +57,11 @@ from .skip_package_sieve import SkipPackageSievePrescription
 from .skip_package_step import SkipPackageStepPrescription
 from .step import StepPrescription
 from .stride import StridePrescription
+from .unit import UnitPrescription
 from .wrap import WrapPrescription
 
 if TYPE_CHECKING:
+    from thoth.adviser.pipeline_builder import PipelineBuilderContext  # noqa: F401
     from thoth.adviser.unit_types import UnitType  # noqa: F401
     from thoth.adviser.unit_types import BootType  # noqa: F401
     from thoth.adviser.unit_types import PseudonymType  # noqa: F401
@@ -78,12 +85,14 @@ class Prescription:
 
     prescriptions = attr.ib(type=List[Tuple[str, str]], kw_only=True, default=attr.Factory(list))
 
-    boots_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
-    pseudonyms_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
-    sieves_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
-    steps_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
-    strides_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
-    wraps_dict = attr.ib(type=Dict[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    boots_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    pseudonyms_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    sieves_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    steps_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    strides_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+    wraps_dict = attr.ib(type=Mapping[str, Dict[str, Any]], kw_only=True, default=attr.Factory(OrderedDict))
+
+    _should_include_keys = attr.ib(type=Dict[str, Dict[str, Optional[str]]], factory=dict, init=False)
 
     @property
     def units(self) -> Generator[Dict[str, Any], None, None]:
@@ -204,6 +213,18 @@ class Prescription:
                                 raise
                             else:
                                 _LOGGER.error("%s is invalid:\n%s", prescription, str(e))
+                elif prescription.endswith(".bundle"):
+                    _LOGGER.debug("Loading compiled prescriptions from %r", prescription)
+                    prescriptions_loaded, units = load_bundle(prescription)
+                    prescription_instance = cls(
+                        prescriptions=prescriptions_loaded,
+                        **{f"{unit_type}_dict": unit_dict for unit_type, unit_dict in units.items()},
+                    )
+
+                    for prescription_info in prescription_instance.prescriptions:
+                        _LOGGER.info(
+                            "Loaded prescriptions %r in version %r", prescription_info[0], prescription_info[1]
+                        )
                 elif prescription.endswith(".pickle"):
                     _LOGGER.debug("Loading prescriptions from %r", prescription)
                     with open(prescription, "rb") as fp:
@@ -214,7 +235,7 @@ class Prescription:
                             "Loaded prescriptions %r in version %r", prescription_info[0], prescription_info[1]
                         )
                 else:
-                    _LOGGER.debug("Skipping file %r: not a YAML nor Pickle file", prescription)
+                    _LOGGER.debug("Skipping file %r: not a YAML, Pickle nor bundle file", prescription)
                     continue
 
             elif os.path.isdir(prescription):
@@ -259,25 +280,80 @@ class Prescription:
 
         return prescription_instance
 
+    def dump_bundle(self, path: str) -> None:
+        """Compile prescriptions into a bundle which is loaded lazily, see Prescription.load."""
+        dump_bundle(self, path)
+
+    def _get_should_include_key(self, unit_type: str, unit_name: str) -> Optional[str]:
+        """Get key of the static should_include part of the given unit, see UnitPrescription.get_should_include_key."""
+        units = getattr(self, f"{unit_type}_dict")
+        if isinstance(units, LazyUnits):
+            # Stored in the bundle, no need to decode the unit.
+            return units.get_should_include_key(unit_name)
+
+        keys = self._should_include_keys.setdefault(unit_type, {})
+        if unit_name not in keys:
+            keys[unit_name] = UnitPrescription.get_should_include_key(units[unit_name])
+
+        return keys[unit_name]
+
+    def get_inclusion_candidates(self, builder_context: "PipelineBuilderContext") -> Dict[str, List[str]]:
+        """Get names of units, by unit type, that can be included in the pipeline built in the given context.
+
+        Units are grouped by the part of should_include that does not change during pipeline construction and
+        each group is checked once using its first unit. Only units of groups passing the check can be included
+        once their dependencies are satisfied. Names are listed in the order in which units were loaded.
+        """
+        result: Dict[str, List[str]] = {}
+        for unit_type in UNIT_TYPES:
+            units = getattr(self, f"{unit_type}_dict")
+            groups: Dict[Optional[str], bool] = {}
+            candidates = result[unit_type] = []
+            for unit_name in units:
+                key = self._get_should_include_key(unit_type, unit_name)
+                included = groups.get(key)
+                if included is None:
+                    included = groups[key] = UnitPrescription.should_include_static(builder_context, units[unit_name])
+
+                if included:
+                    candidates.append(unit_name)
+
+        return result
+
     @staticmethod
-    def _iter_units(unit_class: Type["UnitType"], units: Dict[str, Any]) -> Generator[Type["UnitType"], None, None]:
+    def _iter_prescriptions(
+        units: Mapping[str, Dict[str, Any]], unit_names: Optional[Iterable[str]]
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Iterate over prescriptions of the given units, all units are considered if no names are given."""
+        if unit_names is None:
+            yield from units.values()
+            return
+
+        for unit_name in unit_names:
+            yield units[unit_name]
+
+    def _iter_units(
+        self, unit_class: Type["UnitType"], units: Mapping[str, Any], unit_names: Optional[Iterable[str]]
+    ) -> Generator[Type["UnitType"], None, None]:
         """Iterate over units registered."""
-        for prescription in units.values():
+        for prescription in self._iter_prescriptions(units, unit_names):
             unit_class.set_prescription(prescription)
 
             yield unit_class
 
-    def iter_boot_units(self) -> Generator[Type["BootType"], None, None]:
+    def iter_boot_units(self, unit_names: Optional[Iterable[str]] = None) -> Generator[Type["BootType"], None, None]:
         """Iterate over prescription boot units registered in the prescription supplied."""
-        return self._iter_units(BootPrescription, self.boots_dict)
+        return self._iter_units(BootPrescription, self.boots_dict, unit_names)
 
-    def iter_pseudonym_units(self) -> Generator[Type["PseudonymType"], None, None]:
+    def iter_pseudonym_units(
+        self, unit_names: Optional[Iterable[str]] = None
+    ) -> Generator[Type["PseudonymType"], None, None]:
         """Iterate over prescription pseudonym units registered in the prescription supplied."""
-        return self._iter_units(PseudonymPrescription, self.pseudonyms_dict)
+        return self._iter_units(PseudonymPrescription, self.pseudonyms_dict, unit_names)
 
-    def iter_sieve_units(self) -> Generator[Type["SieveType"], None, None]:
+    def iter_sieve_units(self, unit_names: Optional[Iterable[str]] = None) -> Generator[Type["SieveType"], None, None]:
         """Iterate over prescription sieve units registered in the prescription supplied."""
-        for prescription in self.sieves_dict.values():
+        for prescription in self._iter_prescriptions(self.sieves_dict, unit_names):
             if prescription["type"] == "sieve":
                 SievePrescription.set_prescription(prescription)
                 yield SievePrescription
@@ -287,9 +363,9 @@ class Prescription:
             else:
                 raise ValueError(f"Unknown sieve pipeline unit type: {prescription['type']!r}")
 
-    def iter_step_units(self) -> Generator[Type["StepType"], None, None]:
+    def iter_step_units(self, unit_names: Optional[Iterable[str]] = None) -> Generator[Type["StepType"], None, None]:
         """Iterate over prescription step units registered in the prescription supplied."""
-        for prescription in self.steps_dict.values():
+        for prescription in self._iter_prescriptions(self.steps_dict, unit_names):
             if prescription["type"] == "step":
                 StepPrescription.set_prescription(prescription)
                 yield StepPrescription
@@ -305,13 +381,15 @@ class Prescription:
             else:
                 raise ValueError(f"Unknown step pipeline unit type: {prescription['type']!r}")
 
-    def iter_stride_units(self) -> Generator[Type["StrideType"], None, None]:
+    def iter_stride_units(
+        self, unit_names: Optional[Iterable[str]] = None
+    ) -> Generator[Type["StrideType"], None, None]:
         """Iterate over prescription stride units registered in the prescription supplied."""
-        return self._iter_units(StridePrescription, self.strides_dict)
+        return self._iter_units(StridePrescription, self.strides_dict, unit_names)
 
-    def iter_wrap_units(self) -> Generator[Type["WrapType"], None, None]:
+    def iter_wrap_units(self, unit_names: Optional[Iterable[str]] = None) -> Generator[Type["WrapType"], None, None]:
         """Iterate over prescription stride units registered in the prescription supplied."""
-        for prescription in self.wraps_dict.values():
+        for prescription in self._iter_prescriptions(self.wraps_dict, unit_names):
             if prescription["type"] == "wrap":
                 WrapPrescription.set_prescription(prescription)
                 yield WrapPrescription
@@ -74,6 +74,14 @@ class StepPrescription(UnitPrescription):
         """Check if this unit is of type step."""
         return True
 
+    def get_score_max(self) -> float:
+        """Get the highest score this step can add to a state when resolving a package, used to bound scores."""
+        score = self.run_prescription.get("score")
+        if score is None:
+            return 0.0
+
+        return float(min(score, self.SCORE_MAX))
+
     @staticmethod
     def _yield_should_include(unit_prescription: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
         """Yield for every entry stated in the match field."""
@@ -18,6 +18,7 @@
 """A base class for prescription based pipeline units."""
 
 import abc
+import json
 import logging
 import re
 from typing import Any
@@ -263,6 +264,31 @@ class UnitPrescription(Unit, metaclass=abc.ABCMeta):
 
             return Version(version_present) in SpecifierSet(version_spec_declared)
 
+    @staticmethod
+    def get_should_include_key(prescription: Dict[str, Any]) -> Optional[str]:
+        """Get a key of the part of should_include that does not change during pipeline construction.
+
+        Units sharing the key are included or excluded together regardless of units included so far. None is returned
+        for units that do not state any should_include.
+        """
+        should_include_dict = prescription.get("should_include")
+        if should_include_dict is None:
+            return None
+
+        return json.dumps({k: v for k, v in should_include_dict.items() if k != "dependencies"}, sort_keys=True)
+
+    @classmethod
+    def should_include_static(cls, builder_context: "PipelineBuilderContext", prescription: Dict[str, Any]) -> bool:
+        """Check the part of should_include that does not change during pipeline construction."""
+        should_include_dict = prescription.get("should_include")
+        if should_include_dict is None:
+            return True
+
+        if should_include_dict.get("times", 1) == 0:
+            return False
+
+        return cls._should_include_base_cached(prescription["name"], builder_context, should_include_dict)
+
     @classmethod
     def _should_include_base(cls, builder_context: "PipelineBuilderContext") -> bool:
         """Determine if this unit should be included."""
@@ -964,11 +990,11 @@ class UnitPrescription(Unit, metaclass=abc.ABCMeta):
         """Check if the given package version tuple matches with what was written in prescription."""
         develop = dependency.get("develop")
         if develop is not None:
-            package_version = self.context.get_package_version(dependency_tuple, graceful=True)
-            if not package_version:
+            package_record = self.context.get_package_record(dependency_tuple, graceful=True)
+            if not package_record:
                 return False
 
-            if package_version.develop != develop:
+            if package_record.develop != develop:
                 return False
 
         if not self._index_url_check(dependency.get("index_url"), dependency_tuple[2]):
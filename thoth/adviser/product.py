@@ -68,6 +68,10 @@ class Product:
         """Instantiate advised stack from final state produced by adviser's pipeline."""
         assert state.is_final(), "Instantiating product from a non-final state"
 
+        if context.graph_io is not None:
+            # Query data concurrently, a noop if data were already retrieved for all the products constructed.
+            context.prefetch_product_data([state])
+
         package_versions_locked = []
         for package_tuple in state.resolved_dependencies.values():
             package_version: PackageVersion = context.get_package_version(package_tuple, graceful=False)
@@ -76,7 +80,7 @@ class Product:
             if not package_version.hashes:
                 # We can re-use already existing package-version - in that case it already keeps hashes from
                 # a previous product instantiation.
-                hashes = context.graph.get_python_package_hashes_sha256(*package_tuple)
+                hashes = context.get_python_package_hashes_sha256(package_tuple)
                 package_version.hashes = ["sha256:" + h for h in hashes]
 
                 if not package_version.hashes:
@@ -107,15 +111,7 @@ class Product:
                     #   "numpy (>=1.21.0) ; python_version >= "3.10"
                     # We pick the first matching, which is fine.
                     try:
-                        marker = context.graph.get_python_environment_marker(
-                            *dependent_tuple[0],
-                            dependency_name=package_tuple[0],
-                            dependency_version=package_tuple[1],
-                            os_name=dependent_tuple[1],
-                            os_version=dependent_tuple[2],
-                            python_version=dependent_tuple[3],
-                            marker_evaluation_result=True,
-                        )
+                        marker = context.get_python_environment_marker(dependent_tuple, package_tuple)
                     except NotFoundError:
                         # This can happen if we do resolution that is agnostic to runtime
                         # environment. In that case a dependency introduced in one runtime
@@ -18,10 +18,14 @@
 """The main resolving algorithm working on top of states."""
 
 import gc
+import multiprocessing
 import os
+import queue
+import random
 import time
 import math
 from typing import Generator
+from typing import FrozenSet
 from typing import Dict
 from typing import Tuple
 from typing import Any
@@ -30,6 +34,7 @@ from typing import List
 from typing import Union
 from typing import Set
 from typing import Iterator
+from typing import Type
 from typing import TYPE_CHECKING
 import resource
 import logging
@@ -40,6 +45,8 @@ import weakref
 import heapq
 
 import attr
+import termial_random
+from thoth.common import RuntimeEnvironment
 from thoth.common import get_justification_link as jl
 from thoth.python import PackageVersion
 from thoth.python import Project
@@ -62,12 +69,19 @@ from .exceptions import StrideError
 from .exceptions import UnresolvedDependencies
 from .exceptions import WrapError
 from .exceptions import PipelineConfigurationError
+from .exceptions import ResolverWorkerError
+from .graph_io import AsyncGraph
 from .exceptions import UserLockFileError
 from .pipeline_builder import PipelineBuilder
+from .pipeline_cache import PipelineCache
 from .pipeline_config import PipelineConfig
+from .policy_snapshot import PolicySnapshot
 from .predictor import Predictor
 from .product import Product
 from .report import Report
+from .sieve import Sieve
+from .sieve_cache import SKIP_PACKAGE
+from .sieve_cache import SieveCache
 from .solver import PythonPackageGraphSolver
 from .state import State
 from .unit import Unit
@@ -158,6 +172,9 @@ class Resolver:
     _MEM_OPTIMIZER_ITERATION = int(os.getenv("THOTH_ADVISER_MEM_OPTIMIZER_ITERATION", 1000))
     _MEM_OPTIMIZER_LIMIT = int(os.getenv("THOTH_ADVISER_MEM_OPTIMIZER_LIMIT", 0))
     _MEM_OPTIMIZER_DROP_COUNT = int(os.getenv("THOTH_ADVISER_MEM_OPTIMIZER_DROP_COUNT", 50))
+    _WORKER_POLL_TIMEOUT = 1.0
+    # Time in seconds workers are given to report policy learnt once asked to stop.
+    _WORKER_STOP_TIMEOUT = 10.0
 
     pipeline = attr.ib(type=PipelineConfig, kw_only=True)
     project = attr.ib(type=Project, kw_only=True)
@@ -186,11 +203,21 @@ class Resolver:
     cli_parameters = attr.ib(type=Dict[str, Any], default=attr.Factory(dict), kw_only=True)
     stop_resolving = attr.ib(type=bool, default=False, kw_only=True)
     log_iteration = attr.ib(type=int, kw_only=True, default=int(os.getenv("THOTH_ADVISER_LOG_ITERATION", 7500)))
+    sieve_cache = attr.ib(type=Optional[SieveCache], kw_only=True, default=None)
+    policy_snapshot = attr.ib(type=Optional[PolicySnapshot], kw_only=True, default=None)
+    workers = attr.ib(type=int, kw_only=True, default=1)
+    batch_size = attr.ib(type=int, kw_only=True, default=1)
+    graph_io_workers = attr.ib(type=int, kw_only=True, default=0)
+    prune_states = attr.ib(type=bool, kw_only=True, default=bool(int(os.getenv("THOTH_ADVISER_PRUNE_STATES", 0))))
+    deduplicate_states = attr.ib(
+        type=bool, kw_only=True, default=bool(int(os.getenv("THOTH_ADVISER_DEDUPLICATE_STATES", 0)))
+    )
 
     _beam = attr.ib(type=Optional[Beam], kw_only=True, default=None)
     _solver = attr.ib(type=Optional[PythonPackageGraphSolver], kw_only=True, default=None)
     _context = attr.ib(type=Optional[Context], default=None, kw_only=True)
     _history = attr.ib(type=List[Optional[float]], factory=list, init=False)
+    _policy_fingerprint = attr.ib(type=Optional[str], default=None, init=False)
     _history_max = attr.ib(type=List[Optional[float]], factory=list, init=False)
 
     _log_unresolved = attr.ib(type=Set[Tuple[str, str, str]], default=attr.Factory(set), kw_only=True)
@@ -199,9 +226,17 @@ class Resolver:
     _log_step_skip_package = attr.ib(type=Set[Tuple[str, str, str]], default=attr.Factory(set), kw_only=True)
     _log_step_not_acceptable = attr.ib(type=Set[Tuple[str, str, str]], default=attr.Factory(set), kw_only=True)
     _log_no_intersected = attr.ib(type=Set[Tuple[Tuple[str, str, str], str]], default=attr.Factory(set), kw_only=True)
+    # Fingerprints of sieve chains for package names, None if results of the chain cannot be cached.
+    _sieve_fingerprints = attr.ib(type=Dict[int, str], default=attr.Factory(dict), kw_only=True)
+    # Highest scores package specific steps can add, None if states are not pruned in the current run.
+    _step_score_max = attr.ib(type=Optional[Dict[str, float]], default=None, init=False)
+    _step_score_max_total = attr.ib(type=float, default=0.0, init=False)
+    _pruned_states_count = attr.ib(type=int, default=0, init=False)
 
     @limit.validator
     @count.validator
+    @workers.validator
+    @batch_size.validator
     def _positive_int_validator(self, attribute: str, value: int) -> None:
         """Validate the given attribute - the given attribute should have a value of a positive integer."""
         if not isinstance(value, int):
@@ -232,7 +267,9 @@ class Resolver:
     def beam(self) -> Beam:
         """Get beam for storing states."""
         if not self._beam:
-            self._beam = Beam(self.beam_width, keep_history=self.predictor.keep_history)
+            self._beam = Beam(
+                self.beam_width, keep_history=self.predictor.keep_history, deduplicate=self.deduplicate_states
+            )
 
         return self._beam
 
@@ -271,7 +308,18 @@ class Resolver:
             decision_type=self.decision_type,
             prescription=self.prescription,
             cli_parameters=self.cli_parameters,
+            graph_io=AsyncGraph(graph=self.graph, max_workers=self.graph_io_workers) if self.graph_io_workers else None,
         )
+        self._sieve_fingerprints.clear()
+
+    @contextlib.contextmanager
+    def _graph_io_scope(self) -> Generator[None, None, None]:
+        """Release resources used to query the graph database concurrently once the resolution is done."""
+        try:
+            yield
+        finally:
+            if self.context.graph_io is not None:
+                self.context.graph_io.close()
 
     def _run_boots(self, *, with_devel: bool = True) -> None:
         """Run all boots bound to the current run context."""
@@ -294,6 +342,15 @@ class Resolver:
         self, package_versions: List[PackageVersion], *, log_level: int = logging.DEBUG
     ) -> Generator[PackageVersion, None, None]:
         """Run sieves on each package tuple."""
+        if self.sieve_cache is not None and package_versions:
+            yield from self._run_sieves_cached(package_versions, log_level=log_level)
+        else:
+            yield from self._run_sieves_uncached(package_versions, log_level=log_level)
+
+    def _run_sieves_uncached(
+        self, package_versions: List[PackageVersion], *, log_level: int = logging.DEBUG
+    ) -> Generator[PackageVersion, None, None]:
+        """Run the sieve chain on each package tuple."""
         result = (pv for pv in package_versions)
         if package_versions:
             for sieve in chain(
@@ -323,6 +380,139 @@ class Resolver:
 
         yield from result
 
+    def _run_sieve(
+        self, sieve: Sieve, package_versions: List[PackageVersion], *, log_level: int = logging.DEBUG
+    ) -> List[PackageVersion]:
+        """Run the given sieve on package versions, an empty list is returned if the sieve rejects all of them."""
+        _LOGGER.debug("Running sieve %r", sieve.name)
+        sieve.unit_run = True
+        try:
+            return list(sieve.run(pv for pv in package_versions))
+        except SkipPackage:
+            raise
+        except NotAcceptable as exc:
+            _LOGGER.log(log_level, "Sieve %r removed packages %r: %s", sieve.name, package_versions[0].name, exc)
+            return []
+        except Exception as exc:
+            raise SieveError(
+                f"Failed to run sieve {sieve.name!r} for "
+                f"Python packages {[pv.to_tuple() for pv in package_versions]}: {str(exc)}"
+            ) from exc
+
+    def _run_sieves_cached(
+        self, package_versions: List[PackageVersion], *, log_level: int = logging.DEBUG
+    ) -> Generator[PackageVersion, None, None]:
+        """Run sieves on each package tuple, re-use results of cacheable sieves computed previously if available."""
+        sieve_cache: SieveCache = self.sieve_cache  # type: ignore
+        package_name = package_versions[0].name
+        result = package_versions
+        for sieve in chain(self.pipeline.sieves_dict.get(package_name, []), self.pipeline.sieves_dict.get(None, [])):
+            if not result:
+                # Sieves are not run once all the package versions were removed.
+                break
+
+            if not sieve.CACHEABLE:
+                result = self._run_sieve(sieve, result, log_level=log_level)
+                continue
+
+            fingerprint = self._sieve_fingerprints.get(id(sieve))
+            if fingerprint is None:
+                fingerprint = SieveCache.compute_fingerprint([sieve], self.context)
+                self._sieve_fingerprints[id(sieve)] = fingerprint
+
+            package_tuples = tuple(pv.to_tuple() for pv in result)
+            found, cached = sieve_cache.get(fingerprint, package_tuples)
+            if found:
+                sieve.unit_run = True
+                if cached is SKIP_PACKAGE:
+                    raise SkipPackage(f"Package {package_name!r} skipped by sieve {sieve.name!r} (cached)")
+
+                package_versions_dict = {pv.to_tuple(): pv for pv in result}
+                result = [package_versions_dict[package_tuple] for package_tuple in cached]
+                continue
+
+            try:
+                result = self._run_sieve(sieve, result, log_level=log_level)
+            except SkipPackage:
+                sieve_cache.set(fingerprint, package_tuples, SKIP_PACKAGE)
+                raise
+
+            sieve_cache.set(fingerprint, package_tuples, tuple(pv.to_tuple() for pv in result))
+
+        yield from result
+
+    def _init_score_bound(self) -> None:
+        """Compute the highest scores steps can add, used to prune states that cannot make it to the top-count."""
+        self._step_score_max = None
+        self._step_score_max_total = 0.0
+        self._pruned_states_count = 0
+
+        if not self.prune_states:
+            return
+
+        if self.recommendation_type is None:
+            _LOGGER.warning("Pruning states based on their score is supported only in adviser runs")
+            return
+
+        step_score_max: Dict[str, float] = {}
+        for package_name, steps in self.pipeline.steps_dict.items():
+            for step in steps:
+                score_max = max(step.get_score_max(), 0.0)
+                if score_max == 0.0:
+                    continue
+
+                if not math.isfinite(score_max):
+                    _LOGGER.warning("States will not be pruned, step %r does not bound score it can add", step.name)
+                    return
+
+                if package_name is None or step.configuration["multi_package_resolution"]:
+                    # Number of such step runs is not known upfront so the score cannot be bound.
+                    _LOGGER.warning(
+                        "States will not be pruned, step %r can increase score with each package resolved", step.name
+                    )
+                    return
+
+                step_score_max[package_name] = step_score_max.get(package_name, 0.0) + score_max
+
+        self._step_score_max = step_score_max
+        self._step_score_max_total = sum(step_score_max.values())
+
+    def _get_score_bound(self, state: State) -> float:
+        """Get an upper bound of score of final states resolved out of the given state."""
+        step_score_max = self._step_score_max or {}
+        if len(step_score_max) < len(state.resolved_dependencies):
+            resolved = sum(v for k, v in step_score_max.items() if k in state.resolved_dependencies)
+        else:
+            resolved = sum(step_score_max.get(k, 0.0) for k in state.resolved_dependencies)
+
+        # Steps specific to packages already resolved were already run on the state.
+        return state.score + self._step_score_max_total - resolved
+
+    def _should_prune(self, state: State) -> bool:
+        """Check if the given state cannot lead to a final state kept in the accepted final states."""
+        if self._step_score_max is None:
+            return False
+
+        threshold = self.context.get_accepted_final_states_threshold()
+        if threshold is None or self._get_score_bound(state) >= threshold:
+            return False
+
+        self._pruned_states_count += 1
+        return True
+
+    def _remove_conflicting_dependencies(self, state: State) -> bool:
+        """Remove unresolved dependencies leading to conflicts learnt, return False if the state has no way out."""
+        conflicting = self.context.get_conflicting_dependencies(state)
+        for package_name, package_tuples in conflicting.items():
+            if len(package_tuples) == len(state.unresolved_dependencies[package_name]):
+                return False
+
+        for package_tuples in conflicting.values():
+            for package_tuple in package_tuples:
+                state.remove_unresolved_dependency(package_tuple)
+
+        return True
+
     def _run_steps(
         self,
         state: State,
@@ -467,17 +657,31 @@ class Resolver:
 
         if not skip_package:
             cloned_state.remove_unresolved_dependency_subtree(package_version_tuple[0])
-            cloned_state.add_resolved_dependency(package_version_tuple)
+            cloned_state.add_resolved_dependency(self.context.intern_package_tuple(package_version_tuple))
             cloned_state.add_justification(justification_addition)
             cloned_state.score += score_addition
             self._run_pseudonyms(cloned_state, newly_added)
 
         cloned_state.iteration = self.context.iteration
 
+        if (
+            not user_stack_scoring
+            and not skip_package
+            and (state is not cloned_state or step_result)
+            and not self._remove_conflicting_dependencies(cloned_state)
+        ):
+            # The new state cannot lead to a final state based on conflicts learnt.
+            self.predictor.set_reward_signal(cloned_state, package_version_tuple, math.nan)
+            return None
+
         if not user_stack_scoring:
             if cloned_state.unresolved_dependencies:
                 self.predictor.set_reward_signal(cloned_state, package_version_tuple, score_addition)
-                if not skip_package and (state is not cloned_state or step_result):
+                if (
+                    not skip_package
+                    and (state is not cloned_state or step_result)
+                    and not self._should_prune(cloned_state)
+                ):
                     self.beam.add_state(cloned_state)
             else:
                 self.predictor.set_reward_signal(cloned_state, package_version_tuple, math.inf)
@@ -764,8 +968,8 @@ class Resolver:
             for direct_dependency in package_versions:
                 self.context.register_package_version(direct_dependency)
 
-            package_versions.sort(key=lambda pv: pv.semantic_version, reverse=True)  # type: ignore[no-any-return]
-            # https://github.com/python/mypy/issues/9656#issuecomment-718284938
+            version_ranks = self.context.get_version_ranks(direct_dependency_name)
+            package_versions.sort(key=lambda pv: version_ranks[pv.locked_version], reverse=True)
             try:
                 package_versions = list(self._run_sieves(package_versions))
             except SkipPackage as exc:
@@ -847,7 +1051,7 @@ class Resolver:
                     )
                     continue
 
-                self.context.register_package_tuple(
+                self.context.register_package_record(
                     pseudonym_package_tuple,
                     develop=package_version.develop,
                     os_name=None,  # TODO: pass based on the package_tuple
@@ -866,6 +1070,32 @@ class Resolver:
             for package_tuple in state.unresolved_dependencies[pseudonym_name].values():
                 self._run_pseudonym_units(state, package_tuple)
 
+    @staticmethod
+    def _get_extras(package_version: PackageVersion) -> FrozenSet[Optional[str]]:
+        """Get extras used to query dependencies of the given package."""
+        if package_version.extras:
+            return frozenset(list(package_version.extras) + [None])
+
+        return _NO_EXTRAS
+
+    def _prefetch_expansions(self, to_expand: List[Tuple[State, Tuple[str, str, str]]]) -> None:
+        """Retrieve dependencies and their records needed to expand the given states, in bulk."""
+        depends_on = []
+        for _, package_tuple in to_expand:
+            package_version = self.context.get_package_version(package_tuple, graceful=False)
+            depends_on.append((package_tuple, self._get_extras(package_version)))
+
+        self.context.prefetch_depends_on(depends_on)
+
+        dependencies: List[Tuple[str, str]] = []
+        for package_tuple, extras in depends_on:
+            try:
+                dependencies.extend(chain(*self.context.get_depends_on(package_tuple, extras=extras).values()))
+            except NotFoundError:
+                continue
+
+        self.context.prefetch_python_package_version_records(dependencies)
+
     def _expand_state(self, state: State, package_tuple: Tuple[str, str, str]) -> Optional[State]:
         """Expand the given state, generate new states respecting the pipeline configuration.
 
@@ -892,21 +1122,18 @@ class Resolver:
 
         state.remove_unresolved_dependency(package_tuple)
 
-        extras = _NO_EXTRAS
-        if package_version.extras:
-            extras = frozenset(list(package_version.extras) + [None])
+        if self.context.is_conflicting(state, package_tuple):
+            _LOGGER.debug("Resolving %r in the state leads to a conflict learnt previously", package_tuple)
+            if package_tuple[0] not in state.unresolved_dependencies:
+                self.beam.remove(state)
+
+            self.predictor.set_reward_signal(state, package_tuple, math.nan)
+            return None
 
         try:
-            dependencies = self.graph.get_depends_on(
-                *package_tuple,
-                os_name=self.project.runtime_environment.operating_system.name,
-                os_version=self.project.runtime_environment.operating_system.version,
-                python_version=self.project.runtime_environment.python_version,
-                extras=extras,
-                marker_evaluation_result=True if self.project.runtime_environment.is_fully_specified() else None,
-                is_missing=False,
-            )
+            dependencies = self.context.get_depends_on(package_tuple, extras=self._get_extras(package_version))
         except NotFoundError:
+            self.context.learn_unsolvable(package_tuple)
             log_once(
                 _LOGGER,
                 self._log_unresolved,
@@ -984,15 +1211,9 @@ class Resolver:
         package_tuple = package_version.to_tuple()
         all_dependencies: Dict[str, List[Tuple[str, str, str]]] = {}
         newly_added: List[Tuple[str, str, str]] = []
+        self.context.prefetch_python_package_version_records(dependencies)
         for dependency_name, dependency_version in dependencies:
-            records = self.graph.get_python_package_version_records(
-                package_name=dependency_name,
-                package_version=dependency_version,
-                index_url=None,  # Do cross-index resolving.
-                os_name=self.project.runtime_environment.operating_system.name,
-                os_version=self.project.runtime_environment.operating_system.version,
-                python_version=self.project.runtime_environment.python_version,
-            )
+            records = self.context.get_python_package_version_records(dependency_name, dependency_version)
 
             # We could use a set here that would optimize a bit, but it will create randomness - it
             # will not work well with preserving seed across resolver runs.
@@ -1009,13 +1230,11 @@ class Resolver:
                 continue
 
             for record in records:
-                dependency_tuple = (
-                    record["package_name"],
-                    record["package_version"],
-                    record["index_url"],
+                dependency_tuple = self.context.intern_package_tuple(
+                    (record["package_name"], record["package_version"], record["index_url"])
                 )
 
-                self.context.register_package_tuple(
+                self.context.register_package_record(
                     dependency_tuple,
                     dependent_tuple=package_tuple,
                     develop=package_version.develop,  # Propagate develop flag from parent.
@@ -1036,6 +1255,13 @@ class Resolver:
         if unsolved:
             # We don't have all dependencies of package_tuple solved for the given environment, give up here.
             for unsolved_item in unsolved:
+                resolved_dependency_tuple = state.resolved_dependencies.get(unsolved_item)
+                if resolved_dependency_tuple is not None:
+                    # Versions solved were skipped as they do not match the version already resolved.
+                    self.context.learn_conflict(package_tuple, resolved_dependency_tuple)
+                else:
+                    self.context.learn_unsolvable(package_tuple)
+
                 log_once(
                     _LOGGER,
                     self._log_unsolved,
@@ -1066,6 +1292,11 @@ class Resolver:
                 )
 
                 if not dependency_tuples:
+                    if dependency_name not in state.resolved_dependencies:
+                        self.context.learn_requirement(
+                            package_tuple, dependency_name, all_dependencies[dependency_name]
+                        )
+
                     log_once(
                         _LOGGER,
                         self._log_no_intersected,
@@ -1088,6 +1319,9 @@ class Resolver:
                 resolved_dependency = state.resolved_dependencies.get(dependency_name)
                 if resolved_dependency is not None:
                     if resolved_dependency not in dependency_tuples:
+                        if resolved_dependency not in all_dependencies[dependency_name]:
+                            self.context.learn_conflict(package_tuple, resolved_dependency)
+
                         if package_tuple[0] not in state.unresolved_dependencies:
                             self.beam.remove(state)
 
@@ -1097,10 +1331,9 @@ class Resolver:
                     all_dependencies[dependency_name] = [resolved_dependency]
                     continue
 
+                version_ranks = self.context.get_version_ranks(dependency_name)
                 all_dependencies[dependency_name] = sorted(
-                    dependency_tuples,
-                    key=lambda d: self.context.get_package_version(d).semantic_version,  # type: ignore
-                    reverse=True,
+                    dependency_tuples, key=lambda d: version_ranks[d[1]], reverse=True
                 )
                 continue
 
@@ -1108,6 +1341,7 @@ class Resolver:
             resolved_dependency = state.resolved_dependencies.get(dependency_name)
             if resolved_dependency is not None:
                 if resolved_dependency not in dependency_tuples:
+                    self.context.learn_conflict(package_tuple, resolved_dependency)
                     if package_tuple[0] not in state.unresolved_dependencies:
                         self.beam.remove(state)
 
@@ -1118,8 +1352,9 @@ class Resolver:
                 all_dependencies[dependency_name] = [resolved_dependency]
                 continue
 
+            version_ranks = self.context.get_version_ranks(dependency_name)
             package_versions = [self.context.get_package_version(d) for d in dependency_tuples]
-            package_versions.sort(key=lambda pv: pv.semantic_version, reverse=True)  # type: ignore
+            package_versions.sort(key=lambda pv: version_ranks[pv.locked_version], reverse=True)  # type: ignore
             try:
                 package_versions = list(self._run_sieves(package_versions))
             except SkipPackage as exc:
@@ -1145,17 +1380,400 @@ class Resolver:
                 return None
 
             if self.limit_latest_versions:
-                all_dependencies[dependency_name] = [
-                    pv.to_tuple() for pv in package_versions[: self.limit_latest_versions]  # type: ignore
-                ]
-            else:
-                all_dependencies[dependency_name] = [pv.to_tuple() for pv in package_versions]  # type: ignore
+                package_versions = package_versions[: self.limit_latest_versions]
+
+            all_dependencies[dependency_name] = [
+                self.context.intern_package_tuple(pv.to_tuple()) for pv in package_versions  # type: ignore
+            ]
 
         for skipped_package in skipped_packages:
             all_dependencies.pop(skipped_package)
 
         return self._run_steps(state, package_version, all_dependencies, newly_added)
 
+    def _do_resolve_iteration(self) -> List[State]:
+        """Perform one resolver iteration - expand states picked by predictor, return final states reached."""
+        self.beam.new_iteration()
+        self.context.iteration += 1
+
+        if self.batch_size > 1 and self.predictor.BATCHED:
+            to_expand = self.predictor.run_batch(self.batch_size)
+            self._prefetch_expansions(to_expand)
+        else:
+            to_expand = [self.predictor.run()]
+
+        final_states = []
+        for idx, (state, unresolved_package_tuple) in enumerate(to_expand):
+            if idx > 0:
+                if hash(unresolved_package_tuple) not in state.unresolved_dependencies.get(
+                    unresolved_package_tuple[0], {}
+                ):
+                    # The state was already expanded by resolving this dependency in the same batch.
+                    continue
+
+                if self.beam.size == self.beam.width and not any(s is state for s in self.beam.iter_states()):
+                    # The state was pushed out of the full beam by states created in the same batch.
+                    continue
+
+            if self._should_prune(state):
+                # Score of the state cannot make it to the top-count accepted final states anymore.
+                self.beam.remove(state)
+                self.predictor.set_reward_signal(state, unresolved_package_tuple, math.nan)
+                continue
+
+            _LOGGER.debug(
+                "Resolving package %r in state with score %g: %r",
+                unresolved_package_tuple,
+                state.score,
+                state,
+            )
+            state_returned = self._expand_state(state, unresolved_package_tuple)
+            if state_returned is not None and not state_returned.unresolved_dependencies:
+                final_states.append(state_returned)
+
+        return final_states
+
+    def _do_resolve_states_loop(self) -> Generator[State, None, None]:
+        """Resolve states in the main resolver loop starting with states present in the beam."""
+        while not self.stop_resolving:
+            if self.context.accepted_final_states_count >= self.limit:
+                _LOGGER.info(
+                    "Reached limit of stacks to be generated (limit is %r), stopping resolver "
+                    "with the current beam size %d in iteration %d",
+                    self.limit,
+                    self.beam.size,
+                    self.context.iteration,
+                )
+                break
+
+            if self.beam.size == 0:
+                _LOGGER.warning(
+                    "No more possible paths found for resolution, terminating resolver in iteration %d, see - %s",
+                    self.context.iteration,
+                    jl("no_paths"),
+                )
+                break
+
+            final_states = self._do_resolve_iteration()
+            for state_returned in final_states:
+                if self.context.accepted_final_states_count >= self.limit:
+                    # Final states produced in the same batch after reaching the limit.
+                    break
+
+                # A final state produced by the pipeline.
+                if self._run_strides(state_returned):
+                    self.context.accepted_final_states_count += 1
+                    self.context.register_accepted_final_state(state_returned)
+                    yield state_returned
+                else:
+                    self.context.discarded_final_states_count += 1
+
+                if self.beam.keep_history:
+                    self._history.append(state_returned.score)
+                    self._history_max.append(
+                        max(
+                            self._history_max[-1]
+                            if self._history_max and self._history_max[-1] is not None
+                            else state_returned.score,
+                            state_returned.score,
+                        )
+                    )
+
+            if not final_states and self.beam.keep_history:
+                self._history.append(None)
+                self._history_max.append(self._history_max[-1] if self._history_max else None)
+
+            if self.context.iteration % self._MEM_OPTIMIZER_ITERATION == 0:
+                self._maybe_memory_optimizer()
+
+    def _get_partitions(self) -> Tuple[Optional[str], List[List[Tuple[str, str, str]]]]:
+        """Partition candidate versions of the direct dependency with the most candidates among workers."""
+        candidates: Dict[str, List[Tuple[str, str, str]]] = {}
+        for state in self.beam.iter_states():
+            for dependency_name, dependencies in state.unresolved_dependencies.items():
+                known = candidates.setdefault(dependency_name, [])
+                known.extend(d for d in dependencies.values() if d not in known)
+
+        if not candidates:
+            return None, []
+
+        partition_name = max(candidates, key=lambda n: len(candidates[n]))
+        package_tuples = candidates[partition_name]
+        workers = min(self.workers, len(package_tuples))
+        # Distribute in a round-robin fashion so that each worker gets recent as well as older versions.
+        return partition_name, [package_tuples[i::workers] for i in range(workers)]
+
+    def _do_resolve_states_parallel(self) -> Generator[State, None, None]:
+        """Resolve states in worker processes, each exploring a partition of the resolution space.
+
+        Workers stream final states to this (coordinator) process which runs strides and accepts final states.
+        """
+        partition_name, partitions = self._get_partitions()
+        if len(partitions) <= 1:
+            _LOGGER.info("Resolution space cannot be partitioned, resolving in a single process")
+            yield from self._do_resolve_states_loop()
+            return
+
+        _LOGGER.info(
+            "Starting %d resolver workers, partitioning resolution space based on %r",
+            len(partitions),
+            partition_name,
+        )
+
+        mp_context = multiprocessing.get_context("fork")
+        result_queue = mp_context.Queue()
+        stop_event = mp_context.Event()
+        # Workers are forked with the policy restored, they report it back together with the policy they learnt.
+        policy_base = {
+            package_tuple: list(record) for package_tuple, record in (self.predictor.get_policy() or {}).items()
+        }
+        # Derive seeds from the current random state so that seeded runs are reproducible per worker.
+        seed = random.getrandbits(32)
+        processes = [
+            mp_context.Process(
+                target=self._parallel_worker,
+                args=(result_queue, stop_event, worker_id, partition_name, partitions, seed + worker_id),
+                daemon=True,
+            )
+            for worker_id in range(len(partitions))
+        ]
+        for process in processes:
+            process.start()
+
+        iterations = [0] * len(processes)
+        running = len(processes)
+        try:
+            while running > 0 and not self.stop_resolving:
+                if self.context.accepted_final_states_count >= self.limit:
+                    _LOGGER.info(
+                        "Reached limit of stacks to be generated (limit is %r), stopping resolver workers "
+                        "in iteration %d",
+                        self.limit,
+                        self.context.iteration,
+                    )
+                    break
+
+                try:
+                    kind, worker_id, iteration, payload = result_queue.get(timeout=self._WORKER_POLL_TIMEOUT)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        _LOGGER.warning("All resolver workers terminated unexpectedly")
+                        break
+
+                    continue
+
+                iterations[worker_id] = iteration
+                self.context.iteration = sum(iterations)
+
+                if kind == "final":
+                    final_state = self._unpack_final_state(payload)
+                    if self._run_strides(final_state):
+                        self.context.accepted_final_states_count += 1
+                        self.context.register_accepted_final_state(final_state)
+                        yield final_state
+                    else:
+                        self.context.discarded_final_states_count += 1
+                elif kind == "done":
+                    self._merge_stack_info(payload["stack_info"])
+                    self._merge_policy(policy_base, payload["policy"])
+                    running -= 1
+                elif kind == "stop":
+                    raise EagerStopPipeline(payload)
+                else:
+                    raise ResolverWorkerError(f"Resolver worker {worker_id} failed: {payload}")
+
+            if running == 0:
+                _LOGGER.warning(
+                    "No more possible paths found for resolution, terminating resolver in iteration %d, see - %s",
+                    self.context.iteration,
+                    jl("no_paths"),
+                )
+            else:
+                self._stop_workers(processes, result_queue, stop_event, running, policy_base)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+            for process in processes:
+                process.join()
+
+            result_queue.close()
+
+    def _stop_workers(
+        self,
+        processes: List[Any],
+        result_queue: "multiprocessing.Queue[Tuple[str, int, int, Any]]",
+        stop_event: Any,
+        running: int,
+        policy_base: Dict[Tuple[str, str, str], List[Union[float, int]]],
+    ) -> None:
+        """Ask running workers to stop and gather policy they learnt, final states reported meanwhile are ignored."""
+        stop_event.set()
+        deadline = time.monotonic() + self._WORKER_STOP_TIMEOUT
+        while running > 0 and time.monotonic() < deadline:
+            try:
+                kind, _, _, payload = result_queue.get(timeout=self._WORKER_POLL_TIMEOUT)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+
+                continue
+
+            if kind == "done":
+                self._merge_policy(policy_base, payload["policy"])
+
+            if kind != "final":
+                running -= 1
+
+        if running > 0:
+            _LOGGER.warning("Policy learnt by %d resolver workers was not reported in time", running)
+
+    def _parallel_worker(
+        self,
+        result_queue: "multiprocessing.Queue[Tuple[str, int, int, Any]]",
+        stop_event: Any,
+        worker_id: int,
+        partition_name: str,
+        partitions: List[List[Tuple[str, str, str]]],
+        seed: int,
+    ) -> None:
+        """Resolve states in a forked worker process, restrict the beam to the given partition."""
+        random.seed(seed)
+        termial_random.seed(seed)
+
+        if isinstance(self.graph, GraphDatabase):
+            # Do not share database connections with the parent process.
+            graph = GraphDatabase()
+            graph.connect()
+            self.graph = graph
+            self.context.graph = graph
+
+        if self.context.graph_io is not None:
+            # Threads of the parent process are not available in the forked process.
+            self.context.graph_io = AsyncGraph(graph=self.graph, max_workers=self.context.graph_io.max_workers)
+
+        partition = partitions[worker_id]
+        for state in list(self.beam.iter_states()):
+            if partition_name in state.unresolved_dependencies:
+                state.set_unresolved_dependencies(
+                    {
+                        partition_name: [
+                            d for d in state.unresolved_dependencies[partition_name].values() if d in partition
+                        ]
+                    }
+                )
+                if not state.unresolved_dependencies[partition_name]:
+                    self.beam.remove(state)
+            elif worker_id != 0:
+                # States not affected by partitioning are resolved by the first worker.
+                self.beam.remove(state)
+
+        stack_info_size = len(self.context.stack_info)
+        final_states_count = 0
+        try:
+            # There is no need to produce more final states than the coordinator accepts.
+            while (
+                not self.stop_resolving
+                and not stop_event.is_set()
+                and self.beam.size > 0
+                and final_states_count < self.limit
+            ):
+                for final_state in self._do_resolve_iteration():
+                    final_states_count += 1
+                    result_queue.put(("final", worker_id, self.context.iteration, self._pack_final_state(final_state)))
+
+                if self.context.iteration % self._MEM_OPTIMIZER_ITERATION == 0:
+                    self._maybe_memory_optimizer()
+        except EagerStopPipeline as exc:
+            result_queue.put(("stop", worker_id, self.context.iteration, str(exc)))
+        except Exception as exc:
+            _LOGGER.exception("Resolver worker %d failed", worker_id)
+            result_queue.put(("error", worker_id, self.context.iteration, str(exc)))
+        else:
+            result_queue.put(
+                (
+                    "done",
+                    worker_id,
+                    self.context.iteration,
+                    {"stack_info": self.context.stack_info[stack_info_size:], "policy": self.predictor.get_policy()},
+                )
+            )
+
+        result_queue.close()
+        result_queue.join_thread()
+
+    def _pack_final_state(self, state: State) -> Dict[str, Any]:
+        """Serialize the given final state together with entries of the context needed to construct a product."""
+        package_tuples = list(state.resolved_dependencies.values())
+        return {
+            "score": state.score,
+            "iteration": state.iteration,
+            "resolved_dependencies": state.resolved_dependencies,
+            "advised_runtime_environment": (
+                state.advised_runtime_environment.to_dict() if state.advised_runtime_environment else None
+            ),
+            "advised_manifest_changes": state.advised_manifest_changes,
+            "justification": state.justification,
+            "package_versions": [self.context.get_package_version(t) for t in package_tuples],
+            "dependencies": {t: self.context.dependencies.get(t[0], {}).get(t, set()) for t in package_tuples},
+            "dependents": {t: self.context.dependents.get(t[0], {}).get(t, set()) for t in package_tuples},
+        }
+
+    def _unpack_final_state(self, payload: Dict[str, Any]) -> State:
+        """Construct a final state sent by a worker, register context entries computed by the worker."""
+        for package_version in payload["package_versions"]:
+            self.context.merge_package_version(package_version)
+
+        for package_tuple, dependencies in payload["dependencies"].items():
+            self.context.dependencies.setdefault(package_tuple[0], {}).setdefault(package_tuple, set()).update(
+                dependencies
+            )
+
+        for package_tuple, dependents in payload["dependents"].items():
+            self.context.dependents.setdefault(package_tuple[0], {}).setdefault(package_tuple, set()).update(dependents)
+
+        advised_runtime_environment = None
+        if payload["advised_runtime_environment"] is not None:
+            advised_runtime_environment = RuntimeEnvironment.from_dict(payload["advised_runtime_environment"])
+
+        return State(
+            score=payload["score"],
+            iteration=payload["iteration"],
+            resolved_dependencies=payload["resolved_dependencies"],
+            advised_runtime_environment=advised_runtime_environment,
+            advised_manifest_changes=payload["advised_manifest_changes"],
+            justification=payload["justification"],
+        )
+
+    def _merge_policy(
+        self,
+        policy_base: Dict[Tuple[str, str, str], List[Union[float, int]]],
+        policy: Optional[Dict[Tuple[str, str, str], List[Union[float, int]]]],
+    ) -> None:
+        """Merge policy learnt by a worker, the policy the worker was forked with is not accounted twice."""
+        if not policy:
+            return None
+
+        merged = {}
+        current = self.predictor.get_policy() or {}
+        for package_tuple, (reward, count) in policy.items():
+            base_reward, base_count = policy_base.get(package_tuple, (0.0, 0))
+            if count == base_count and reward == base_reward:
+                continue
+
+            current_reward, current_count = current.get(package_tuple, (base_reward, base_count))
+            merged[package_tuple] = [current_reward + reward - base_reward, current_count + count - base_count]
+
+        if merged:
+            self.predictor.set_policy(merged)
+
+    def _merge_stack_info(self, stack_info: List[Dict[str, Any]]) -> None:
+        """Merge stack information produced by a worker, avoid duplicates produced by multiple workers."""
+        for entry in stack_info:
+            if entry not in self.context.stack_info:
+                self.context.stack_info.append(entry)
+
     def _do_resolve_states_raw(
         self,
         *,
@@ -1196,63 +1814,10 @@ class Resolver:
         self.context.iteration = 0
         self.stop_resolving = False
         with _sigint_handler(self):
-            while not self.stop_resolving:
-                if self.context.accepted_final_states_count >= self.limit:
-                    _LOGGER.info(
-                        "Reached limit of stacks to be generated (limit is %r), stopping resolver "
-                        "with the current beam size %d in iteration %d",
-                        self.limit,
-                        self.beam.size,
-                        self.context.iteration,
-                    )
-                    break
-
-                if self.beam.size == 0:
-                    _LOGGER.warning(
-                        "No more possible paths found for resolution, terminating resolver in iteration %d, see - %s",
-                        self.context.iteration,
-                        jl("no_paths"),
-                    )
-                    break
-
-                self.beam.new_iteration()
-                self.context.iteration += 1
-
-                state, unresolved_package_tuple = self.predictor.run()
-
-                _LOGGER.debug(
-                    "Resolving package %r in state with score %g: %r",
-                    unresolved_package_tuple,
-                    state.score,
-                    state,
-                )
-                state_returned = self._expand_state(state, unresolved_package_tuple)
-                if state_returned is not None and not state_returned.unresolved_dependencies:
-                    # A final state produced by the pipeline.
-                    if self._run_strides(state_returned):
-                        self.context.accepted_final_states_count += 1
-                        self.context.register_accepted_final_state(state_returned)
-                        yield state_returned
-                    else:
-                        self.context.discarded_final_states_count += 1
-
-                    if self.beam.keep_history:
-                        self._history.append(state_returned.score)
-                        self._history_max.append(
-                            max(
-                                self._history_max[-1]
-                                if self._history_max and self._history_max[-1] is not None
-                                else state_returned.score,
-                                state_returned.score,
-                            )
-                        )
-                else:
-                    if self.beam.keep_history:
-                        self._history.append(None)
-                        self._history_max.append(self._history_max[-1] if self._history_max else None)
-
-                if self.context.iteration % self._MEM_OPTIMIZER_ITERATION == 0:
-                    self._maybe_memory_optimizer()
+            if self.workers > 1:
+                yield from self._do_resolve_states_parallel()
+            else:
+                yield from self._do_resolve_states_loop()
 
         if self.stop_resolving:
             _LOGGER.warning(
@@ -1260,6 +1825,27 @@ class Resolver:
                 self.beam.size,
             )
 
+    def _restore_policy(self) -> None:
+        """Warm-start the predictor with a policy learnt in a previous resolution of the same project, if any."""
+        if self.policy_snapshot is None:
+            return
+
+        # Computed before the resolution starts as package sources get registered in the project during resolution.
+        self._policy_fingerprint = PolicySnapshot.compute_fingerprint(self.predictor, self.context)
+        policy = self.policy_snapshot.get(self._policy_fingerprint)
+        if policy:
+            _LOGGER.info("Restoring predictor policy with %d package records from a previous resolution", len(policy))
+            self.predictor.set_policy(policy)
+
+    def _store_policy(self) -> None:
+        """Store policy learnt by the predictor so that it can be restored in a subsequent resolution."""
+        if self.policy_snapshot is None:
+            return
+
+        policy = self.predictor.get_policy()
+        if policy and self._policy_fingerprint is not None:
+            self.policy_snapshot.set(self._policy_fingerprint, policy)
+
     def _do_resolve_states(
         self,
         *,
@@ -1276,10 +1862,20 @@ class Resolver:
             )
             self.count = self.limit
 
+        if self.batch_size > 1 and not self.predictor.BATCHED:
+            _LOGGER.warning(
+                "Predictor %r does not support batched expansion, expanding one state per iteration "
+                "regardless of the batch size configured (%d)",
+                self.predictor.__class__.__name__,
+                self.batch_size,
+            )
+
         self._history.clear()
         self._history_max.clear()
         self.predictor.pre_run()
+        self._restore_policy()
         self.pipeline.call_pre_run()
+        self._init_score_bound()
 
         start_time = time.monotonic()
         max_score = float("-inf")
@@ -1339,6 +1935,15 @@ class Resolver:
             self.context.accepted_final_states_count,
         )
 
+        if self._step_score_max is not None:
+            _LOGGER.info("Pruned %d states that could not make it to the top-count", self._pruned_states_count)
+
+        if self.beam.deduplicate:
+            _LOGGER.info("Merged %d states equivalent to states kept in the beam", self.beam.duplicates_count)
+
+        _LOGGER.info("Learnt %d conflicts between packages during resolution", self.context.learned_conflicts_count)
+
+        self._store_policy()
         self.predictor.post_run()
         self.pipeline.call_post_run()
 
@@ -1347,7 +1952,7 @@ class Resolver:
     ) -> Generator[Product, None, None]:
         """Resolve raw products as produced by this resolver pipeline."""
         self._init_context()
-        with Unit.assigned_context(self.context), self.predictor.assigned_context(self.context):
+        with Unit.assigned_context(self.context), self.predictor.assigned_context(self.context), self._graph_io_scope():
             for state in self._do_resolve_states(with_devel=with_devel, user_stack_scoring=user_stack_scoring):
                 # Always run wraps as raw products are computed.
                 self._run_wraps(state, sort=True)
@@ -1359,7 +1964,7 @@ class Resolver:
         heapq_counter = 0  # Making sure the first resolved state takes precedence when adding to the report.
 
         self._init_context()
-        with Unit.assigned_context(self.context), self.predictor.assigned_context(self.context):
+        with Unit.assigned_context(self.context), self.predictor.assigned_context(self.context), self._graph_io_scope():
             for state in self._do_resolve_states(with_devel=with_devel, user_stack_scoring=user_stack_scoring):
                 item = ((state.score, heapq_counter), state)
                 heapq_counter -= 1
@@ -1387,6 +1992,8 @@ class Resolver:
             for item in states:
                 self._run_wraps(item[1], sort=True)
 
+            # Retrieve data needed to construct all the products at once, products share most of the packages.
+            self.context.prefetch_product_data(s[1] for s in states)
             report = Report(
                 products=[
                     Product.from_final_state(context=self.context, state=s[1])
@@ -1404,6 +2011,91 @@ class Resolver:
 
             return report
 
+    def _stream_products(self, states: List[State]) -> Generator[Dict[str, Any], None, None]:
+        """Turn the given final states into product records of a streamed report."""
+        for state in states:
+            self._run_wraps(state, sort=True)
+
+        self.context.prefetch_product_data(states)
+        for state in states:
+            yield {"type": "product", "product": Product.from_final_state(context=self.context, state=state).to_dict()}
+
+    def resolve_stream(
+        self, *, with_devel: bool = True, user_stack_scoring: bool = True, verbose: bool = False
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Resolve software stacks and yield the resolver report incrementally.
+
+        Products are yielded as soon as they are guaranteed to be part of the top `count' products - that is when
+        the rank of the state among the ones resolved so far and the number of final states which can still be
+        accepted do not exceed `count'. Products are yielded in the descending order of their score within each
+        batch of products that became guaranteed at once. A summary record with the rest of the report is yielded
+        once the resolution is done.
+        """
+        heap: List[Tuple[float, int]] = []  # Keys of the top `count' states resolved so far.
+        pending: Dict[int, State] = {}  # States not yet yielded keyed by their heap counter.
+        heapq_counter = 0  # Making sure the first resolved state takes precedence when adding to the report.
+        products_count = 0
+
+        self._init_context()
+        with Unit.assigned_context(self.context), self.predictor.assigned_context(self.context), self._graph_io_scope():
+            for state in self._do_resolve_states(with_devel=with_devel, user_stack_scoring=user_stack_scoring):
+                key = (state.score, heapq_counter)
+                heapq_counter -= 1
+
+                pending[key[1]] = state
+                if len(heap) >= self.count:
+                    # Guaranteed states are never removed, the removed one cannot be yielded already.
+                    pending.pop(heapq.heappushpop(heap, key)[1])
+                else:
+                    heapq.heappush(heap, key)
+
+                # Any state ranked within the top `count - remaining' cannot be pushed out of the top `count'.
+                remaining = max(self.limit - self.context.accepted_final_states_count, 0)
+                guaranteed = [
+                    pending.pop(k[1]) for k in heapq.nlargest(self.count - remaining, heap) if k[1] in pending
+                ]
+                if guaranteed:
+                    products_count += len(guaranteed)
+                    yield from self._stream_products(guaranteed)
+
+            if not heap:
+                msg = (
+                    "Resolver did not find any stack that would satisfy requirements and stack "
+                    "characteristics given the time allocated"
+                )
+                link = jl("no_stack")
+                self.context.stack_info.append(
+                    {
+                        "message": msg,
+                        "type": "ERROR",
+                        "link": link,
+                    }
+                )
+                raise CannotProduceStack(msg + f" - see {link}", stack_info=self.context.stack_info)
+
+            # The resolution was terminated or did not reach the limit, all the kept states are in the report.
+            remaining_states = [pending.pop(k[1]) for k in sorted(heap, reverse=True) if k[1] in pending]
+            products_count += len(remaining_states)
+            yield from self._stream_products(remaining_states)
+
+            report = Report(
+                products=[],
+                pipeline=self.pipeline,
+                resolver_iterations=self.context.iteration,
+                accepted_final_states_count=self.context.accepted_final_states_count,
+                discarded_final_states_count=self.context.discarded_final_states_count,
+                stack_info=self.context.stack_info,
+            )
+
+            # Products were already handed over, units see only the summary of the report.
+            self.predictor.post_run_report(report)
+            self.pipeline.call_post_run_report(report)
+
+            summary = report.to_dict(verbose=verbose)
+            summary.pop("products")
+            summary["products_count"] = products_count
+            yield {"type": "summary", "report": summary}
+
     def plot(self) -> "matplotlib.figure.Figure":
         """Plot history captured during the resolution process."""
         if not self._history:
@@ -1472,6 +2164,12 @@ class Resolver:
         pipeline_config: Optional[Union[PipelineConfig, Dict[str, Any]]] = None,
         prescription: Optional["Prescription"] = None,
         cli_parameters: Optional[Dict[str, Any]] = None,
+        sieve_cache: Optional[SieveCache] = None,
+        workers: int = 1,
+        batch_size: int = 1,
+        graph_io_workers: int = 0,
+        policy_snapshot: Optional[PolicySnapshot] = None,
+        pipeline_cache: Optional[PipelineCache] = None,
     ) -> "Resolver":
         """Get instance of resolver based on the project given to recommend software stacks."""
         graph = graph or GraphDatabase()
@@ -1479,7 +2177,10 @@ class Resolver:
             graph.connect()
 
         if pipeline_config is None:
-            pipeline = PipelineBuilder.get_adviser_pipeline_config(
+            builder: Union[PipelineCache, Type[PipelineBuilder]] = (
+                pipeline_cache if pipeline_cache is not None else PipelineBuilder
+            )
+            pipeline = builder.get_adviser_pipeline_config(
                 recommendation_type=recommendation_type,
                 project=project,
                 labels=labels or {},
@@ -1512,6 +2213,11 @@ class Resolver:
             recommendation_type=recommendation_type,
             prescription=prescription,
             cli_parameters=cli_parameters or {},
+            sieve_cache=sieve_cache,
+            workers=workers,
+            batch_size=batch_size,
+            graph_io_workers=graph_io_workers,
+            policy_snapshot=policy_snapshot,
         )
 
     @classmethod
@@ -1530,6 +2236,7 @@ class Resolver:
         pipeline_config: Optional[Union[PipelineConfig, Dict[str, Any]]] = None,
         prescription: Optional["Prescription"] = None,
         cli_parameters: Optional[Dict[str, Any]] = None,
+        pipeline_cache: Optional[PipelineCache] = None,
     ) -> "Resolver":
         """Get instance of resolver based on the project given to run dependency monkey."""
         graph = graph or GraphDatabase()
@@ -1537,7 +2244,10 @@ class Resolver:
             graph.connect()
 
         if pipeline_config is None:
-            pipeline = PipelineBuilder.get_dependency_monkey_pipeline_config(
+            builder: Union[PipelineCache, Type[PipelineBuilder]] = (
+                pipeline_cache if pipeline_cache is not None else PipelineBuilder
+            )
+            pipeline = builder.get_dependency_monkey_pipeline_config(
                 decision_type=decision_type,
                 graph=graph,
                 project=project,
@@ -39,6 +39,7 @@ from .exceptions import CannotProduceStack
 from .exceptions import UnresolvedDependencies
 from .dependency_monkey import DependencyMonkey
 from .dm_report import DependencyMonkeyReport
+from .graph_snapshot import GraphSnapshotRecorder
 from .report import Report
 from .resolver import Resolver
 
@@ -57,15 +58,27 @@ def subprocess_run(
     with_devel: bool = True,
     verbose: bool = False,
     user_stack_scoring: bool = True,
+    graph_snapshot_recorder: Optional[GraphSnapshotRecorder] = None,
+    graph_snapshot_output: Optional[str] = None,
+    stream_func: Optional[Callable[[Dict[str, Any]], None]] = None,
+    fork: Optional[bool] = None,
 ) -> int:
-    """Run the given function (partial annealing method) in a subprocess and output the produced report."""
+    """Run the given function (partial annealing method) in a subprocess and output the produced report.
+
+    If stream_func is supplied, products are passed to it as soon as they are computed and the report submitted
+    using print_func carries only the summary of the resolution. If fork is not set, THOTH_ADVISER_FORK decides
+    whether the resolution is run in a forked process.
+    """
+    if fork is None:
+        fork = _FORK
+
     if not with_devel:
         _LOGGER.warning("Development dependencies will not be taken into account - see %s", jl("no_dev"))
 
     start_time = time.monotonic()
 
     pid = 0
-    if _FORK:
+    if fork:
         pid = os.fork()
 
     if pid == 0:  # Child or no-fork mode.
@@ -73,9 +86,21 @@ def subprocess_run(
         # We need to re-init logging for the sub-process.
         _LOGGER.debug("Created a child process to compute report")
         try:
-            report: Union[DependencyMonkeyReport, Report] = resolver.resolve(
-                with_devel=with_devel, user_stack_scoring=user_stack_scoring
-            )
+            report_dict: Optional[Dict[str, Any]] = None
+            if stream_func is not None and isinstance(resolver, Resolver):
+                for record in resolver.resolve_stream(
+                    with_devel=with_devel, user_stack_scoring=user_stack_scoring, verbose=verbose
+                ):
+                    if record["type"] == "summary":
+                        report_dict = record["report"]
+                    else:
+                        stream_func(record)
+            else:
+                report: Union[DependencyMonkeyReport, Report] = resolver.resolve(
+                    with_devel=with_devel, user_stack_scoring=user_stack_scoring
+                )
+                report_dict = report.to_dict(verbose=verbose)
+
             if plot:
                 parts = plot.rsplit(".", maxsplit=1)
                 file_name = parts[0]
@@ -108,7 +133,7 @@ def subprocess_run(
                 else:
                     _LOGGER.info("Resolver history saved to %r", resolver_history_file)
 
-            result_dict.update(dict(error=False, error_msg=None, report=report.to_dict(verbose=verbose)))
+            result_dict.update(dict(error=False, error_msg=None, report=report_dict))
         except UnresolvedDependencies as exc:
             _LOGGER.error(
                 "Resolver failed due to unsolved dependencies for packages %s",
@@ -128,10 +153,32 @@ def subprocess_run(
             )
             return_code = 2
 
+        if graph_snapshot_recorder is not None and graph_snapshot_output:
+            # Queries are recorded in the (possibly forked) process that performed the resolution.
+            try:
+                graph_snapshot_recorder.dump(graph_snapshot_output)
+            except Exception:
+                _LOGGER.exception("Failed to store graph snapshot to %r", graph_snapshot_output)
+
+        if isinstance(resolver, Resolver) and resolver.sieve_cache is not None and resolver.sieve_cache.path:
+            _LOGGER.info(
+                "Sieve cache statistics: %d hits, %d misses", resolver.sieve_cache.hits, resolver.sieve_cache.misses
+            )
+            try:
+                resolver.sieve_cache.dump()
+            except Exception:
+                _LOGGER.exception("Failed to store sieve cache to %r", resolver.sieve_cache.path)
+
+        if isinstance(resolver, Resolver) and resolver.policy_snapshot is not None and resolver.policy_snapshot.path:
+            try:
+                resolver.policy_snapshot.dump()
+            except Exception:
+                _LOGGER.exception("Failed to store policy snapshot to %r", resolver.policy_snapshot.path)
+
         # Always submit results, even on error.
         print_func(time.monotonic() - start_time, result_dict)
 
-        if _FORK:
+        if fork:
             # 1 - error based on user input
             # 2 - error based on system not capable giving recommendations (not enough data) or internal error.
             os._exit(return_code)
@@ -154,7 +201,7 @@ def subprocess_run(
 
             _LOGGER.error(err_msg)
 
-            if _FORK and (exit_code >> 8) == 2:
+            if (exit_code >> 8) == 2:
                 # Do not overwrite results computed in the forked process.
                 return exit_code
 
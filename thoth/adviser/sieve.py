@@ -30,6 +30,11 @@ from .unit import Unit
 class Sieve(Unit):
     """Sieve base class implementation."""
 
+    # Results of the sieve can be cached and re-used without running the sieve. Set only for sieves whose result
+    # depends solely on their configuration and package versions passed in and which do not report anything
+    # (stack information or any other per-run records).
+    CACHEABLE = False
+
     @staticmethod
     def is_sieve_unit_type() -> bool:
         """Check if this unit is of type sieve."""
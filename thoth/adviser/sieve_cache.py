@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# thoth-adviser
+# Copyright(C) 2022 Fridolin Pokorny
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A cache of results computed by pipeline sieves.
+
+Sieves are run each time a dependency is introduced into a resolver state. The
+cache memoizes which package tuples survived a sieve, keyed by a fingerprint of
+the sieve (its type and configuration) and inputs affecting sieves at runtime
+(runtime environment, labels and Pipfile). Only sieves declared as cacheable
+are cached - a cache hit skips running the sieve so any stack information it
+would report would be lost. The cache can be optionally persisted to a file to
+be reused across resolver runs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+import attr
+
+from .exceptions import SieveCacheError
+
+if TYPE_CHECKING:
+    from .context import Context  # noqa: F401
+    from .sieve import Sieve  # noqa: F401
+
+_LOGGER = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+
+# A marker stating the whole dependency was skipped by sieves (SkipPackage was raised).
+SKIP_PACKAGE = None
+
+_PackageTuples = Tuple[Tuple[str, str, str], ...]
+
+
+def _to_package_tuples(items: List[List[str]]) -> _PackageTuples:
+    """Convert package tuples deserialized from JSON lists."""
+    return tuple((item[0], item[1], item[2]) for item in items)
+
+
+@attr.s(slots=True)
+class SieveCache:
+    """Memoize package tuples that survived cacheable sieves."""
+
+    path = attr.ib(type=Optional[str], default=None, kw_only=True)
+    hits = attr.ib(type=int, default=0, init=False)
+    misses = attr.ib(type=int, default=0, init=False)
+
+    _entries = attr.ib(type=Dict[str, Dict[_PackageTuples, Optional[_PackageTuples]]], factory=dict, init=False)
+
+    @classmethod
+    def load(cls, path: str) -> "SieveCache":
+        """Load the sieve cache from the given file, an empty cache is created if the file does not exist yet."""
+        instance = cls(path=path)
+        if not os.path.isfile(path):
+            _LOGGER.debug("Sieve cache %r does not exist yet, starting with an empty cache", path)
+            return instance
+
+        try:
+            with open(path, "r") as cache_file:
+                content = json.load(cache_file)
+        except Exception as exc:
+            raise SieveCacheError(f"Failed to load sieve cache from {path!r}: {str(exc)}") from exc
+
+        if not isinstance(content, dict) or content.get("version") != _FORMAT_VERSION:
+            raise SieveCacheError(f"File {path!r} is not a sieve cache in version {_FORMAT_VERSION}")
+
+        for fingerprint, entries in content["entries"].items():
+            instance._entries[fingerprint] = {
+                _to_package_tuples(package_tuples): _to_package_tuples(result) if result is not None else SKIP_PACKAGE
+                for package_tuples, result in entries
+            }
+
+        _LOGGER.debug("Loaded sieve cache %r with %d fingerprints", path, len(instance._entries))
+        return instance
+
+    def dump(self, path: Optional[str] = None) -> None:
+        """Persist the sieve cache to the given file, defaults to the file the cache was loaded from."""
+        path = path or self.path
+        if path is None:
+            raise SieveCacheError("No path to store the sieve cache to provided")
+
+        content = {
+            "version": _FORMAT_VERSION,
+            "entries": {fingerprint: list(entries.items()) for fingerprint, entries in self._entries.items()},
+        }
+        with open(path, "w") as cache_file:
+            json.dump(content, cache_file)
+
+        _LOGGER.info("Sieve cache with %d fingerprints written to %r", len(self._entries), path)
+
+    @staticmethod
+    def compute_fingerprint(sieves: Iterable["Sieve"], context: "Context") -> str:
+        """Compute a fingerprint of the given sieve chain used in the given context."""
+        content: Dict[str, Any] = {
+            "sieves": [
+                [f"{sieve.__class__.__module__}.{sieve.__class__.__qualname__}", sieve.configuration]
+                for sieve in sieves
+            ],
+            "runtime_environment": context.project.runtime_environment.to_dict(),
+            "labels": context.labels,
+            "pipfile": context.project.pipfile.to_dict(),
+        }
+        serialized = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def get(self, fingerprint: str, package_tuples: _PackageTuples) -> Tuple[bool, Optional[_PackageTuples]]:
+        """Get package tuples that survived the sieve, the first item states whether the entry was found."""
+        entries = self._entries.get(fingerprint)
+        if entries is None or package_tuples not in entries:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, entries[package_tuples]
+
+    def set(self, fingerprint: str, package_tuples: _PackageTuples, result: Optional[_PackageTuples]) -> None:
+        """Store package tuples that survived the sieve, use SKIP_PACKAGE if the dependency was skipped."""
+        self._entries.setdefault(fingerprint, {})[package_tuples] = result
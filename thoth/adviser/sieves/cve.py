@@ -22,6 +22,8 @@ import logging
 from typing import Any
 from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Optional
 from typing import Set
 from typing import Tuple
 from typing import TYPE_CHECKING
@@ -46,10 +48,11 @@ _LOGGER = logging.getLogger(__name__)
 class CveSieve(Sieve):
     """Filter out packages with CVEs."""
 
-    CONFIGURATION_DEFAULT = {"package_name": None}
+    CONFIGURATION_DEFAULT = {"package_name": None, "bulk": False}
     CONFIGURATION_SCHEMA: Schema = Schema(
         {
             Required("package_name"): None,
+            Required("bulk"): bool,
         }
     )
     _JUSTIFICATION_LINK = jl("cve")
@@ -57,6 +60,11 @@ class CveSieve(Sieve):
     _messages_logged = attr.ib(type=Set[Tuple[str, str, str]], factory=set, init=False)
     _messages_logged_allow_cve = attr.ib(type=Set[Tuple[str, Tuple[str, str, str]]], factory=set, init=False)
     _allow_cves = attr.ib(type=Set[str], factory=set, init=False)
+    # CVE records of all the versions of a package, keyed by package name; used in bulk mode.
+    _package_cve_records = attr.ib(type=Dict[str, List[Dict[str, Any]]], factory=dict, init=False)
+    # CVE records of package versions, keyed by package name and version; in bulk mode kept only for packages with
+    # any known CVE.
+    _version_cve_records = attr.ib(type=Dict[Tuple[str, str], List[Dict[str, Any]]], factory=dict, init=False)
 
     @classmethod
     def should_include(cls, builder_context: "PipelineBuilderContext") -> Generator[Dict[str, Any], None, None]:
@@ -76,17 +84,83 @@ class CveSieve(Sieve):
         """Initialize this pipeline unit before running."""
         self._messages_logged.clear()
         self._messages_logged_allow_cve.clear()
+        self._package_cve_records.clear()
+        self._version_cve_records.clear()
         self._construct_allow_cves(self._allow_cves, self.context.labels)
         super().pre_run()
 
+    def _get_cve_records(self, package_version: PackageVersion) -> List[Dict[str, Any]]:
+        """Get CVE records for the given package, query CVEs once per package name in bulk mode."""
+        if self.configuration["bulk"]:
+            package_cve_records = self._package_cve_records.get(package_version.name)
+            if package_cve_records is None:
+                package_cve_records = self.context.graph.get_python_cve_records_all(package_name=package_version.name)
+                self._package_cve_records[package_version.name] = package_cve_records
+
+            if not package_cve_records:
+                # No CVE known for any version of the given package.
+                return package_cve_records
+
+        key = (package_version.name, package_version.locked_version)
+        cve_records = self._version_cve_records.get(key)
+        if cve_records is None:
+            cve_records = self.context.graph.get_python_cve_records_all(
+                package_name=package_version.name,
+                package_version=package_version.locked_version,
+            )
+            self._version_cve_records[key] = cve_records
+
+        return cve_records
+
+    def _gather_cve_records(self, queries: List[Dict[str, str]]) -> List[Optional[List[Dict[str, Any]]]]:
+        """Query CVE records concurrently, None is returned for packages not found."""
+        graph_io = self.context.graph_io
+        assert graph_io is not None
+        results = graph_io.gather(*(graph_io.get_python_cve_records_all(**q) for q in queries), return_exceptions=True)
+        for idx, result in enumerate(results):
+            if isinstance(result, NotFoundError):
+                # Reported once records of the given package are requested.
+                results[idx] = None
+            elif isinstance(result, BaseException):
+                raise result
+
+        return results
+
+    def _prefetch_cve_records(self, package_versions: List[PackageVersion]) -> None:
+        """Query CVE records of the given packages concurrently."""
+        bulk = self.configuration["bulk"]
+        if bulk:
+            package_names = list(
+                dict.fromkeys(pv.name for pv in package_versions if pv.name not in self._package_cve_records)
+            )
+            results = self._gather_cve_records([{"package_name": n} for n in package_names])
+            for package_name, package_cve_records in zip(package_names, results):
+                if package_cve_records is not None:
+                    self._package_cve_records[package_name] = package_cve_records
+
+        # In bulk mode, query versions only of packages with any CVE known.
+        keys = list(
+            dict.fromkeys(
+                (pv.name, pv.locked_version)
+                for pv in package_versions
+                if (not bulk or self._package_cve_records.get(pv.name))
+                and (pv.name, pv.locked_version) not in self._version_cve_records
+            )
+        )
+        results = self._gather_cve_records([{"package_name": n, "package_version": v} for n, v in keys])
+        for key, cve_records in zip(keys, results):
+            if cve_records is not None:
+                self._version_cve_records[key] = cve_records
+
     def run(self, package_versions: Generator[PackageVersion, None, None]) -> Generator[PackageVersion, None, None]:
         """Filter out packages with a CVE."""
+        if self.context.graph_io is not None:
+            package_versions = list(package_versions)  # type: ignore[assignment]
+            self._prefetch_cve_records(package_versions)  # type: ignore[arg-type]
+
         for package_version in package_versions:
             try:
-                cve_records = self.context.graph.get_python_cve_records_all(
-                    package_name=package_version.name,
-                    package_version=package_version.locked_version,
-                )
+                cve_records = self._get_cve_records(package_version)
             except NotFoundError as exc:
                 _LOGGER.warning("Package %r in version %r not found: %r", exc)
                 continue
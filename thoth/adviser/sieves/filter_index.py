@@ -51,6 +51,7 @@ class FilterIndexSieve(Sieve):
       }
     """
 
+    CACHEABLE = True
     CONFIGURATION_DEFAULT = {"package_name": None, "index_url": None}
     CONFIGURATION_SCHEMA = Schema(
         {
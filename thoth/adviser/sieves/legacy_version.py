@@ -44,6 +44,7 @@ class LegacyVersionSieve(Sieve):
     simply skip them in the resolution process.
     """
 
+    CACHEABLE = True
     CONFIGURATION_DEFAULT = {"package_name": None}
 
     _messages_logged = attr.ib(type=Set[Tuple[str, str, str]], factory=set, init=False)
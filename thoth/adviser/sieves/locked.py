@@ -43,6 +43,7 @@ class CutLockedSieve(Sieve):
     N latest versions and the pinned version is >=N+1 version.
     """
 
+    CACHEABLE = True
     CONFIGURATION_DEFAULT = {"package_name": None}
 
     @classmethod
@@ -38,6 +38,7 @@ _LOGGER = logging.getLogger(__name__)
 class CutPreReleasesSieve(Sieve):
     """Cut-off pre-releases if project does not explicitly allows them."""
 
+    CACHEABLE = True
     CONFIGURATION_DEFAULT = {"package_name": None}
 
     @classmethod
@@ -20,6 +20,7 @@
 import logging
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
 from typing import Generator
 from typing import Set
 from typing import Tuple
@@ -43,8 +44,10 @@ class ThothS2IAbiCompatibilitySieve(Sieve):
 
     _THOTH_S2I_PREFIX = "quay.io/thoth-station/"
     CONFIGURATION_DEFAULT = {"package_name": None}
-    image_symbols = attr.ib(type=Set[str], factory=set, init=False)
+    image_symbols = attr.ib(type=FrozenSet[str], factory=frozenset, init=False)
     _messages_logged = attr.ib(type=Set[Tuple[str, str, str]], factory=set, init=False)
+    # Package tuples already checked against image symbols, the value states if all the required symbols are present.
+    _abi_compatible = attr.ib(type=Dict[Tuple[str, str, str], bool], factory=dict, init=False)
 
     _LINK = jl("abi_missing")
     _LINK_NO_ABI = jl("no_abi")
@@ -78,12 +81,13 @@ class ThothS2IAbiCompatibilitySieve(Sieve):
                     "link": self._LINK_BAD_IMAGE,
                 }
             )
-            self.image_symbols = set()
+            self.image_symbols = frozenset()
+            self._abi_compatible.clear()
             super().pre_run()
             return
 
         thoth_s2i_image_name, thoth_s2i_image_version = parsed_base_image
-        self.image_symbols = set(
+        self.image_symbols = frozenset(
             self.context.graph.get_thoth_s2i_analyzed_image_symbols_all(
                 thoth_s2i_image_name=thoth_s2i_image_name,
                 thoth_s2i_image_version=thoth_s2i_image_version,
@@ -96,6 +100,7 @@ class ThothS2IAbiCompatibilitySieve(Sieve):
             self.context.stack_info.append({"type": "WARNING", "message": message, "link": self._LINK_NO_ABI})
 
         self._messages_logged.clear()
+        self._abi_compatible.clear()
         _LOGGER.debug("Analyzed image has the following symbols: %r", self.image_symbols)
         super().pre_run()
 
@@ -107,29 +112,26 @@ class ThothS2IAbiCompatibilitySieve(Sieve):
             return None
 
         for pkg_vers in package_versions:
-            package_symbols = set(
-                self.context.graph.get_python_package_required_symbols(
+            package_tuple = pkg_vers.to_tuple()
+            abi_compatible = self._abi_compatible.get(package_tuple)
+            if abi_compatible is None:
+                package_symbols = self.context.graph.get_python_package_required_symbols(
                     package_name=pkg_vers.name,
                     package_version=pkg_vers.locked_version,
                     index_url=pkg_vers.index.url,
                 )
-            )
-
-            # Shortcut if package requires no symbols
-            if not package_symbols:
-                yield pkg_vers
-                continue
+                # Checked directly on the list retrieved, no intermediate set is constructed for the package.
+                abi_compatible = self.image_symbols.issuperset(package_symbols)
+                self._abi_compatible[package_tuple] = abi_compatible
 
-            missing_symbols = package_symbols - self.image_symbols
-            if not missing_symbols:
-                yield pkg_vers
-            else:
-                # Log removed package
-                package_tuple = pkg_vers.to_tuple()
-                if package_tuple not in self._messages_logged:
+                if not abi_compatible and package_tuple not in self._messages_logged:
+                    # Log removed package
                     message = f"Package {package_tuple} was removed due to missing ABI symbols in the environment"
                     _LOGGER.warning("%s - see %s", message, self._LINK)
                     self._messages_logged.add(package_tuple)
-                    _LOGGER.debug("The following symbols are not present: %r", missing_symbols)
+                    _LOGGER.debug(
+                        "The following symbols are not present: %r", set(package_symbols).difference(self.image_symbols)
+                    )
 
-                continue
+            if abi_compatible:
+                yield pkg_vers
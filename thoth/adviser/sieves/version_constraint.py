@@ -47,6 +47,7 @@ _LOGGER = logging.getLogger(__name__)
 class VersionConstraintSieve(Sieve):
     """Filter out packages based on version constraints if they occur in the stack."""
 
+    CACHEABLE = True
     CONFIGURATION_DEFAULT = {"package_name": None, "version_specifier": None}
     CONFIGURATION_SCHEMA = Schema({Required("package_name"): str, Required("version_specifier"): str})
 
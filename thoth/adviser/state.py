@@ -23,6 +23,7 @@ from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Generator
+from typing import Set
 import random
 import weakref
 
@@ -67,8 +68,20 @@ class State:
     #  https://tools.ietf.org/html/rfc6902#section-5
     advised_manifest_changes = attr.ib(type=List[List[Dict[str, Any]]], kw_only=True, default=attr.Factory(list))
     justification = attr.ib(type=List[Dict[str, str]], default=attr.Factory(list), kw_only=True)
+    # Names of unresolved dependencies with nested dicts shared with other states (copy-on-write).
+    _unresolved_shared = attr.ib(type=Set[str], default=attr.Factory(set), init=False, eq=False, repr=False)
+    # Zobrist-style fingerprint of resolved and unresolved dependencies, maintained once computed.
+    _fingerprint = attr.ib(type=int, default=0, init=False, eq=False)
+    # Parts of the fingerprint contributed by unresolved dependencies, keyed by package name; None if the
+    # fingerprint was not computed yet.
+    _unresolved_fingerprints = attr.ib(type=Optional[Dict[str, int]], default=None, init=False, eq=False)
+    # States with changed fingerprint keyed by their id, registered by a beam keeping a transposition table.
+    _fingerprint_changes = attr.ib(type=Optional[Dict[int, "State"]], default=None, init=False, eq=False, repr=False)
 
     _EPSILON = 0.1
+    _FINGERPRINT_MASK = 0xFFFFFFFFFFFFFFFF
+    # An odd multiplier so that keys of resolved dependencies differ from keys of the same unresolved dependencies.
+    _FINGERPRINT_RESOLVED_MULTIPLIER = 0x9E3779B97F4A7C15
 
     @property
     def parent(self):
@@ -83,6 +96,60 @@ class State:
 
         return None
 
+    @property
+    def fingerprint(self) -> int:
+        """Get fingerprint of resolved and unresolved dependencies, equivalent states share the fingerprint.
+
+        The fingerprint is computed on the first access and maintained by methods modifying dependencies afterwards.
+        """
+        if self._unresolved_fingerprints is None:
+            self._fingerprint = 0
+            for package_tuple in self.resolved_dependencies.values():
+                self._fingerprint ^= self._get_resolved_key(package_tuple)
+
+            self._unresolved_fingerprints = {}
+            for dependency_name, dependencies in self.unresolved_dependencies.items():
+                unresolved_fingerprint = 0
+                for package_tuple in dependencies.values():
+                    unresolved_fingerprint ^= hash(package_tuple) & self._FINGERPRINT_MASK
+
+                self._unresolved_fingerprints[dependency_name] = unresolved_fingerprint
+                self._fingerprint ^= unresolved_fingerprint
+
+        return self._fingerprint
+
+    @classmethod
+    def _get_resolved_key(cls, package_tuple: Tuple[str, str, str]) -> int:
+        """Get key of the given resolved dependency used to compute fingerprint."""
+        return (hash(package_tuple) * cls._FINGERPRINT_RESOLVED_MULTIPLIER) & cls._FINGERPRINT_MASK
+
+    def track_fingerprint_changes(self, fingerprint_changes: Optional[Dict[int, "State"]]) -> None:
+        """Record this state into the given dictionary each time its fingerprint changes, None stops tracking."""
+        self._fingerprint_changes = fingerprint_changes
+
+    def _note_fingerprint_change(self) -> None:
+        """Note the fingerprint of this state changed, if tracked."""
+        if self._fingerprint_changes is not None:
+            self._fingerprint_changes[id(self)] = self
+
+    def _update_unresolved_fingerprint(self, dependency_name: str, key: int) -> None:
+        """Add or remove key of an unresolved dependency from the fingerprint, if it is maintained."""
+        if self._unresolved_fingerprints is None:
+            return
+
+        key &= self._FINGERPRINT_MASK
+        self._unresolved_fingerprints[dependency_name] = self._unresolved_fingerprints.get(dependency_name, 0) ^ key
+        self._fingerprint ^= key
+        self._note_fingerprint_change()
+
+    def is_equivalent(self, other: "State") -> bool:
+        """Check if the given state has the same resolved and unresolved dependencies as this state."""
+        return (
+            self.fingerprint == other.fingerprint
+            and self.resolved_dependencies == other.resolved_dependencies
+            and self.unresolved_dependencies == other.unresolved_dependencies
+        )
+
     @classmethod
     def from_direct_dependencies(cls, direct_dependencies: Dict[str, List[PackageVersion]]) -> "State":
         """Create an initial state out of direct dependencies."""
@@ -125,17 +192,43 @@ class State:
         """Add new entries to the justification field."""
         self.justification.extend(justification)
 
+    def _get_unresolved_owned(self, dependency_name: str) -> Dict[int, Tuple[str, str, str]]:
+        """Get unresolved dependencies of the given name for modification, copy them if shared with other states."""
+        unresolved = self.unresolved_dependencies.get(dependency_name)
+        if unresolved is None:
+            unresolved = {}
+            self.unresolved_dependencies[dependency_name] = unresolved
+        elif dependency_name in self._unresolved_shared:
+            unresolved = unresolved.copy()
+            self.unresolved_dependencies[dependency_name] = unresolved
+            self._unresolved_shared.discard(dependency_name)
+
+        return unresolved
+
     def add_unresolved_dependency(self, package_tuple: Tuple[str, str, str]) -> None:
         """Add unresolved dependency into the state."""
-        if package_tuple[0] not in self.unresolved_dependencies:
-            self.unresolved_dependencies[package_tuple[0]] = {}
+        key = hash(package_tuple)
+        unresolved = self._get_unresolved_owned(package_tuple[0])
+        if key not in unresolved:
+            self._update_unresolved_fingerprint(package_tuple[0], key)
 
-        self.unresolved_dependencies[package_tuple[0]][hash(package_tuple)] = package_tuple
+        unresolved[key] = package_tuple
 
     def set_unresolved_dependencies(self, dependencies: Dict[str, List[Tuple[str, str, str]]]) -> None:
         """Set unresolved dependencies - any unresolved dependencies will be overwritten."""
         for dependency_name, dependency_tuples in dependencies.items():
-            self.unresolved_dependencies[dependency_name] = {hash(d): d for d in dependency_tuples}
+            unresolved = {hash(d): d for d in dependency_tuples}
+            self.unresolved_dependencies[dependency_name] = unresolved
+            self._unresolved_shared.discard(dependency_name)
+
+            if self._unresolved_fingerprints is not None:
+                unresolved_fingerprint = 0
+                for key in unresolved:
+                    unresolved_fingerprint ^= key & self._FINGERPRINT_MASK
+
+                self._fingerprint ^= self._unresolved_fingerprints.get(dependency_name, 0) ^ unresolved_fingerprint
+                self._unresolved_fingerprints[dependency_name] = unresolved_fingerprint
+                self._note_fingerprint_change()
 
     def update_unresolved_dependencies(self, dependencies: Dict[str, List[Tuple[str, str, str]]]) -> None:
         """Update unresolved dependencies respecting the ones passed in as parameters."""
@@ -143,22 +236,33 @@ class State:
             if not dependency_tuples:
                 continue
 
-            if dependency_name not in self.unresolved_dependencies:
-                self.unresolved_dependencies[dependency_name] = {}
-
+            unresolved = self._get_unresolved_owned(dependency_name)
             for d in dependency_tuples:
-                self.unresolved_dependencies[dependency_name][hash(d)] = d
+                key = hash(d)
+                if key not in unresolved:
+                    self._update_unresolved_fingerprint(dependency_name, key)
+
+                unresolved[key] = d
 
     def remove_unresolved_dependency(self, package_tuple: Tuple[str, str, str]) -> None:
         """Remove the given unresolved dependency from state."""
-        self.unresolved_dependencies[package_tuple[0]].pop(hash(package_tuple))
-        if not self.unresolved_dependencies[package_tuple[0]]:
-            # Last item, remove records about it.
-            self.unresolved_dependencies.pop(package_tuple[0])
+        key = hash(package_tuple)
+        unresolved = self.unresolved_dependencies[package_tuple[0]]
+        if len(unresolved) == 1 and key in unresolved:
+            # Last item, remove records about it without copying shared records.
+            self.remove_unresolved_dependency_subtree(package_tuple[0])
+            return
+
+        self._get_unresolved_owned(package_tuple[0]).pop(key)
+        self._update_unresolved_fingerprint(package_tuple[0], key)
 
     def remove_unresolved_dependency_subtree(self, package_name: str) -> None:
         """Remove the whole dependency sub-tree from the state."""
         self.unresolved_dependencies.pop(package_name, None)
+        self._unresolved_shared.discard(package_name)
+        if self._unresolved_fingerprints is not None:
+            self._fingerprint ^= self._unresolved_fingerprints.pop(package_name, 0)
+            self._note_fingerprint_change()
 
     def add_resolved_dependency(self, package_tuple: Tuple[str, str, str]) -> None:
         """Add a resolved dependency into the state."""
@@ -170,6 +274,11 @@ class State:
                 f"Package {package_tuple!r} is already present in the state "
                 f"in different version {self.resolved_dependencies[package_tuple[0]]!r}"
             )
+
+        if self._unresolved_fingerprints is not None and package_tuple[0] not in self.resolved_dependencies:
+            self._fingerprint ^= self._get_resolved_key(package_tuple)
+            self._note_fingerprint_change()
+
         self.resolved_dependencies[package_tuple[0]] = package_tuple
 
     def mark_dependency_resolved(self, package_tuple: Tuple[str, str, str]) -> None:
@@ -227,25 +336,34 @@ class State:
         yield from self.resolved_dependencies.values()
 
     def clone(self) -> "State":
-        """Return a swallow copy of this state that can be used as a next state."""
+        """Return a swallow copy of this state that can be used as a next state.
+
+        Nested unresolved dependencies are shared between the cloned state and this state. They are copied
+        lazily once any of the two states modifies them so the cost of cloning does not depend on the number
+        of unresolved dependency versions kept in the state.
+        """
         cloned_advised_environment = None
         if self.advised_runtime_environment:
             cloned_advised_environment = RuntimeEnvironment.from_dict(self.advised_runtime_environment.to_dict())
 
-        unresolved_dependencies = self.unresolved_dependencies.copy()
-        for dependency_name in unresolved_dependencies.keys():
-            unresolved_dependencies[dependency_name] = unresolved_dependencies[dependency_name].copy()
+        self._unresolved_shared.update(self.unresolved_dependencies.keys())
 
-        return self.__class__(
+        cloned_state = self.__class__(
             score=self.score,
             iteration=self.iteration,
-            unresolved_dependencies=unresolved_dependencies,
+            unresolved_dependencies=self.unresolved_dependencies.copy(),
             resolved_dependencies=self.resolved_dependencies.copy(),
             advised_runtime_environment=cloned_advised_environment,
             advised_manifest_changes=self.advised_manifest_changes.copy(),
             justification=self.justification.copy(),
             parent=weakref.ref(self),
         )
+        cloned_state._unresolved_shared = self._unresolved_shared.copy()
+        if self._unresolved_fingerprints is not None:
+            cloned_state._fingerprint = self._fingerprint
+            cloned_state._unresolved_fingerprints = self._unresolved_fingerprints.copy()
+
+        return cloned_state
 
     def __del__(self) -> None:
         """Destruct self."""
@@ -56,6 +56,10 @@ class Step(Unit):
         """Check if this unit is of type step."""
         return True
 
+    def get_score_max(self) -> float:
+        """Get the highest score this step can add to a state when resolving a package, used to bound scores."""
+        return self.SCORE_MAX
+
     @abc.abstractmethod
     def run(
         self, state: State, package_version: PackageVersion
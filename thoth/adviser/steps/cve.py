@@ -88,6 +88,10 @@ class CvePenalizationStep(Step):
         self._construct_allow_cves(self._allow_cves, self.context.labels)
         super().pre_run()
 
+    def get_score_max(self) -> float:
+        """Get the highest score this step can add to a state, the step only penalizes packages with CVEs."""
+        return self.SCORE_MAX if self.configuration["cve_penalization"] > 0 else 0.0
+
     def run(self, _: State, package_version: PackageVersion) -> Optional[Tuple[float, List[Dict[str, str]]]]:
         """Penalize stacks with a CVE."""
         try:
@@ -62,6 +62,10 @@ class DropoutStep(Step):
         yield from ()
         return None
 
+    def get_score_max(self) -> float:
+        """Get the highest score this step can add to a state, the step does not score packages."""
+        return 0.0
+
     def run(
         self, state: State, package_version: PackageVersion
     ) -> Optional[Tuple[Optional[float], Optional[List[Dict[str, str]]]]]:
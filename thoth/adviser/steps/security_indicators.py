@@ -52,6 +52,8 @@ class SecurityIndicatorStep(Step):
     """A step that scores a state based on security info aggregated."""
 
     _logged_packages = attr.ib(type=Set[Tuple[str, str, str]], default=attr.Factory(set), init=False)
+    # Aggregated security indicators keyed by package tuple, None stands for no security info available.
+    _si_records = attr.ib(type=Dict[Tuple[str, str, str], Optional[Dict[str, int]]], factory=dict, init=False)
 
     CONFIGURATION_DEFAULT = {
         "high_confidence_weight": 1.0,
@@ -111,8 +113,41 @@ class SecurityIndicatorStep(Step):
     def pre_run(self) -> None:
         """Initialize this pipeline step before running the pipeline."""
         self._logged_packages.clear()
+        self._si_records.clear()
         super().pre_run()
 
+    def _get_si_record(self, package_version: PackageVersion) -> Dict[str, int]:
+        """Get aggregated security indicators for the given package, each package is queried at most once per run.
+
+        @raises NotFoundError: if no security info is available for the given package
+        """
+        package_tuple = package_version.to_tuple()
+        try:
+            s_info = self._si_records[package_tuple]
+        except KeyError:
+            try:
+                s_info = self.context.graph.get_si_aggregated_python_package_version(
+                    package_name=package_version.name,
+                    package_version=package_version.locked_version,
+                    index_url=package_version.index.url,
+                )
+            except NotFoundError:
+                s_info = None
+
+            self._si_records[package_tuple] = s_info
+
+        if s_info is None:
+            raise NotFoundError(f"No security info for {package_tuple!r}")
+
+        return s_info
+
+    def get_score_max(self) -> float:
+        """Get the highest score this step can add to a state, the step only penalizes security issues found."""
+        if self.configuration["function_scaling"] * self.configuration["si_score_weight"] >= 0:
+            return 0.0
+
+        return self.SCORE_MAX
+
     def run(
         self, state: State, package_version: PackageVersion
     ) -> Optional[Tuple[Optional[float], Optional[List[Dict[str, str]]]]]:
@@ -120,11 +155,7 @@ class SecurityIndicatorStep(Step):
         package_version_tuple = package_version.to_tuple_locked()
         justification = []
         try:
-            s_info = self.context.graph.get_si_aggregated_python_package_version(
-                package_name=package_version.name,
-                package_version=package_version.locked_version,
-                index_url=package_version.index.url,
-            )
+            s_info = self._get_si_record(package_version)
             msg = (
                 f"Thoth has security info for {package_version.name}==={package_version.locked_version} "
                 f"on {package_version.index.url}"